@@ -0,0 +1,42 @@
+"""Measure the memory held by parsed entries over the pages saved in tests/data.
+
+Each page is parsed and only its entries are kept, as a cache of entries would. The memory still traced after
+parsing is reported per entry, with entries attached to their parse trees and detached from them.
+
+    python -m benchmarks.entry_memory
+"""
+import gc
+import logging
+import tracemalloc
+import bs4
+from russianwiktionaryparser import wiktionaryparser
+from benchmarks.parse_benchmark import fixture_words, read_page
+
+
+def retained_memory(pages, detach):
+    """(bytes still traced once every page is parsed, number of entries kept)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        entries = []
+        for word, page in pages.items():
+            soup = bs4.BeautifulSoup(page, features='lxml')
+            entries.extend(wiktionaryparser.WiktionaryPageParser(word, soup, detach=detach).get_entries())
+            del soup
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0], len(entries)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    pages = {word: read_page(word) for word in fixture_words()}
+    for detach in [False, True]:
+        size, count = retained_memory(pages, detach)
+        print(f"{'detached' if detach else 'attached':>9}: {size / 1024:8.0f} KiB for {count} entries, "
+              f'{size / count / 1024:6.1f} KiB per entry')
+
+
+if __name__ == '__main__':
+    main()
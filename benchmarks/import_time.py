@@ -0,0 +1,57 @@
+"""Measure the cold import time of the package, as paid by every short-lived CLI or serverless invocation.
+
+Each run imports the package in a fresh interpreter with -X importtime and reports the cumulative time of the
+package import, along with the heavy third party modules the import pulled in. Bytecode is compiled first, so runs
+measure imports rather than compilation even when PYTHONDONTWRITEBYTECODE is set.
+
+    python -m benchmarks.import_time [--repeat N] [--module NAME]
+"""
+import argparse
+import compileall
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ['bs4', 'requests', 'pydub', 'lxml', 'aiohttp', 'urllib3', 'sqlite3']
+
+
+def compile_package(module):
+    compileall.compile_dir(os.path.dirname(importlib.util.find_spec(module).origin), quiet=1)
+
+
+def import_once(module):
+    """(microseconds spent importing module, heavy modules it imported) in a fresh interpreter."""
+    code = f'import sys, {module}; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            check=True)
+    cumulative = next(int(line.split('|')[1]) for line in result.stderr.splitlines()
+                      if line.startswith('import time:') and line.split('|')[2].strip() == module)
+    loaded = result.stdout.strip()
+    return cumulative, loaded.split(',') if loaded else []
+
+
+def measure(module='russianwiktionaryparser', repeat=10):
+    """(median import time in milliseconds, heavy modules imported)."""
+    compile_package(module)
+    times = []
+    loaded = []
+    for _ in range(repeat):
+        cumulative, loaded = import_once(module)
+        times.append(cumulative / 1000)
+    return statistics.median(times), loaded
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--repeat', type=int, default=10)
+    arg_parser.add_argument('--module', default='russianwiktionaryparser')
+    args = arg_parser.parse_args()
+    median, loaded = measure(args.module, args.repeat)
+    print(f'import {args.module}: {median:.1f} ms median of {args.repeat}, '
+          f'heavy modules imported: {", ".join(loaded) or "none"}')
+
+
+if __name__ == '__main__':
+    main()
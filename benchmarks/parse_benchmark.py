@@ -0,0 +1,126 @@
+"""Benchmark WiktionaryPageParser over the pages saved in tests/data.
+
+Every page is fetched through WiktionaryParser with the network mocked out. Timings are reported per parsing stage
+along with the peak memory traced while parsing each page.
+
+There is no split_page_by_etymology stage: the parser assigns elements to their etymology and part of speech in the
+single walk_sections pass, which is timed as get_parts_of_speech. Results recorded before that change have the split
+as a stage of its own, so compare their sum with get_parts_of_speech.
+
+    python -m benchmarks.parse_benchmark [--repeat N] [--json results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from unittest.mock import patch
+import bs4
+from russianwiktionaryparser import metrics, wiktionaryparser
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'tests', 'data')
+
+STAGES = ['title', 'filter_language', 'get_parts_of_speech', 'definitions', 'inflection_table', 'audio_links']
+
+
+def fixture_words():
+    suffix = ' - Wiktionary.html'
+    return sorted(name[:-len(suffix)] for name in os.listdir(DATA_DIR) if name.endswith(suffix))
+
+
+def read_page(word):
+    with open(os.path.join(DATA_DIR, f'{word} - Wiktionary.html'), 'rb') as f:
+        return f.read()
+
+
+class StageTimer:
+    """Runs pages through WiktionaryParser, reading stage timings from its metrics hooks."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def run(self, word):
+        registry = metrics.MetricsRegistry()
+        with patch.object(wiktionaryparser, 'make_soup', lambda *_: wiktionaryparser.build_soup(self.pages[word])):
+            start = time.perf_counter()
+            entries = wiktionaryparser.WiktionaryParser(metrics=registry).fetch(word)
+            total = time.perf_counter() - start
+        timings = {stage: registry.summary(metrics.STAGE_SECONDS, stage=stage)[1] for stage in STAGES}
+        timings['soup'] = registry.summary(metrics.SOUP_SECONDS, backend='bs4')[1]
+        timings['total'] = total
+        return entries, timings
+
+
+def peak_memory(page, word):
+    with patch.object(wiktionaryparser, 'make_soup', lambda *_: bs4.BeautifulSoup(page, features='lxml')):
+        tracemalloc.start()
+        try:
+            wiktionaryparser.WiktionaryParser().fetch(word)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def run_benchmark(words, repeat=5):
+    pages = {word: read_page(word) for word in words}
+    timer = StageTimer(pages)
+    results = {}
+    for word in words:
+        runs = []
+        for _ in range(repeat):
+            entries, timings = timer.run(word)
+            runs.append(timings)
+        stages = sorted({stage for timings in runs for stage in timings})
+        results[word] = {
+            'bytes': len(pages[word]),
+            'entries': len(entries),
+            'stages_ms': {stage: statistics.median(timings.get(stage, 0.0) for timings in runs) * 1000
+                          for stage in stages},
+            'peak_memory_bytes': peak_memory(pages[word], word),
+        }
+    return results
+
+
+def print_report(results, baseline=None):
+    stage_names = ['soup'] + STAGES + ['total']
+    header = f"{'page':<32}" + ''.join(f'{stage[:10]:>11}' for stage in stage_names) + f"{'peak KiB':>10}"
+    print(header)
+    for word, result in results.items():
+        row = f'{word[:32]:<32}' + ''.join(f"{result['stages_ms'].get(stage, 0.0):>11.2f}" for stage in stage_names)
+        row += f"{result['peak_memory_bytes'] / 1024:>10.0f}"
+        if baseline is not None and word in baseline:
+            ratio = result['stages_ms']['total'] / baseline[word]['stages_ms']['total']
+            row += f'  x{ratio:.2f} vs baseline'
+        print(row)
+    total = sum(result['stages_ms']['total'] for result in results.values())
+    print(f'total parse time: {total:.1f} ms over {len(results)} pages (median of runs, times in ms)')
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('words', nargs='*', help='fixture pages to run, all of tests/data by default')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='runs per page, the median is reported')
+    arg_parser.add_argument('--json', metavar='PATH', help="write results as JSON to PATH ('-' for stdout)")
+    arg_parser.add_argument('--compare', metavar='PATH', help='JSON results of a previous run to compare against')
+    args = arg_parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    results = run_benchmark(args.words or fixture_words(), repeat=args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['pages']
+    if args.json == '-':
+        json.dump({'pages': results}, sys.stdout, ensure_ascii=False, indent=2)
+    else:
+        print_report(results, baseline)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'pages': results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Compare the binary entry serialization with the serialize() and JSON path.
+
+Entries are parsed once from the pages saved in tests/data, then encoded and decoded repeatedly by both formats.
+Throughput is reported in entries per second along with the encoded size per entry.
+
+    python -m benchmarks.serialization [--repeat N]
+"""
+import argparse
+import io
+import json
+import logging
+import time
+from russianwiktionaryparser import binary, wiktionaryparser
+from benchmarks.parse_benchmark import fixture_words, read_page
+
+
+def json_encode(entries):
+    return [json.dumps(entry.serialize(), ensure_ascii=False).encode('utf-8') for entry in entries]
+
+
+def json_decode(records):
+    return [wiktionaryparser.WiktionaryEntry.build_from_serial(json.loads(record)) for record in records]
+
+
+def binary_encode(entries):
+    f = io.BytesIO()
+    binary.EntryWriter(f).write_all(entries)
+    return f.getvalue()
+
+
+def binary_decode(data):
+    return list(binary.EntryReader(io.BytesIO(data)))
+
+
+FORMATS = {'json': (json_encode, json_decode, lambda records: sum(map(len, records))),
+           'binary': (binary_encode, binary_decode, len)}
+
+
+def measure(entries, repeat):
+    """{format: (encode entries/sec, decode entries/sec, bytes per entry)}."""
+    results = {}
+    for name, (encode, decode, size) in FORMATS.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            encoded = encode(entries)
+        encode_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            decode(encoded)
+        decode_time = time.perf_counter() - start
+        count = len(entries) * repeat
+        results[name] = (count / encode_time, count / decode_time, size(encoded) / len(entries))
+    return results
+
+
+def load_entries():
+    entries = []
+    for word in fixture_words():
+        entries.extend(wiktionaryparser.parse_page(word, read_page(word), detach=True))
+    return entries
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--repeat', type=int, default=500)
+    args = arg_parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    entries = load_entries()
+    print(f'{len(entries)} entries, {args.repeat} rounds')
+    for name, (encode_rate, decode_rate, size) in measure(entries, args.repeat).items():
+        print(f'{name:>7}: encode {encode_rate:9.0f}/s  decode {decode_rate:9.0f}/s  {size:7.0f} bytes per entry')
+
+
+if __name__ == '__main__':
+    main()
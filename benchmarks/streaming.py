@@ -0,0 +1,63 @@
+"""Compare WiktionaryParser.stream with fetch over the pages saved in tests/data, served by the local stub server.
+
+For each page, reports the time until the first entry is available and the response bytes read, for a full fetch
+with the lxml backend and for a streamed one.
+
+    python -m benchmarks.streaming [--repeat N] [words ...]
+"""
+import argparse
+import logging
+import statistics
+import time
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.metrics import HTTP_BYTES, MetricsRegistry, use_metrics
+from benchmarks.parse_benchmark import fixture_words
+from tests.stub_server import StubWiktionary
+
+
+def first_entry(base_url, word, streamed):
+    """(seconds until the first entry is available, response bytes read)."""
+    registry = MetricsRegistry()
+    wiki = wiktionaryparser.WiktionaryParser(backend='lxml', metrics=registry, base_url=base_url)
+    start = time.perf_counter()
+    if streamed:
+        entries = wiki.stream(word)
+        next(entries, None)
+        elapsed = time.perf_counter() - start
+        entries.close()
+    else:
+        # what fetch does with the lxml backend, against the stub server
+        with use_metrics(registry):
+            content = wiktionaryparser.fetch_page(wiktionaryparser.word_url(word, base_url))
+            wiktionaryparser.parse_page(word, content, 'lxml')
+        elapsed = time.perf_counter() - start
+    return elapsed, registry.summary(HTTP_BYTES)[1]
+
+
+def run_benchmark(words, repeat=5):
+    """{word: {mode: (median ms to first entry, bytes read)}} for the fetch and stream modes."""
+    results = {}
+    with StubWiktionary() as stub:
+        for word in words:
+            results[word] = {}
+            for mode in ('fetch', 'stream'):
+                runs = [first_entry(stub.base_url, word, mode == 'stream') for _ in range(repeat)]
+                results[word][mode] = (statistics.median(run[0] for run in runs) * 1000, runs[-1][1])
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('words', nargs='*', help='fixture pages to run, all of tests/data by default')
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    print(f"{'page':<32}{'fetch ms':>10}{'KiB':>8}{'stream ms':>11}{'KiB':>8}")
+    for word, result in run_benchmark(args.words or fixture_words(), args.repeat).items():
+        (fetch_ms, fetch_bytes), (stream_ms, stream_bytes) = result['fetch'], result['stream']
+        print(f'{word[:32]:<32}{fetch_ms:>10.1f}{fetch_bytes / 1024:>8.0f}'
+              f'{stream_ms:>11.1f}{stream_bytes / 1024:>8.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,30 @@
 from .wiktionaryparser import WiktionaryParser
 from .wiktionaryparser import WiktionaryEntry
+from .wiktionaryparser import set_page_cache, set_scheduler
+from .cache import PageCache, DiskPageCache
+from .metrics import MetricsRegistry, set_metrics
+from .scheduler import RequestScheduler
+
+# imported on first use, so that importing the package does not load sqlite3 and the modules only some callers need
+_LAZY = {
+    'EntryStore': 'store',
+    'FormIndex': 'formindex',
+    'BaseResolver': 'resolver',
+    'AudioCache': 'audiocache',
+    'PrefixIndex': 'prefixindex',
+    'PageArchive': 'archive',
+    'AliasMap': 'aliases',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import importlib
+    value = getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,80 @@
+"""Command line entry point, ``python -m russianwiktionaryparser``.
+
+    fetch ARCHIVE WORD...       fetch pages from Wiktionary into a page archive
+    add ARCHIVE FILE...         archive saved HTML pages, keyed by file name
+    reparse ARCHIVE [-o OUT]    parse every archived page on a process pool into JSONL
+"""
+import argparse
+import logging
+import os
+import sys
+from . archive import PageArchive, reparse_archive
+from . cache import normalize_word
+from . wiktionaryparser import BACKENDS, WiktionaryParser, set_page_cache
+
+
+def fetch(args):
+    with PageArchive(args.archive) as archive:
+        set_page_cache(archive)
+        try:
+            failed = [result.word for result in WiktionaryParser().fetch_many(args.words) if not result.ok]
+        finally:
+            set_page_cache(None)
+        print(f'{len(args.words) - len(failed)} pages fetched, {len(archive)} in archive', file=sys.stderr)
+    return 1 if failed else 0
+
+
+def add(args):
+    with PageArchive(args.archive) as archive:
+        for path in args.files:
+            with open(path, 'rb') as f:
+                archive.put(normalize_word(os.path.splitext(os.path.basename(path))[0]), f.read())
+        print(f'{len(args.files)} pages added, {len(archive)} in archive', file=sys.stderr)
+    return 0
+
+
+def reparse(args):
+    def progress(stats):
+        print(stats, file=sys.stderr)
+
+    if args.output == '-':
+        stats = reparse_archive(args.archive, sys.stdout, args.backend, args.workers, progress, args.progress_every)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            stats = reparse_archive(args.archive, output, args.backend, args.workers, progress, args.progress_every)
+    return 1 if stats.errors else 0
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog='python -m russianwiktionaryparser')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log progress and warnings')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = commands.add_parser('fetch', help='fetch pages from Wiktionary into a page archive')
+    fetch_parser.add_argument('archive')
+    fetch_parser.add_argument('words', nargs='+')
+    fetch_parser.set_defaults(run=fetch)
+
+    add_parser = commands.add_parser('add', help='archive saved HTML pages, keyed by file name')
+    add_parser.add_argument('archive')
+    add_parser.add_argument('files', nargs='+')
+    add_parser.set_defaults(run=add)
+
+    reparse_parser = commands.add_parser('reparse', help='parse every archived page into JSONL')
+    reparse_parser.add_argument('archive')
+    reparse_parser.add_argument('-o', '--output', default='-', help='JSONL output file, - for stdout')
+    reparse_parser.add_argument('-b', '--backend', choices=BACKENDS, default='bs4')
+    reparse_parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes, default all cores')
+    reparse_parser.add_argument('--progress-every', type=int, default=1000, help='pages between progress reports')
+    reparse_parser.set_defaults(run=reparse)
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Persistent map from entered words to the canonical titles of the pages they lead to."""
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS aliases_used ON aliases(used);
+"""
+
+
+def alias_key(word):
+    """Key for an entered word. Case is kept, as page titles are case sensitive."""
+    return unicodedata.normalize('NFC', word.strip())
+
+
+class AliasMap:
+    """Bounded map from entered words to page titles, kept in memory and persisted in SQLite at path.
+
+    Once it holds more than max_aliases aliases the least recently used ones are dropped. Lookups only update the
+    recency kept in memory; it is written back on add and close, or once flush_every aliases have pending updates.
+    """
+
+    def __init__(self, path=':memory:', max_aliases=100000, flush_every=1000):
+        self.path = path
+        self.max_aliases = max_aliases
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._aliases = OrderedDict(self._conn.execute('SELECT alias, title FROM aliases ORDER BY used'))
+        self._used = self._conn.execute('SELECT COALESCE(MAX(used), 0) FROM aliases').fetchone()[0]
+        self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+        self._conn.close()
+
+    def _flush(self):
+        """Write the recency of the aliases looked up since the last flush. Called with the lock held."""
+        if self._pending:
+            with self._conn:
+                self._conn.executemany('UPDATE aliases SET used = ? WHERE alias = ?',
+                                       [(used, key) for key, used in self._pending.items()])
+            self._pending.clear()
+
+    def get(self, word):
+        """Title the word leads to, None when it is not a known alias."""
+        key = alias_key(word)
+        with self._lock:
+            title = self._aliases.get(key)
+            if title is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._aliases.move_to_end(key)
+            self._used += 1
+            self._pending[key] = self._used
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+        return title
+
+    def add(self, word, title):
+        """Record that word leads to the page title. Words that are their own title are not stored."""
+        key = alias_key(word)
+        if not title or key == title:
+            return
+        with self._lock:
+            self._pending.pop(key, None)
+            self._flush()
+            self._aliases[key] = title
+            self._aliases.move_to_end(key)
+            self._used += 1
+            evicted = []
+            while len(self._aliases) > self.max_aliases:
+                evicted.append((self._aliases.popitem(last=False)[0],))
+            with self._conn:
+                self._conn.execute('INSERT OR REPLACE INTO aliases (alias, title, used) VALUES (?, ?, ?)',
+                                   (key, title, self._used))
+                self._conn.executemany('DELETE FROM aliases WHERE alias = ?', evicted)
+
+    def remove(self, word):
+        key = alias_key(word)
+        with self._lock, self._conn:
+            self._aliases.pop(key, None)
+            self._pending.pop(key, None)
+            self._conn.execute('DELETE FROM aliases WHERE alias = ?', (key,))
+
+    def __contains__(self, word):
+        return alias_key(word) in self._aliases
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'aliases': len(self._aliases)}
@@ -0,0 +1,252 @@
+"""Compressed, append-only archive of raw pages, and bulk reparsing of it on a process pool.
+
+The archive is a data file of zlib compressed records, each holding one page under its page cache key, and an index
+file of (offset, key) pairs loaded into memory on open. Storing a key again appends a new record that supersedes the
+old one. Since PageArchive is a PageCache, installing it with set_page_cache archives every page as it is fetched, and
+reparse_archive can then run new parsing logic over everything fetched so far without touching the network.
+"""
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from . cache import PageCache
+from . wiktionaryparser import make_page_parser, parse_word_from_url
+
+_LOG = logging.getLogger(__name__)
+
+MAGIC = b'RWPA\x01'
+_RECORD = struct.Struct('<dII')  # fetched-at timestamp, key size, compressed size
+_INDEX_ENTRY = struct.Struct('<QI')  # record offset, key size
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class PageArchive(PageCache):
+    """Append-only page archive at path, with its index at path + '.idx'.
+
+    Only rendered pages are archived, parse API responses are not, as reparse_archive parses every record as a page.
+    """
+
+    pages_only = True
+
+    def __init__(self, path, compress_level=6):
+        super().__init__()
+        self.path = path
+        self.index_path = path + '.idx'
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._offsets = {}  # key -> offset of its latest record
+        self._data = None
+        self._index = None
+        self._open()
+
+    def _open(self):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._data = open(self.path, 'a+b')
+        if new:
+            self._data.write(MAGIC)
+            self._data.flush()
+        else:
+            self._data.seek(0)
+            if self._data.read(len(MAGIC)) != MAGIC:
+                raise ArchiveError(f'{self.path} is not a page archive')
+        end = self._load_index()
+        self._index = open(self.index_path, 'ab')
+        self._recover(end)
+
+    def _load_index(self):
+        """Read the index file, returning the offset just past the last indexed record."""
+        end = len(MAGIC)
+        if not os.path.exists(self.index_path):
+            return end
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        position = 0
+        while position + _INDEX_ENTRY.size <= len(data):
+            offset, key_size = _INDEX_ENTRY.unpack_from(data, position)
+            key_end = position + _INDEX_ENTRY.size + key_size
+            if key_end > len(data):
+                break
+            self._offsets[data[position + _INDEX_ENTRY.size:key_end].decode('utf-8')] = offset
+            end = max(end, offset)
+            position = key_end
+        if position != len(data):
+            os.truncate(self.index_path, position)
+        if end > len(MAGIC):
+            _, key_size, size = self._read_header(end)
+            end += _RECORD.size + key_size + size
+        return end
+
+    def _recover(self, end):
+        """Index the records appended after the last indexed one, dropping a partly written last record."""
+        size = os.path.getsize(self.path)
+        while end + _RECORD.size <= size:
+            _, key_size, compressed_size = self._read_header(end)
+            record_end = end + _RECORD.size + key_size + compressed_size
+            if record_end > size:
+                break
+            self._data.seek(end + _RECORD.size)
+            key = self._data.read(key_size).decode('utf-8')
+            self._write_index(key, end)
+            end = record_end
+        if end < size:
+            _LOG.warning('Truncating %u bytes of incomplete record from %s', size - end, self.path)
+            self._data.truncate(end)
+        self._index.flush()
+
+    def _read_header(self, offset):
+        self._data.seek(offset)
+        return _RECORD.unpack(self._data.read(_RECORD.size))
+
+    def _write_index(self, key, offset):
+        encoded = key.encode('utf-8')
+        self._index.write(_INDEX_ENTRY.pack(offset, len(encoded)) + encoded)
+        self._offsets[key] = offset
+
+    def _load(self, key):
+        offset = self._offsets.get(key)
+        if offset is None:
+            return None
+        with self._lock:
+            return read_record(self._data, offset)[1]
+
+    def _store(self, key, content):
+        encoded = key.encode('utf-8')
+        compressed = zlib.compress(content, self.compress_level)
+        with self._lock:
+            self._data.seek(0, os.SEEK_END)
+            offset = self._data.tell()
+            self._data.write(_RECORD.pack(time.time(), len(encoded), len(compressed)) + encoded + compressed)
+            self._data.flush()
+            self._write_index(key, offset)
+            self._index.flush()
+
+    def keys(self):
+        """Keys of the archived pages, in the order they were first archived."""
+        return list(self._offsets)
+
+    def records(self):
+        """(key, offset) of the latest record of every page."""
+        return list(self._offsets.items())
+
+    def items(self):
+        """Yield (key, content) for every archived page."""
+        for key, offset in self.records():
+            with self._lock:
+                content = read_record(self._data, offset)[1]
+            yield key, content
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        with self._lock:
+            if self._data is not None:
+                self._data.close()
+                self._index.close()
+                self._data = self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self):
+        stats = super().stats()
+        stats['entries'] = len(self._offsets)
+        stats['size'] = os.path.getsize(self.path)
+        return stats
+
+
+def read_record(f, offset):
+    """(key, content) of the record at offset in an archive data file."""
+    f.seek(offset)
+    _, key_size, size = _RECORD.unpack(f.read(_RECORD.size))
+    key = f.read(key_size).decode('utf-8')
+    return key, zlib.decompress(f.read(size))
+
+
+def is_page_key(key):
+    """Whether key is that of a rendered page rather than of a parse API response."""
+    kind, _, value = key.partition(':')
+    return kind != 'url' or '/w/api.php' not in value
+
+
+def word_from_key(key):
+    """Entered word for a page cache key, as used for logging and titles of pages without a heading."""
+    kind, _, value = key.partition(':')
+    return parse_word_from_url(value) if kind == 'url' else value
+
+
+_WORKER_FILE = None
+
+
+def _open_worker_file(path):
+    global _WORKER_FILE
+    _WORKER_FILE = open(path, 'rb')
+
+
+def _reparse_record(record, backend):
+    """serialize() dicts of the entries on the archived page, None when parsing failed."""
+    key, offset = record
+    try:
+        _, content = read_record(_WORKER_FILE, offset)
+        entries = make_page_parser(word_from_key(key), content, backend, detach=True).get_entries()
+        return [entry.serialize() for entry in entries]
+    except Exception:
+        _LOG.exception('Error parsing archived page %s', key)
+        return None
+
+
+def reparse_archive(path, output, backend='bs4', max_workers=None, progress=None, progress_every=1000):
+    """Parse every page in the archive at path on a process pool, writing one JSON entry per line to output.
+
+    output is a text file object. Entries are written in archive order. Workers read the pages from the data file
+    and are only sent record offsets. progress is called with the DumpStats every progress_every pages and at the end,
+    which is also returned.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from . dumps import DumpStats
+    with PageArchive(path) as archive:
+        # archives written by earlier versions may hold parse API responses as well
+        records = [record for record in archive.records() if is_page_key(record[0])]
+    stats = DumpStats()
+    max_workers = max_workers or os.cpu_count() or 1
+    window = 4 * max_workers
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_open_worker_file, initargs=(path,)) as executor:
+        pending = deque()
+        records = iter(records)
+        while True:
+            for record in records:
+                pending.append(executor.submit(_reparse_record, record, backend))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            entries = pending.popleft().result()
+            stats.pages += 1
+            if entries is None:
+                stats.errors += 1
+            elif entries:
+                stats.russian_pages += 1
+                stats.entries += len(entries)
+                for entry in entries:
+                    output.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            if stats.pages % progress_every == 0:
+                _LOG.info('Reparse progress: %s', stats)
+                if progress is not None:
+                    progress(stats)
+    _LOG.info('Reparse finished: %s', stats)
+    if progress is not None:
+        progress(stats)
+    return stats
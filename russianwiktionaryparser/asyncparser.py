@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import urllib.parse
+import aiohttp
+from . audiocache import AudioCache
+from . cache import normalize_url, normalize_word
+from . wiktionaryparser import BACKENDS, WIKTIONARY_URL, audio_as_mp3, find_media_file, get_page_cache, parse_page, \
+    parse_word_from_url, search_url, word_url
+
+_LOG = logging.getLogger(__name__)
+
+
+class AsyncWiktionaryParser:
+    """asyncio counterpart of WiktionaryParser.
+
+    Requests go through one pooled aiohttp session and at most ``max_concurrency`` of them are in flight at once.
+    Building the soup and parsing entries runs on ``executor`` (the loop's default executor when None) so the event
+    loop is never blocked by BeautifulSoup.
+    """
+
+    def __init__(self, base_url=WIKTIONARY_URL, max_concurrency=8, executor=None, timeout=30, backend='bs4'):
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown parse backend "{backend}", expected one of {BACKENDS}')
+        self.base_url = base_url
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        self.timeout = timeout
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _run_in_executor(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _get(self, url):
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(url) as resp:
+                if resp.status != 200:
+                    _LOG.info('Error received from server: %u', resp.status)
+                    return None
+                return await resp.read()
+
+    async def _fetch_page(self, url, cache_key):
+        cache = get_page_cache()
+        if cache is not None:
+            content = await self._run_in_executor(cache.get, cache_key)
+            if content is not None:
+                return content
+        content = await self._get(url)
+        if content is not None and cache is not None:
+            await self._run_in_executor(cache.put, cache_key, content)
+        return content
+
+    async def fetch(self, entered_word):
+        _LOG.info('Fetching page for word "%s"', entered_word)
+        content = await self._fetch_page(word_url(entered_word, self.base_url), normalize_word(entered_word))
+        if content is None:
+            _LOG.error('Error fetching page')
+            return []
+        return await self._run_in_executor(parse_page, entered_word, content, self.backend)
+
+    async def fetch_from_url(self, url):
+        _LOG.debug('fetching from url')
+        content = await self._fetch_page(url, normalize_url(url))
+        if content is None:
+            return []
+        return await self._run_in_executor(parse_page, parse_word_from_url(url), content, self.backend)
+
+    async def search(self, word, limit=10):
+        content = await self._get(search_url(word, limit, self.base_url))
+        if content is None:
+            return []
+        return json.loads(content.decode())
+
+    async def download_audio(self, link, destination='.'):
+        """Download the audio file behind a File: page link into destination, converted to mp3.
+
+        Files are named and skipped as WiktionaryParser.download_audio does, through AudioCache.
+        """
+        audio_cache = AudioCache(destination, base_url=self.base_url)
+        file_dest = audio_cache.get(link)
+        if file_dest is None:
+            file_dest = await self._download_audio(link, audio_cache.path_for(link))
+        return await self._run_in_executor(audio_as_mp3, file_dest)
+
+    async def _download_audio(self, link, file_dest):
+        content = await self._get(f'{self.base_url}{link}')
+        if content is None:
+            _LOG.warning('Error fetching file %s', link)
+            return None
+        media_file = await self._run_in_executor(find_media_file, content)
+        if media_file is None:
+            _LOG.warning('Could not find media file on page')
+            return None
+        file_name, file_link = media_file
+        _LOG.debug('Downloading file %s', file_name)
+        audio = await self._get(urllib.parse.urljoin(self.base_url, file_link))
+        if audio is None:
+            _LOG.warning('Error fetching file %s', file_link)
+            return None
+        await self._run_in_executor(_write_file, file_dest, audio)
+        return file_dest
+
+
+def _write_file(path, content):
+    """Write content to path through a temporary file, so an interrupted write never leaves a partial file at path."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.part'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,97 @@
+"""Directory of downloaded audio files, keyed by media file name."""
+import logging
+import os
+import threading
+import urllib.parse
+from concurrent.futures import Future
+from . metrics import HTTP_BYTES, current_metrics
+from . import wiktionaryparser
+from . wiktionaryparser import WIKTIONARY_URL, find_media_file, get_filename_from_link
+
+_LOG = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+_IN_FLIGHT = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+
+class AudioCache:
+    """Downloads the media files behind File: page links into a directory, once per file.
+
+    A file is stored under the name in its link, so a link that was already downloaded resolves to its local path
+    without any request. Downloads are streamed to a temporary file in chunks and moved into place when complete, and
+    concurrent requests for the same file, from any cache over the same directory, share a single download.
+    """
+
+    def __init__(self, directory='.', base_url=WIKTIONARY_URL, chunk_size=CHUNK_SIZE):
+        self.directory = directory
+        self.base_url = base_url
+        self.chunk_size = chunk_size
+
+    def path_for(self, link):
+        return os.path.join(self.directory, os.path.basename(get_filename_from_link(link)))
+
+    def get(self, link):
+        """Local path of a cached file, None if it has not been downloaded."""
+        path = self.path_for(link)
+        return path if os.path.exists(path) else None
+
+    def fetch(self, link):
+        """Local path of the media file behind link, downloading it unless it is cached. None if the download fails."""
+        path = self.path_for(link)
+        if os.path.exists(path):
+            return path
+        key = os.path.abspath(path)
+        with _IN_FLIGHT_LOCK:
+            future = _IN_FLIGHT.get(key)
+            download = future is None
+            if download:
+                future = _IN_FLIGHT[key] = Future()
+        if not download:
+            _LOG.debug('Waiting on download in flight for %s', link)
+            return future.result()
+        try:
+            result = path if os.path.exists(path) else self._download(link, path)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _IN_FLIGHT_LOCK:
+                del _IN_FLIGHT[key]
+
+    def _download(self, link, path):
+        page_url = f'{self.base_url}{link}'
+        audio_file_page = wiktionaryparser._http_get(page_url)
+        if audio_file_page.status_code != 200:
+            _LOG.warning('Error fetching file %s', link)
+            return None
+        media_file = find_media_file(audio_file_page.content)
+        if media_file is None:
+            _LOG.warning('Could not find media file on page')
+            return None
+        file_name, file_link = media_file
+        _LOG.debug('Downloading file %s', file_name)
+        with wiktionaryparser._http_get(urllib.parse.urljoin(page_url, file_link), stream=True) as audio_file:
+            if audio_file.status_code != 200:
+                _LOG.warning('Error fetching file %s', file_link)
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.part'
+            size = 0
+            try:
+                with open(tmp_path, 'wb') as f:
+                    for chunk in audio_file.iter_content(self.chunk_size):
+                        f.write(chunk)
+                        size += len(chunk)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.observe(HTTP_BYTES, size)
+        return path
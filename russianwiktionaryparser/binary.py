@@ -0,0 +1,208 @@
+"""Versioned binary serialization of entries, lossless unlike WiktionaryEntry.serialize().
+
+A record holds one entry as two parts: an array of unsigned 16 bit integers describing its shape (flags and counts)
+and every string of the entry in traversal order, UTF-8 encoded and NUL separated. Encoding and decoding a record
+then takes a single array conversion and a single split, whatever the number of strings. Page text cannot hold NUL
+characters, as HTML parsers replace them.
+
+    record:  <II ints count, text size>  <H * ints count>  <text>
+    stream:  MAGIC  <H FORMAT_VERSION>  record*
+
+Fields derived from others, base_links, base_links_set and the accent stripped inflections, are rebuilt on decoding.
+"""
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from . wiktionaryparser import WiktionaryDefinition, WiktionaryEntry, WiktionaryExample, WiktionaryInflectionTable
+
+MAGIC = b'RWPE'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sH')
+_RECORD = struct.Struct('<II')
+_HAS_AUDIO_FILE = 1
+_HAS_INFLECTIONS = 2
+_HAS_BASE_LINK = 1
+_ACCENT = '́'
+_new_definition = WiktionaryDefinition.__new__
+_new_example = WiktionaryExample.__new__
+
+
+class SerializationError(Exception):
+    pass
+
+
+def _encode_parts(entry):
+    ints = [0, len(entry.definitions)]
+    strs = [entry.word, entry.part_of_speech or '']
+    if entry.audio_file is not None:
+        ints[0] |= _HAS_AUDIO_FILE
+        strs.append(entry.audio_file)
+    for definition in entry.definitions:
+        strs.append(definition.text)
+        strs.append(definition.base_word)
+        if definition.base_link is not None:
+            ints.append(_HAS_BASE_LINK)
+            strs.append(definition.base_link)
+        else:
+            ints.append(0)
+        ints.append(len(definition.examples))
+        for example in definition.examples:
+            strs.append(example.text)
+            strs.append(example.translation)
+    if entry.inflections is not None:
+        ints[0] |= _HAS_INFLECTIONS
+        forms = entry.inflections.to_json()
+        ints.append(len(forms))
+        strs.extend(forms)
+        for items in forms.values():
+            ints.append(len(items))
+            strs.extend(items)
+    ints.append(len(entry.audio_links))
+    strs.extend(entry.audio_links)
+    ints.append(len(entry.tracing))
+    strs.extend(entry.tracing)
+    return ints, strs
+
+
+def encode_entry(entry):
+    """Bytes of a single record for entry, without the stream header."""
+    ints, strs = _encode_parts(entry)
+    text = '\0'.join(strs)
+    if text.count('\0') != len(strs) - 1:
+        raise SerializationError(f'Entry "{entry.word}" holds a NUL character')
+    try:
+        shape = array('H', ints)
+    except OverflowError:
+        raise SerializationError(f'Entry "{entry.word}" has too many items to encode') from None
+    if sys.byteorder == 'big':
+        shape.byteswap()
+    data = text.encode('utf-8')
+    return _RECORD.pack(len(ints), len(data)) + shape.tobytes() + data
+
+
+def decode_entry(record):
+    """Entry from the bytes of a single record."""
+    count, size = _RECORD.unpack_from(record)
+    start = _RECORD.size + 2 * count
+    return _build_entry(_shape(record[_RECORD.size:start]), record[start:start + size])
+
+
+def _shape(data):
+    ints = array('H')
+    ints.frombytes(data)
+    if sys.byteorder == 'big':
+        ints.byteswap()
+    return ints
+
+
+def _build_entry(ints, data):
+    text = data.decode('utf-8')
+    strs = text.split('\0')
+    flags, definition_count = ints[0], ints[1]
+    i, s = 2, 2
+    entry = WiktionaryEntry(strs[0])
+    entry.part_of_speech = sys.intern(strs[1])
+    if flags & _HAS_AUDIO_FILE:
+        entry.audio_file = strs[s]
+        s += 1
+    definitions = entry.definitions
+    for _ in range(definition_count):
+        # the constructors would only set defaults that are overwritten here
+        definition = _new_definition(WiktionaryDefinition)
+        definition._text = strs[s]
+        definition.base_word = strs[s + 1]
+        s += 2
+        if ints[i] & _HAS_BASE_LINK:
+            definition.base_link = strs[s]
+            s += 1
+        else:
+            definition.base_link = None
+        example_count = ints[i + 1]
+        i += 2
+        definition._examples = examples = []
+        for _ in range(example_count):
+            example = _new_example(WiktionaryExample)
+            example._text = strs[s]
+            example._translation = strs[s + 1]
+            s += 2
+            examples.append(example)
+        definitions.append(definition)
+    if flags & _HAS_INFLECTIONS:
+        table = WiktionaryInflectionTable(None)
+        stripped = text.replace(_ACCENT, '').split('\0') if _ACCENT in text else strs
+        key_count = ints[i]
+        keys = [sys.intern(key) for key in strs[s:s + key_count]]
+        bounds = list(accumulate(ints[i + 1:i + 1 + key_count], initial=s + key_count))
+        table._json = {key: strs[start:end] for key, start, end in zip(keys, bounds, bounds[1:])}
+        table._stripped = {key: stripped[start:end] for key, start, end in zip(keys, bounds, bounds[1:])}
+        i += 1 + key_count
+        s = bounds[-1]
+        entry.inflections = table
+    audio_count = ints[i]
+    entry.audio_links.extend(strs[s:s + audio_count])
+    s += audio_count
+    entry.tracing.extend(strs[s:s + ints[i + 1]])
+    entry._parse_base_links()
+    return entry
+
+
+class EntryWriter:
+    """Writes entries to a binary file object as a stream of records behind a versioned header."""
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+
+    def write(self, entry):
+        self.f.write(encode_entry(entry))
+        self.count += 1
+
+    def write_all(self, entries):
+        for entry in entries:
+            self.write(entry)
+        return self.count
+
+
+class EntryReader:
+    """Iterates over the entries of a stream written by EntryWriter, reading one record at a time."""
+
+    def __init__(self, f):
+        self.f = f
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise SerializationError('Truncated entry stream header')
+        magic, version = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SerializationError('Not an entry stream')
+        if version != FORMAT_VERSION:
+            raise SerializationError(f'Unsupported entry stream version {version}, expected {FORMAT_VERSION}')
+
+    def __iter__(self):
+        read = self.f.read
+        while True:
+            header = read(_RECORD.size)
+            if not header:
+                return
+            if len(header) != _RECORD.size:
+                raise SerializationError('Truncated entry record')
+            count, size = _RECORD.unpack(header)
+            shape = read(2 * count)
+            data = read(size)
+            if len(shape) != 2 * count or len(data) != size:
+                raise SerializationError('Truncated entry record')
+            yield _build_entry(_shape(shape), data)
+
+
+def write_entries(path, entries):
+    """Write entries to a new file at path, returning how many were written."""
+    with open(path, 'wb') as f:
+        return EntryWriter(f).write_all(entries)
+
+
+def read_entries(path):
+    """Yield the entries of a file written by write_entries."""
+    with open(path, 'rb') as f:
+        yield from EntryReader(f)
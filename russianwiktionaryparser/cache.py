@@ -0,0 +1,178 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+import unicodedata
+import urllib.parse
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+_HEADER = struct.Struct('<dI')  # fetched-at timestamp, uncompressed size
+
+
+def normalize_word(word):
+    """Cache key for a word looked up through the search page."""
+    return 'word:' + unicodedata.normalize('NFC', word.strip())
+
+
+def normalize_url(url):
+    """Cache key for a page url, the fragment does not change the page that is served."""
+    url = urllib.parse.unquote(url.strip()).split('#')[0]
+    return 'url:' + unicodedata.normalize('NFC', url)
+
+
+class PageCache(ABC):
+    """Store for raw page responses, keyed on normalize_word / normalize_url keys."""
+
+    # set by caches that only hold rendered pages, which parse API responses are kept out of
+    pages_only = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def _load(self, key) -> bytes:
+        pass
+
+    @abstractmethod
+    def _store(self, key, content: bytes):
+        pass
+
+    def get(self, key):
+        content = self._load(key)
+        with self._stats_lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.bytes_saved += len(content)
+        return content
+
+    def put(self, key, content):
+        self._store(key, content)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'bytes_saved': self.bytes_saved}
+
+
+class DiskPageCache(PageCache):
+    """Persistent page cache storing zlib compressed responses in a directory.
+
+    Entries older than ``ttl`` seconds are treated as misses. When ``max_bytes`` is set the least recently used
+    entries are evicted once the compressed size on disk exceeds it.
+    """
+
+    def __init__(self, directory, ttl=None, max_bytes=None, compress_level=6):
+        super().__init__()
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.size = 0
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # file name -> size on disk, least recently used first
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.tmp'):
+                # left behind by a _store that did not complete
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+            elif name.endswith('.page'):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._index[name] = size
+            self.size += size
+
+    @staticmethod
+    def _file_name(key):
+        return hashlib.sha1(key.encode('utf-8')).hexdigest() + '.page'
+
+    def _load(self, key):
+        name = self._file_name(key)
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            if name not in self._index:
+                return None
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                self._forget(name)
+                return None
+            try:
+                fetched_at, _ = _HEADER.unpack_from(data)
+            except struct.error:
+                self._remove(name)
+                return None
+            if self.ttl is not None and time.time() - fetched_at > self.ttl:
+                self._remove(name)
+                return None
+            self._index.move_to_end(name)
+            os.utime(path)  # keep recency across restarts
+        try:
+            return zlib.decompress(data[_HEADER.size:])
+        except zlib.error:
+            with self._lock:
+                if self._index.get(name) == len(data):  # not replaced in the meantime
+                    self._remove(name)
+            return None
+
+    def _store(self, key, content):
+        name = self._file_name(key)
+        path = os.path.join(self.directory, name)
+        data = _HEADER.pack(time.time(), len(content)) + zlib.compress(content, self.compress_level)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._forget(name)
+            self._index[name] = len(data)
+            self.size += len(data)
+            self._evict()
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        while self.size > self.max_bytes and len(self._index) > 1:
+            self._remove(next(iter(self._index)))
+
+    def _forget(self, name):
+        self.size -= self._index.pop(name, 0)
+
+    def _remove(self, name):
+        self._forget(name)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._index):
+                self._remove(name)
+
+    def __len__(self):
+        return len(self._index)
+
+    def stats(self):
+        stats = super().stats()
+        stats['entries'] = len(self._index)
+        stats['size'] = self.size
+        return stats
@@ -0,0 +1,109 @@
+"""Offline ingestion of Wiktionary HTML dumps.
+
+Supports the Wikimedia Enterprise HTML dumps, which are NDJSON files with one rendered page per line (``name`` and
+``article_body.html``). Files may be plain, gzip or bz2 compressed, or a ``.tar.gz`` archive of NDJSON files as
+published on dumps.wikimedia.org. The XML dumps only contain wikitext and cannot be run through the HTML parser.
+"""
+import bz2
+import gzip
+import json
+import logging
+import re
+import tarfile
+import time
+from . wiktionaryparser import WiktionaryPageParser, normalize_headings
+
+_LOG = logging.getLogger(__name__)
+
+_RUSSIAN_H2 = re.compile(r'<h2\b(?:[^>]*\sid="Russian"|[^>]*>\s*<span\b[^>]*\sid="Russian")')
+
+
+class DumpStats:
+    def __init__(self):
+        self.pages = 0
+        self.russian_pages = 0
+        self.entries = 0
+        self.errors = 0
+        self.start_time = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    @property
+    def pages_per_sec(self):
+        elapsed = self.elapsed
+        return self.pages / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self):
+        return f'{self.pages} pages ({self.russian_pages} Russian), {self.entries} entries, {self.errors} errors, ' \
+               f'{self.pages_per_sec:.1f} pages/sec'
+
+
+def _open_lines(path):
+    if path.endswith(('.tar.gz', '.tgz')):
+        with tarfile.open(path, 'r|gz') as archive:
+            for member in archive:
+                if member.isfile():
+                    for line in archive.extractfile(member):
+                        yield line.decode('utf-8')
+        return
+    if path.endswith('.gz'):
+        opener = gzip.open
+    elif path.endswith('.bz2'):
+        opener = bz2.open
+    else:
+        opener = open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        yield from f
+
+
+def iter_dump_pages(path):
+    """Yield (title, html) for every page in the dump, one line at a time."""
+    for line in _open_lines(path):
+        if not line.strip():
+            continue
+        page = json.loads(line)
+        yield page['name'], page.get('article_body', {}).get('html', '')
+
+
+def has_russian_section(html):
+    return _RUSSIAN_H2.search(html) is not None
+
+
+def normalize_parsoid(soup):
+    """Rewrite Parsoid markup (nested sections, bare headings) to the layout of the rendered page."""
+    for section in soup.find_all('section'):
+        section.unwrap()
+    return normalize_headings(soup)
+
+
+def iter_dump_entries(path, serialize=False, progress=None, progress_every=1000):
+    """Stream entries for every Russian page in a dump.
+
+    Yields WiktionaryEntry objects, or their serialize() dicts when serialize is True. Pages without a Russian h2 are
+    skipped before any parsing. progress is called with the DumpStats every progress_every pages and at the end.
+    """
+    import bs4
+    stats = DumpStats()
+    for title, html in iter_dump_pages(path):
+        stats.pages += 1
+        if has_russian_section(html):
+            stats.russian_pages += 1
+            try:
+                soup = normalize_parsoid(bs4.BeautifulSoup(html, features='lxml'))
+                entries = WiktionaryPageParser(title, soup, title=title, detach=True).get_entries()
+            except Exception:
+                _LOG.exception('Error parsing page %s', title)
+                stats.errors += 1
+                entries = []
+            stats.entries += len(entries)
+            for entry in entries:
+                yield entry.serialize() if serialize else entry
+        if stats.pages % progress_every == 0:
+            _LOG.info('Dump progress: %s', stats)
+            if progress is not None:
+                progress(stats)
+    _LOG.info('Dump finished: %s', stats)
+    if progress is not None:
+        progress(stats)
@@ -2,6 +2,8 @@ from abc import ABC
 
 
 class WordEntry(ABC):
+    __slots__ = ('word', 'audio_file', 'part_of_speech', 'definitions')
+
     def __init__(self, word, *args, **kwargs):
         self.word = word
         self.audio_file = None
@@ -10,6 +12,8 @@ class WordEntry(ABC):
 
 
 class WordDefinition(ABC):
+    __slots__ = ('_text', '_examples')
+
     def __init__(self):
         self._text = ''
         self._examples = []
@@ -24,6 +28,8 @@ class WordDefinition(ABC):
 
 
 class WordExample(ABC):
+    __slots__ = ('_text', '_translation')
+
     def __init__(self):
         self._text = ''
         self._translation = ''
@@ -0,0 +1,166 @@
+"""Compact in-memory index from inflected forms to their lemmas.
+
+Forms are stored in a trie laid out in preorder over flat arrays: the first child of node ``i`` is node ``i + 1``
+(when ``has_child[i]`` is set) and the remaining children are chained through ``next_sibling``, in code point order.
+A lookup walks one node per character, so it costs O(len(form)) with at most an alphabet's worth of sibling hops per
+step, and no Python object is kept per form.
+"""
+import struct
+import sys
+from array import array
+from . wiktionaryparser import form_key
+
+_MAGIC = b'WFIX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHB5I')
+_SEPARATOR = '\x1f'
+
+
+class FormIndex:
+    def __init__(self):
+        self.labels = array('I', [0])
+        self.next_sibling = array('I', [0])
+        self.has_child = bytearray(1)
+        self.value_start = array('I', [0, 0])
+        self.value_lemmas = array('I')
+        self.value_tags = array('I')
+        self.lemmas = []  # (word, part of speech)
+        self.tags = []
+        self.form_count = 0
+
+    @classmethod
+    def build(cls, entries):
+        """Index the inflection table forms of entries, each mapped to the entry's word and part of speech."""
+        lemma_ids = {}
+        tag_ids = {}
+        postings = []
+        for entry in entries:
+            if entry.inflections is None:
+                continue
+            lemma_id = lemma_ids.setdefault((entry.word, entry.part_of_speech), len(lemma_ids))
+            for tag, items in entry.inflections.to_json().items():
+                tag_id = tag_ids.setdefault(tag, len(tag_ids))
+                for item in items:
+                    if item:
+                        postings.append((form_key(item), lemma_id, tag_id))
+        postings = sorted(set(postings))
+
+        index = cls()
+        index.lemmas = list(lemma_ids)
+        index.tags = list(tag_ids)
+        index._build_trie(postings)
+        return index
+
+    def _build_trie(self, postings):
+        path = [0]  # nodes from the root to the last inserted form
+        last_child = [0]  # last child of each node on the path, 0 when it has none yet
+        previous = ''
+        i = 0
+        while i < len(postings):
+            form = postings[i][0]
+            common = 0
+            while common < min(len(form), len(previous)) and form[common] == previous[common]:
+                common += 1
+            del path[common + 1:]
+            del last_child[common + 1:]
+            for depth in range(common, len(form)):
+                node = len(self.labels)
+                parent = path[depth]
+                if last_child[depth]:
+                    self.next_sibling[last_child[depth]] = node
+                else:
+                    self.has_child[parent] = 1
+                last_child[depth] = node
+                self.labels.append(ord(form[depth]))
+                self.next_sibling.append(0)
+                self.has_child.append(0)
+                self.value_start.append(self.value_start[-1])
+                path.append(node)
+                last_child.append(0)
+            while i < len(postings) and postings[i][0] == form:
+                self.value_lemmas.append(postings[i][1])
+                self.value_tags.append(postings[i][2])
+                self.value_start[-1] += 1
+                i += 1
+            self.form_count += 1
+            previous = form
+
+    def _find(self, form):
+        node = 0
+        for char in form_key(form):
+            if not self.has_child[node]:
+                return None
+            code = ord(char)
+            child = node + 1
+            while child and self.labels[child] < code:
+                child = self.next_sibling[child]
+            if not child or self.labels[child] != code:
+                return None
+            node = child
+        return node
+
+    def lookup(self, form):
+        """List of (lemma, part of speech, tag) for a form, ignoring case and stress marks."""
+        node = self._find(form)
+        if node is None:
+            return []
+        return [self.lemmas[self.value_lemmas[i]] + (self.tags[self.value_tags[i]],)
+                for i in range(self.value_start[node], self.value_start[node + 1])]
+
+    def lemmas_of(self, form):
+        """Distinct (lemma, part of speech) pairs a form belongs to, in index order."""
+        return list(dict.fromkeys((lemma, pos) for lemma, pos, _ in self.lookup(form)))
+
+    def __contains__(self, form):
+        node = self._find(form)
+        return node is not None and self.value_start[node] != self.value_start[node + 1]
+
+    def __len__(self):
+        return self.form_count
+
+    @property
+    def nbytes(self):
+        """Approximate size of the trie and value arrays."""
+        arrays = [self.labels, self.next_sibling, self.value_start, self.value_lemmas, self.value_tags]
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.has_child)
+
+    def save(self, path):
+        lemmas = _SEPARATOR.join(f'{word}\t{pos}' for word, pos in self.lemmas).encode('utf-8')
+        tags = _SEPARATOR.join(self.tags).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == 'little', len(self.labels),
+                                 len(self.value_lemmas), self.form_count, len(lemmas), len(tags)))
+            for values in [self.labels, self.next_sibling, self.value_start, self.value_lemmas, self.value_tags]:
+                values.tofile(f)
+            f.write(self.has_child)
+            f.write(lemmas)
+            f.write(tags)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path, 'rb') as f:
+            magic, version, little_endian, nodes, values, forms, lemmas_size, tags_size = \
+                _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f'{path} is not a form index file of version {_VERSION}')
+            index.labels = _read_array(f, nodes, little_endian)
+            index.next_sibling = _read_array(f, nodes, little_endian)
+            index.value_start = _read_array(f, nodes + 1, little_endian)
+            index.value_lemmas = _read_array(f, values, little_endian)
+            index.value_tags = _read_array(f, values, little_endian)
+            index.has_child = bytearray(f.read(nodes))
+            lemmas = f.read(lemmas_size).decode('utf-8')
+            tags = f.read(tags_size).decode('utf-8')
+        index.lemmas = [tuple(lemma.split('\t')) for lemma in lemmas.split(_SEPARATOR)] if lemmas else []
+        index.tags = tags.split(_SEPARATOR) if tags_size else []
+        index.form_count = forms
+        return index
+
+
+def _read_array(f, count, little_endian):
+    values = array('I')
+    values.fromfile(f, count)
+    if little_endian != (sys.byteorder == 'little'):
+        values.byteswap()
+    return values
@@ -0,0 +1,242 @@
+"""Page parser built directly on lxml.html with precompiled XPath selectors.
+
+Produces the same WiktionaryEntry objects as WiktionaryPageParser, without building a BeautifulSoup tree. Sections
+are handled as lists of sibling elements of the original tree, nothing is copied or moved.
+"""
+import logging
+import sys
+import lxml.html
+from lxml import etree
+from . metrics import SOUP_SECONDS, STAGE_SECONDS, current_metrics, timer
+from . wiktionaryparser import WiktionaryDefinition, WiktionaryEntry, WiktionaryExample, \
+    WiktionaryInflectionTable, parse_revision_id, record_entries, remove_trailing_numbers, walk_sections
+
+_LOG = logging.getLogger(__name__)
+
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_SKIPPED_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def _has_class(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+_FIRST_HEADING = etree.XPath(f"//h1[{_has_class('firstHeading')}]")
+_PAGE_CONFIG = etree.XPath("/html/head/script[contains(., 'wgRevisionId')]")
+_RUSSIAN_HEADLINE = etree.XPath(f"//span[{_has_class('mw-headline')} and @id='Russian']")
+_HEADLINES = etree.XPath(f"descendant-or-self::span[{_has_class('mw-headline')}]")
+_FORM_OF_LINK = etree.XPath(f".//span[{_has_class('form-of-definition-link')}]")
+_HQ_TOGGLES = etree.XPath(f".//span[{_has_class('HQToggle')}]")
+_CITATION_WHOLE = etree.XPath(f".//div[{_has_class('citation-whole')}]")
+_USAGE_EXAMPLES = etree.XPath(f".//div[{_has_class('h-usage-example')}]")
+_EXAMPLE_TEXT = etree.XPath(".//i[normalize-space(@class)='Cyrl mention e-example']")
+_EXAMPLE_TRANSLATION = etree.XPath(f".//span[{_has_class('e-translation')}]")
+_INFLECTION_TABLE = etree.XPath("descendant-or-self::table[contains(@class, 'inflection-table')]")
+_INFLECTION_FORMS = etree.XPath(".//span[contains(normalize-space(@class), 'Cyrl form-of lang-ru')]")
+_AUDIO_META = etree.XPath(f"descendant-or-self::td[{_has_class('audiometa')}]")
+_HEADING_WRAPPERS = etree.XPath(f"//div[{_has_class('mw-heading')}]")
+_BARE_HEADINGS = etree.XPath(f"//*[self::h2 or self::h3 or self::h4 or self::h5 or self::h6][@id]"
+                             f"[not(.//span[{_has_class('mw-headline')}])]")
+
+
+def get_text(element):
+    """Text of an element the way bs4's get_text() sees it: no comments, scripts or styles."""
+    parts = []
+    _collect_text(element, parts)
+    return ''.join(parts)
+
+
+def _collect_text(element, parts):
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _SKIPPED_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _first(xpath, element):
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def _find_all(xpath, section):
+    found = []
+    for element in section:
+        found.extend(xpath(element))
+    return found
+
+
+def _find(xpath, section):
+    for element in section:
+        found = xpath(element)
+        if found:
+            return found[0]
+    return None
+
+
+def normalize_headings(root):
+    """lxml counterpart of wiktionaryparser.normalize_headings, rewriting bare headings in place."""
+    for wrapper in _HEADING_WRAPPERS(root):
+        wrapper.drop_tag()
+    for heading in _BARE_HEADINGS(root):
+        headline = etree.SubElement(heading, 'span', {'class': 'mw-headline', 'id': heading.attrib.pop('id')})
+        headline.text, heading.text = heading.text, None
+        for child in heading[:-1]:
+            headline.append(child)
+    return root
+
+
+_HEADING_LEVELS = {'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+
+
+def heading_of(element):
+    """lxml counterpart of wiktionaryparser.heading_of."""
+    level = _HEADING_LEVELS.get(element.tag)
+    if level is None:
+        return None
+    headline = _first(_HEADLINES, element)
+    return level, headline, get_text(headline) if headline is not None else ''
+
+
+class LxmlPageParser:
+    def __init__(self, entered_word, html, title=None, metrics=None, normalize=False):
+        self.entered_word = entered_word
+        self.metrics = metrics if metrics is not None else current_metrics()
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+        with timer(self.metrics, SOUP_SECONDS, backend='lxml'):
+            self.root = lxml.html.document_fromstring(html, parser=_HTML_PARSER)
+            if normalize:
+                normalize_headings(self.root)
+        self.page_title = ''
+        self.revision_id = None
+        if title is None:
+            with timer(self.metrics, STAGE_SECONDS, stage='title'):
+                self._get_title()
+        else:
+            self.page_title = title
+        with timer(self.metrics, STAGE_SECONDS, stage='filter_language'):
+            self.russian_section = self.filter_language()
+        self.entries = []
+
+        if self.russian_section is not None:
+            with timer(self.metrics, STAGE_SECONDS, stage='get_parts_of_speech'):
+                sections = walk_sections(self.russian_section, heading_of)
+            for section in sections:
+                self.entries.append(parse_entry(self.page_title, section, self.metrics))
+        record_entries(self.metrics, self.entries)
+
+    def get_entries(self):
+        return self.entries
+
+    def _get_title(self):
+        first_heading = _first(_FIRST_HEADING, self.root)
+        if first_heading is not None:
+            self.page_title = get_text(first_heading)
+            _LOG.debug('Page title found: %s', self.page_title)
+            if self.entered_word != self.page_title:
+                _LOG.info('Page redirected from word %s to %s', self.entered_word, self.page_title)
+        else:
+            _LOG.warning('Could not find title in page')
+        config = _first(_PAGE_CONFIG, self.root)
+        if config is not None:
+            self.revision_id = parse_revision_id(config.text or '')
+
+    def filter_language(self):
+        russian_headline = _first(_RUSSIAN_HEADLINE, self.root)
+        if russian_headline is None or russian_headline.getparent().tag != 'h2':
+            logging.warning('No russian entries found on page!')
+            return None
+        elements = []
+        for sibling in russian_headline.getparent().itersiblings():
+            if sibling.tag == 'h2':
+                break
+            if isinstance(sibling.tag, str):
+                elements.append(sibling)
+        return elements
+
+
+def parse_entry(title, section, metrics=None):
+    """Entry for a part of speech PageSection of an lxml tree."""
+    pos_header = section.headline
+    entry = WiktionaryEntry(title)
+    entry.part_of_speech = sys.intern(remove_trailing_numbers(pos_header.get('id')).replace('_', ' '))
+    _LOG.debug('Part of speech found: %s', entry.part_of_speech)
+
+    with timer(metrics, STAGE_SECONDS, stage='definitions'):
+        for item in section.elements:
+            if item.tag == 'ol':
+                for list_item in item:
+                    if list_item.tag == 'li' and list_item.get('class', '').split() != ['mw-empty-elt']:
+                        entry.definitions.append(parse_definition(list_item))
+                break
+        else:
+            _LOG.debug('No definition list found')
+
+    with timer(metrics, STAGE_SECONDS, stage='inflection_table'):
+        inflection_table = _find(_INFLECTION_TABLE, section.elements)
+        if inflection_table is None:
+            inflection_table = _find(_INFLECTION_TABLE, section.shared_elements())
+        if inflection_table is not None:
+            entry.inflections = parse_inflection_table(inflection_table)
+        else:
+            _LOG.debug('No inflection table found')
+
+    with timer(metrics, STAGE_SECONDS, stage='audio_links'):
+        audio_meta = _find_all(_AUDIO_META, section.shared_elements() + section.elements)
+        if audio_meta:
+            _LOG.debug('%i audio links found', len(audio_meta))
+            for meta_data in audio_meta:
+                entry.audio_links.append(meta_data.find('.//a').get('href'))
+        else:
+            _LOG.debug('No audio links found')
+
+    entry._parse_base_links()
+    return entry
+
+
+def parse_definition(list_item):
+    definition = WiktionaryDefinition()
+    base_ref = _first(_FORM_OF_LINK, list_item)
+    if base_ref is not None:
+        base_anchor = base_ref.find('.//i//a')
+        if base_anchor is not None:
+            definition.base_word = get_text(base_anchor)
+            definition.base_link = base_anchor.get('href')
+
+    for citation in _HQ_TOGGLES(list_item):
+        citation.drop_tree()
+    citation_ul = _first(_CITATION_WHOLE, list_item)
+    if citation_ul is not None:
+        citation_ul.drop_tree()
+    for usage_tag in _USAGE_EXAMPLES(list_item):
+        usage_tag.drop_tree()
+        definition.examples.append(parse_example(usage_tag))
+    definition._text = " ".join(get_text(list_item).split())
+    return definition
+
+
+def parse_example(usage_tag):
+    example = WiktionaryExample()
+    mention_tag = _first(_EXAMPLE_TEXT, usage_tag)
+    if mention_tag is not None:
+        example._text = get_text(mention_tag)
+    translation_tag = _first(_EXAMPLE_TRANSLATION, usage_tag)
+    if translation_tag is not None:
+        example._translation = get_text(translation_tag)
+    return example
+
+
+def parse_inflection_table(table):
+    inflections = WiktionaryInflectionTable(None)
+    table_body = table.find('.//tbody')
+    for entry in _INFLECTION_FORMS(table_body if table_body is not None else table):
+        for cls in entry.get('class', '').split():
+            if cls.endswith('-form-of'):
+                entry_key = sys.intern(cls.replace('-form-of', ''))
+                item = get_text(entry).strip()
+                inflections._json.setdefault(entry_key, []).append(item)
+                inflections._stripped.setdefault(entry_key, []).append(item.replace('́', ''))
+    return inflections
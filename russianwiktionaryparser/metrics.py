@@ -0,0 +1,198 @@
+"""Instrumentation for the parser.
+
+A metrics sink is any object with ``inc(name, value=1, **labels)`` and ``observe(name, value, **labels)`` methods,
+such as MetricsRegistry or CallbackMetrics. The sink in use is the one installed for the current call with
+use_metrics (WiktionaryParser(metrics=...) does this), falling back to the process wide one from set_metrics. When
+there is no sink every hook reduces to a None check.
+"""
+import contextvars
+import threading
+import time
+
+HTTP_REQUESTS = 'wiktionary_http_requests_total'
+HTTP_SECONDS = 'wiktionary_http_request_seconds'
+HTTP_BYTES = 'wiktionary_http_response_bytes'
+HTTP_RETRIES = 'wiktionary_http_retries_total'
+CACHE_LOOKUPS = 'wiktionary_page_cache_lookups_total'
+SOUP_SECONDS = 'wiktionary_soup_build_seconds'
+STAGE_SECONDS = 'wiktionary_parse_stage_seconds'
+PAGES = 'wiktionary_pages_parsed_total'
+ENTRIES = 'wiktionary_entries_total'
+DEFINITIONS = 'wiktionary_definitions_total'
+
+_HELP = {
+    HTTP_REQUESTS: 'HTTP requests made, by status code',
+    HTTP_SECONDS: 'HTTP request latency in seconds',
+    HTTP_BYTES: 'HTTP response body size in bytes',
+    HTTP_RETRIES: 'HTTP requests retried, by status code or error',
+    CACHE_LOOKUPS: 'Page cache lookups, by result',
+    SOUP_SECONDS: 'Time spent building the document tree in seconds',
+    STAGE_SECONDS: 'Time spent in each page parsing stage in seconds',
+    PAGES: 'Pages run through a page parser',
+    ENTRIES: 'Entries produced',
+    DEFINITIONS: 'Definitions produced',
+}
+
+_DEFAULT = None
+_CURRENT = contextvars.ContextVar('wiktionary_metrics', default=None)
+
+
+def set_metrics(sink):
+    """Install the process wide metrics sink, None disables metrics."""
+    global _DEFAULT
+    _DEFAULT = sink
+
+
+def current_metrics():
+    sink = _CURRENT.get()
+    return sink if sink is not None else _DEFAULT
+
+
+class use_metrics:
+    """Context manager making sink the current metrics sink, does nothing when sink is None."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self._token = None
+
+    def __enter__(self):
+        if self.sink is not None:
+            self._token = _CURRENT.set(self.sink)
+        return self.sink
+
+    def __exit__(self, *exc_info):
+        if self._token is not None:
+            _CURRENT.reset(self._token)
+            self._token = None
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, sink, name, labels):
+        self.sink = sink
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.sink.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+def timer(sink, name, **labels):
+    """Context manager observing its run time in seconds on sink, free when sink is None."""
+    if sink is None:
+        return _NULL_TIMER
+    return _Timer(sink, name, labels)
+
+
+class MetricsRegistry:
+    """Thread safe in-memory counters and summaries, exportable in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._summaries = {}
+
+    @staticmethod
+    def _key(name, labels):
+        # label values are kept as strings, as Prometheus has them, so that the keys always sort
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            count, total = self._summaries.get(key, (0, 0.0))
+            self._summaries[key] = (count + 1, total + value)
+
+    def counter(self, name, **labels):
+        return self._counters.get(self._key(name, labels), 0)
+
+    def summary(self, name, **labels):
+        """(count, sum) of the values observed for name with exactly these labels."""
+        return self._summaries.get(self._key(name, labels), (0, 0.0))
+
+    def total(self, name):
+        """Counter value or summary sum for name across all label values."""
+        with self._lock:
+            if any(key[0] == name for key in self._counters):
+                return sum(value for key, value in self._counters.items() if key[0] == name)
+            return sum(total for key, (_, total) in self._summaries.items() if key[0] == name)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            summaries = sorted(self._summaries.items())
+        for name, samples in _group(counters):
+            lines.extend(_header(name, 'counter'))
+            for labels, value in samples:
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for name, samples in _group(summaries):
+            lines.extend(_header(name, 'summary'))
+            for labels, (count, total) in samples:
+                lines.append(f'{name}_count{_format_labels(labels)} {count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+class CallbackMetrics:
+    """Metrics sink forwarding every event to callback(kind, name, value, labels)."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def inc(self, name, value=1, **labels):
+        self.callback('counter', name, value, labels)
+
+    def observe(self, name, value, **labels):
+        self.callback('summary', name, value, labels)
+
+
+def _group(items):
+    grouped = {}
+    for (name, labels), value in items:
+        grouped.setdefault(name, []).append((labels, value))
+    return grouped.items()
+
+
+def _header(name, kind):
+    lines = []
+    if name in _HELP:
+        lines.append(f'# HELP {name} {_HELP[name]}')
+    lines.append(f'# TYPE {name} {kind}')
+    return lines
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -0,0 +1,93 @@
+"""Fetching only the Russian section of a page through the MediaWiki parse API.
+
+The full rendered page carries every language section plus the site chrome, while the Russian section is often a
+small part of it. The section list of the page is requested first, which also resolves redirects and reports the
+title and revision, then the HTML of the Russian section alone.
+"""
+import json
+import logging
+import urllib.parse
+from . cache import normalize_url
+from . wiktionaryparser import WIKTIONARY_URL, fetch_page, get_page_cache
+
+_LOG = logging.getLogger(__name__)
+
+LANGUAGE = 'Russian'
+EMPTY_SECTION = '<div class="mw-parser-output"></div>'
+
+
+class RussianSection:
+    def __init__(self, title, revision_id, html):
+        self.title = title
+        self.revision_id = revision_id
+        self.html = html
+
+    def __repr__(self):
+        return f'RussianSection({self.title!r}, {self.revision_id!r}, {len(self.html)} chars)'
+
+
+def parse_url(page, base_url=WIKTIONARY_URL, **params):
+    query = urllib.parse.urlencode({'action': 'parse', 'format': 'json', 'formatversion': 2, **params,
+                                    'page': page}, safe='|')
+    return f'{base_url}/w/api.php?{query}'
+
+
+def sections_url(word, base_url=WIKTIONARY_URL):
+    return parse_url(word, base_url, prop='sections|revid', redirects=1)
+
+
+def section_url(title, index, base_url=WIKTIONARY_URL):
+    return parse_url(title, base_url, prop='text|revid', section=index)
+
+
+def _parse_payload(content):
+    """The parse member of an API response, None when the API reported an error."""
+    response = json.loads(content.decode())
+    if 'error' in response:
+        return None
+    return response.get('parse')
+
+
+def _parse_request(url):
+    """The parse member of the API response for url, None when the request or the API failed.
+
+    Only successful responses are cached, and none in a cache holding rendered pages only, such as a PageArchive.
+    """
+    cache = get_page_cache()
+    cache_key = normalize_url(url) if cache is not None and not cache.pages_only else None
+    content = fetch_page(url, cache_key, cacheable=lambda content: _parse_payload(content) is not None)
+    if content is None:
+        return None
+    page = _parse_payload(content)
+    if page is None:
+        _LOG.info('Parse API error for %s: %s', url, json.loads(content.decode()).get('error', {}).get('code'))
+    return page
+
+
+def find_language_section(sections, language=LANGUAGE):
+    """Index of the level 2 section of language, None when the page has none."""
+    for section in sections:
+        if str(section.get('level')) == '2' and language in (section.get('anchor'), section.get('line')):
+            return section['index']
+    return None
+
+
+def fetch_russian_section(word, base_url=WIKTIONARY_URL):
+    """RussianSection of the page for word, None when the page is missing or the API could not be queried.
+
+    The html of pages without a Russian section is EMPTY_SECTION, which parses into no entries.
+    """
+    page = _parse_request(sections_url(word, base_url))
+    if page is None:
+        return None
+    title = page['title']
+    if title != word:
+        _LOG.info('Page redirected from word %s to %s', word, title)
+    index = find_language_section(page.get('sections', []))
+    if index is None:
+        _LOG.info('No %s section on page %s', LANGUAGE, title)
+        return RussianSection(title, page.get('revid'), EMPTY_SECTION)
+    section = _parse_request(section_url(title, index, base_url))
+    if section is None:
+        return None
+    return RussianSection(title, section.get('revid', page.get('revid')), section['text'])
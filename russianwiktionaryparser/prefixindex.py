@@ -0,0 +1,60 @@
+"""Offline prefix search over known headwords and inflected forms."""
+import urllib.parse
+from bisect import bisect_left
+from . wiktionaryparser import WIKTIONARY_URL, form_key
+
+
+class PrefixIndex:
+    """Sorted array of titles searched by prefix with binary search, ignoring case and stress marks.
+
+    search() answers in the shape of a MediaWiki opensearch response, so it can stand in for WiktionaryParser.search.
+    """
+
+    def __init__(self, titles=(), base_url=WIKTIONARY_URL):
+        self.base_url = base_url
+        pairs = sorted({(form_key(title), title) for title in titles if title})
+        self.keys = [key for key, _ in pairs]
+        self.titles = [title for _, title in pairs]
+
+    @classmethod
+    def from_entries(cls, entries, base_url=WIKTIONARY_URL):
+        """Index the headwords of entries and every form in their inflection tables."""
+        return cls(_entry_titles(entries), base_url)
+
+    @classmethod
+    def from_store(cls, store, base_url=WIKTIONARY_URL):
+        """Index the headwords and inflected forms of the entries held in an EntryStore, as from_entries does."""
+        return cls(_entry_titles(store.entries()), base_url)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __contains__(self, title):
+        key = form_key(title)
+        i = bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def complete(self, prefix, limit=10):
+        """Up to limit titles starting with prefix, in key order."""
+        key = form_key(prefix)
+        i = bisect_left(self.keys, key)
+        titles = []
+        while i < len(self.keys) and len(titles) < limit and self.keys[i].startswith(key):
+            titles.append(self.titles[i])
+            i += 1
+        return titles
+
+    def search(self, word, limit=10):
+        """[word, titles, descriptions, urls], as returned by the opensearch API."""
+        titles = self.complete(word, limit)
+        return [word, titles, [''] * len(titles),
+                [f'{self.base_url}/wiki/{urllib.parse.quote(title)}' for title in titles]]
+
+
+def _entry_titles(entries):
+    for entry in entries:
+        yield entry.word
+        if entry.inflections is not None:
+            for items in entry.inflections.to_json().values():
+                for item in items:
+                    yield item.replace('́', '')
@@ -0,0 +1,127 @@
+"""Incremental refresh of an EntryStore against the current revisions of its pages.
+
+The revision IDs of up to MAX_TITLES pages are checked with a single MediaWiki API request, and only pages whose
+revision differs from the one recorded in the store are downloaded and parsed again.
+"""
+import contextvars
+import json
+import logging
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from . import wiktionaryparser
+from . cache import normalize_word
+from . wiktionaryparser import WIKTIONARY_URL, fetch_page, get_page_cache, make_page_parser
+
+_LOG = logging.getLogger(__name__)
+
+MAX_TITLES = 50
+
+
+class RefreshReport:
+    def __init__(self):
+        self.unchanged = []
+        self.changed = []
+        self.removed = []
+        self.failed = []
+        self.revision_requests = 0
+        self.downloads = 0
+        self.bytes_downloaded = 0
+        self.start_time = time.perf_counter()
+
+    @property
+    def pages(self):
+        return len(self.unchanged) + len(self.changed) + len(self.removed) + len(self.failed)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def __str__(self):
+        return f'{self.pages} pages: {len(self.unchanged)} unchanged, {len(self.changed)} changed, ' \
+               f'{len(self.removed)} removed, {len(self.failed)} failed; {self.downloads} downloads ' \
+               f'({self.bytes_downloaded / 1024:.0f} KiB) and {self.revision_requests} revision checks ' \
+               f'instead of {self.pages} downloads'
+
+
+def revisions_url(titles, base_url=WIKTIONARY_URL):
+    titles = urllib.parse.quote('|'.join(titles))
+    return f'{base_url}/w/api.php?action=query&format=json&formatversion=2&prop=revisions&rvprop=ids&redirects=1' \
+           f'&titles={titles}'
+
+
+def fetch_revisions(titles, base_url=WIKTIONARY_URL):
+    """Map each title to the current revision ID of its page, None for missing pages. None if the request failed."""
+    resp = wiktionaryparser._http_get(revisions_url(titles, base_url))
+    if resp.status_code != 200:
+        _LOG.warning('Error received from server: %u', resp.status_code)
+        return None
+    query = json.loads(resp.content.decode()).get('query', {})
+    aliases = {alias['from']: alias['to'] for alias in query.get('normalized', []) + query.get('redirects', [])}
+    revisions = {page['title']: page['revisions'][0]['revid'] if page.get('revisions') else None
+                 for page in query.get('pages', [])}
+    result = {}
+    for title in titles:
+        resolved = aliases.get(title, title)
+        result[title] = revisions.get(aliases.get(resolved, resolved))
+    return result
+
+
+def refresh_store(parser, words=None, base_url=WIKTIONARY_URL, batch_size=MAX_TITLES, max_workers=8):
+    """Update the entries in parser.store whose pages changed since they were stored. Returns a RefreshReport.
+
+    words defaults to every headword in the store. Words without a recorded revision are always downloaded. Pages that
+    were deleted or no longer have Russian entries are removed from the store.
+    """
+    store = parser.store
+    if store is None:
+        raise ValueError('Refreshing needs a WiktionaryParser with an entry store')
+    words = store.words() if words is None else list(words)
+    report = RefreshReport()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, len(words), batch_size):
+            batch = words[start:start + batch_size]
+            report.revision_requests += 1
+            revisions = fetch_revisions(batch, base_url)
+            if revisions is None:
+                report.failed.extend(batch)
+                continue
+            downloads = {}
+            for word in batch:
+                revision = revisions[word]
+                if revision is None:
+                    _LOG.info('Page for "%s" no longer exists', word)
+                    store.remove(word)
+                    report.removed.append(word)
+                elif store.revision(word) == revision:
+                    report.unchanged.append(word)
+                else:
+                    url = f'{base_url}/wiki/{urllib.parse.quote(word)}'
+                    downloads[word] = revision, executor.submit(contextvars.copy_context().run, fetch_page, url)
+            for word, (revision, future) in downloads.items():
+                _update_page(parser, word, revision, future, report)
+    _LOG.info('Refresh finished: %s', report)
+    return report
+
+
+def _update_page(parser, word, revision, future, report):
+    try:
+        content = future.result()
+        if content is None:
+            raise wiktionaryparser.FetchError(f'Error fetching page for word "{word}"')
+        report.downloads += 1
+        report.bytes_downloaded += len(content)
+        entries = make_page_parser(word, content, parser.backend, detach=parser.detach).get_entries()
+    except Exception as e:
+        _LOG.warning('Failed to refresh "%s": %s', word, e)
+        report.failed.append(word)
+        return
+    cache = get_page_cache()
+    if cache is not None:
+        cache.put(normalize_word(word), content)
+    parser.store.replace(word, entries, revision)
+    if entries:
+        report.changed.append(word)
+    else:
+        _LOG.info('Page for "%s" no longer has Russian entries', word)
+        report.removed.append(word)
@@ -0,0 +1,122 @@
+"""Resolution of form-of entries to the entries of their base words."""
+import contextvars
+import copy
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from . cache import normalize_url
+from . wiktionaryparser import WIKTIONARY_URL, WiktionaryParser
+
+_LOG = logging.getLogger(__name__)
+
+
+class BaseResolver:
+    """Fetches the base entries that purely form-of entries link to.
+
+    Base links are deduplicated across a batch and distinct pages are fetched concurrently. Resolved pages are
+    memoized, and callers asking for a page that is already being fetched wait on that fetch instead of starting
+    another one. Every caller gets its own copies of the base entries, with the tracing of the entry it followed.
+    """
+
+    def __init__(self, parser=None, max_workers=8, base_url=WIKTIONARY_URL):
+        self.parser = parser if parser is not None else WiktionaryParser()
+        self.max_workers = max_workers
+        self.base_url = base_url
+        self._resolved = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def resolve(self, entries):
+        """Base entries of each of entries, as one list per entry, empty for entries that are not purely form-of."""
+        entries = list(entries)
+        futures = self._request(entries)
+        return [[base for _, followed in self._followed(entry, futures) for base in followed] for entry in entries]
+
+    def follow(self, entries):
+        """Entries with each purely form-of entry replaced by its base entries.
+
+        An entry is kept when none of its bases could be resolved, and a base page linked from several entries is
+        only included once.
+        """
+        entries = list(entries)
+        futures = self._request(entries)
+        result = []
+        seen = set()
+        for entry in entries:
+            followed = list(self._followed(entry, futures))
+            if not followed:
+                result.append(entry)
+            for key, bases in followed:
+                if key not in seen:
+                    seen.add(key)
+                    result.extend(bases)
+        return result
+
+    def _base_links(self, entry):
+        """Distinct base links of a purely form-of entry, by cache key."""
+        links = {}
+        if entry._purely_base:
+            for base in entry.base_links:
+                links.setdefault(normalize_url(self.base_url + base['link']), base)
+        return links
+
+    def _request(self, entries):
+        futures = {}
+        with self._lock:
+            for entry in entries:
+                for key, base in self._base_links(entry).items():
+                    if key in futures:
+                        continue
+                    if key in self._resolved:
+                        futures[key] = Future()
+                        futures[key].set_result(self._resolved[key])
+                    elif key in self._in_flight:
+                        _LOG.debug('Waiting on fetch in flight for base %s', base['word'])
+                        futures[key] = self._in_flight[key]
+                    else:
+                        if self._executor is None:
+                            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                        futures[key] = self._executor.submit(contextvars.copy_context().run, self._fetch, key,
+                                                             self.base_url + base['link'])
+                        self._in_flight[key] = futures[key]
+        wait(futures.values())
+        return futures
+
+    def _fetch(self, key, url):
+        entries = []
+        try:
+            entries = [entry.detach() for entry in self.parser.fetch_from_url(url)]
+            return entries
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                if entries:
+                    self._resolved[key] = entries
+
+    def _followed(self, entry, futures):
+        for key, base in self._base_links(entry).items():
+            try:
+                resolved = futures[key].result()
+            except Exception as e:
+                _LOG.warning('Failed to follow "%s" to base %s: %s', entry.word, base['word'], e)
+                continue
+            followed = []
+            for base_entry in resolved:
+                base_entry = copy.copy(base_entry)
+                base_entry.tracing = base_entry.tracing + entry.tracing + [f"Followed to base {base['word']}"]
+                followed.append(base_entry)
+            if followed:
+                yield key, followed
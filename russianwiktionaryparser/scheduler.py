@@ -0,0 +1,180 @@
+"""Rate limiting, retries and adaptive concurrency for the parser's HTTP requests."""
+import logging
+import random
+import sys
+import threading
+import time
+from . metrics import HTTP_RETRIES, current_metrics
+
+_LOG = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+
+class TokenBucket:
+    """Allows rate acquisitions per second on average, with bursts of up to burst."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RequestScheduler:
+    """Paces and retries requests, adapting how many run at once to how the server responds.
+
+    Requests are throttled by a token bucket when rate is set. Responses with a status in RETRY_STATUSES and
+    connection errors are retried up to max_retries times: after the Retry-After the server asked for, which also pauses
+    every other request, or else after an exponential backoff with full jitter. Concurrency grows by one after every
+    increase_after healthy responses up to max_concurrency and is halved when the server throttles, at most once per
+    backoff period.
+    """
+
+    def __init__(self, rate=None, burst=1, max_retries=5, backoff=0.5, max_backoff=60.0, initial_concurrency=8,
+                 max_concurrency=32, increase_after=10):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase_after = increase_after
+        self._active = 0
+        self._healthy = 0
+        self._resume_at = 0.0
+        self._decrease_after = 0.0
+        self._cond = threading.Condition()
+
+    def request(self, send, streamed=False):
+        """Call send() until it returns a response that should not be retried, or retries run out.
+
+        Returns the last response. The last connection error is raised when every attempt failed with one. With
+        streamed set, for responses whose body is read after send() returns, the request keeps its concurrency slot
+        until the returned response is closed.
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            resp = error = None
+            try:
+                resp = send()
+            except Exception as e:
+                if not is_connection_error(e):
+                    raise
+                error = e
+            finally:
+                if not streamed or resp is None or resp.status_code in RETRY_STATUSES:
+                    self._release()
+            if resp is not None and resp.status_code not in RETRY_STATUSES:
+                self._on_healthy()
+                if streamed:
+                    self._release_on_close(resp)
+                return resp
+            delay = self._on_throttled(resp, attempt)
+            if attempt >= self.max_retries:
+                _LOG.warning('Giving up after %i attempts: %s', attempt + 1, error or resp.status_code)
+                if error is not None:
+                    raise error
+                return resp
+            if resp is not None:
+                resp.close()
+            reason = error or resp.status_code
+            _LOG.info('Retrying in %.2fs (attempt %i): %s', delay, attempt + 1, reason)
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.inc(HTTP_RETRIES, reason='error' if error is not None else str(resp.status_code))
+            attempt += 1
+            time.sleep(delay)
+
+    def _acquire(self):
+        while True:
+            delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        with self._cond:
+            while self._active >= self.concurrency:
+                self._cond.wait()
+            self._active += 1
+        if self.bucket is not None:
+            self.bucket.acquire()
+
+    def _release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def _release_on_close(self, resp):
+        close = resp.close
+        released = threading.Event()
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    self._release()
+        resp.close = close_and_release
+
+    def _on_healthy(self):
+        with self._cond:
+            self._healthy += 1
+            if self._healthy >= self.increase_after and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._healthy = 0
+                self._cond.notify()
+
+    def _on_throttled(self, resp, attempt):
+        """Back off after a throttled or failed attempt, returning how long to wait before retrying."""
+        retry_after = parse_retry_after(resp.headers.get('Retry-After')) if resp is not None else None
+        if retry_after is not None:
+            delay = min(retry_after, self.max_backoff)
+        else:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        now = time.monotonic()
+        with self._cond:
+            self._healthy = 0
+            if retry_after is not None:
+                self._resume_at = max(self._resume_at, now + delay)
+            if now >= self._decrease_after:
+                self.concurrency = max(1, self.concurrency // 2)
+                self._decrease_after = now + max(delay, self.backoff)
+                _LOG.info('Server throttling, concurrency lowered to %i', self.concurrency)
+        return delay
+
+
+def is_connection_error(error):
+    """Whether error is a requests connection error or timeout, without importing requests when it is unused."""
+    requests = sys.modules.get('requests')
+    return requests is not None and isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header in delay-seconds or HTTP-date form, None if absent or invalid."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,170 @@
+import json
+import sqlite3
+import threading
+from itertools import islice
+from . binary import decode_entry, encode_entry
+from . wiktionaryparser import WiktionaryEntry, form_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    word_key TEXT NOT NULL,
+    part_of_speech TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS forms (
+    form TEXT NOT NULL,
+    entry_id INTEGER NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+    PRIMARY KEY (form, entry_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pages (
+    word TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_word ON entries(word);
+CREATE INDEX IF NOT EXISTS entries_word_key ON entries(word_key);
+CREATE INDEX IF NOT EXISTS forms_entry_id ON forms(entry_id);
+"""
+
+
+def load_entry(data):
+    """Entry of a stored row, either a binary record or the serialize() JSON of earlier versions."""
+    if isinstance(data, str):
+        return WiktionaryEntry.build_from_serial(json.loads(data))
+    return decode_entry(data)
+
+
+class EntryStore:
+    """SQLite store of serialized entries, indexed by headword and by every inflected form.
+
+    Entries are stored as binary.encode_entry records, so a stored entry comes back with every field it was added
+    with. Rows written as serialize() JSON by earlier versions are still read through build_from_serial.
+    """
+
+    def __init__(self, path=':memory:', batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def add(self, entries):
+        """Store entries (any iterable, consumed in batches), each batch in a single transaction. Returns the count."""
+        entries = iter(entries)
+        count = 0
+        while True:
+            batch = list(islice(entries, self.batch_size))
+            if not batch:
+                return count
+            self._add_batch(batch)
+            count += len(batch)
+
+    def _add_batch(self, batch):
+        with self._lock, self._conn:
+            self._insert(batch)
+
+    def _insert(self, batch):
+        next_id = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM entries').fetchone()[0] + 1
+        rows = []
+        forms = []
+        for entry_id, entry in enumerate(batch, next_id):
+            rows.append((entry_id, entry.word, form_key(entry.word), entry.part_of_speech, encode_entry(entry)))
+            if entry.inflections is not None:
+                forms.extend((form, entry_id) for form in entry.inflections.to_lower_set())
+        self._conn.executemany('INSERT INTO entries (id, word, word_key, part_of_speech, data) '
+                               'VALUES (?, ?, ?, ?, ?)', rows)
+        self._conn.executemany('INSERT INTO forms (form, entry_id) VALUES (?, ?)', forms)
+
+    def replace(self, word, entries, revision=None):
+        """Replace every entry stored for headword with entries, in a single transaction. Returns the count.
+
+        revision, when given, is recorded for the headword of the new entries.
+        """
+        entries = list(entries)
+        with self._lock, self._conn:
+            self._delete(word)
+            for start in range(0, len(entries), self.batch_size):
+                self._insert(entries[start:start + self.batch_size])
+            if revision is not None and entries:
+                self._conn.execute('INSERT OR REPLACE INTO pages (word, revision) VALUES (?, ?)',
+                                   (entries[0].word, revision))
+        return len(entries)
+
+    def remove(self, word):
+        with self._lock, self._conn:
+            self._delete(word)
+
+    def _delete(self, word):
+        self._conn.execute('DELETE FROM entries WHERE word = ?', (word,))
+        self._conn.execute('DELETE FROM pages WHERE word = ?', (word,))
+
+    def set_revision(self, word, revision):
+        """Record the revision ID of the page the entries of word were parsed from."""
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO pages (word, revision) VALUES (?, ?)', (word, revision))
+
+    def revision(self, word):
+        """Revision ID recorded for word, None if there is none."""
+        with self._lock:
+            row = self._conn.execute('SELECT revision FROM pages WHERE word = ?', (word,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _query(self, sql, args):
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [load_entry(data) for data, in rows]
+
+    def get(self, word):
+        """Entries stored for the headword, in the order they were added."""
+        return self._query('SELECT data FROM entries WHERE word = ? ORDER BY id', (word,))
+
+    def entries(self):
+        """Every stored entry in the order they were added, read batch_size rows at a time."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute('SELECT id, data FROM entries WHERE id > ? ORDER BY id LIMIT ?',
+                                          (last_id, self.batch_size)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for _, data in rows:
+                yield load_entry(data)
+
+    def lookup(self, form):
+        """Entries whose headword or any inflected form matches form, ignoring case and stress marks."""
+        key = form_key(form)
+        return self._query('SELECT data FROM entries WHERE id IN ('
+                           'SELECT id FROM entries WHERE word_key = ? '
+                           'UNION SELECT entry_id FROM forms WHERE form = ?) ORDER BY id', (key, key))
+
+    def __contains__(self, word):
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM entries WHERE word = ? LIMIT 1', (word,)).fetchone() is not None
+
+    def words(self):
+        with self._lock:
+            return [word for word, in self._conn.execute('SELECT DISTINCT word FROM entries ORDER BY word')]
+
+    def forms(self):
+        """Every distinct inflected form, lowercased and without stress marks."""
+        with self._lock:
+            return [form for form, in self._conn.execute('SELECT DISTINCT form FROM forms ORDER BY form')]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
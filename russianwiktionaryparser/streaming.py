@@ -0,0 +1,109 @@
+"""Incremental parse of a page as it downloads, stopping at the end of its Russian section.
+
+The page is fed in chunks to lxml's pull parser. Every top level element of the Russian section goes through a
+SectionWalker as soon as it is complete, so an entry is available once the next heading closes its part of speech
+section, long before the rest of the page arrives. The first h2 after the Russian section ends the parse, and the
+rest of the page is never read.
+"""
+import logging
+import lxml.html
+from lxml import etree
+from . lxmlparser import get_text, heading_of, parse_entry
+from . metrics import current_metrics
+from . wiktionaryparser import SectionWalker, parse_revision_id, record_entries
+
+_LOG = logging.getLogger(__name__)
+
+
+class StreamingPageParser:
+    """Parses a page fed to it chunk by chunk, producing the same entries as LxmlPageParser.
+
+    feed and close return the entries completed by the content given so far. done is set once the Russian section
+    has ended, after which the rest of the page can be dropped.
+    """
+
+    def __init__(self, entered_word, metrics=None):
+        self.entered_word = entered_word
+        self.metrics = metrics if metrics is not None else current_metrics()
+        self.page_title = ''
+        self.revision_id = None
+        self.entries = []
+        self.bytes_read = 0
+        self.done = False
+        self._parser = etree.HTMLPullParser(events=('end',), encoding='utf-8')
+        self._parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        self._container = None
+        self._walker = None
+
+    def feed(self, data):
+        if self.done:
+            return []
+        self.bytes_read += len(data)
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self):
+        """Entries left once the whole page was fed, or the end of the Russian section reached."""
+        if not self.done:
+            self._parser.close()
+            entries = self._read_events()
+            if not self.done:
+                entries.extend(self._finish())
+            return entries
+        return []
+
+    def _read_events(self):
+        entries = []
+        for _, element in self._parser.read_events():
+            if self.done:
+                break
+            if self._walker is None:
+                self._before_section(element)
+            elif element.getparent() is self._container:
+                if element.tag == 'h2':
+                    entries.extend(self._finish())
+                else:
+                    entries.extend(self._parse(self._walker.add(element)))
+            elif element is self._container:
+                entries.extend(self._finish())
+        return entries
+
+    def _before_section(self, element):
+        tag = element.tag
+        if tag == 'h1' and 'firstHeading' in element.get('class', '').split():
+            self.page_title = get_text(element)
+            _LOG.debug('Page title found: %s', self.page_title)
+            if self.entered_word != self.page_title:
+                _LOG.info('Page redirected from word %s to %s', self.entered_word, self.page_title)
+        elif tag == 'script' and self.revision_id is None and 'wgRevisionId' in (element.text or ''):
+            self.revision_id = parse_revision_id(element.text)
+        elif tag == 'h2':
+            heading = heading_of(element)
+            if heading[1] is not None and heading[1].get('id') == 'Russian':
+                self._container = element.getparent()
+                self._walker = SectionWalker(heading_of)
+
+    def _parse(self, sections):
+        entries = [parse_entry(self.page_title, section, self.metrics) for section in sections]
+        self.entries.extend(entries)
+        return entries
+
+    def _finish(self):
+        self.done = True
+        if self._walker is None:
+            _LOG.warning('No russian entries found on page!')
+            entries = []
+        else:
+            entries = self._parse(self._walker.close())
+        record_entries(self.metrics, self.entries)
+        return entries
+
+
+def stream_entries(entered_word, chunks, metrics=None):
+    """Yield the entries of a page given as an iterable of byte chunks, reading no more chunks than needed."""
+    page = StreamingPageParser(entered_word, metrics)
+    for chunk in chunks:
+        yield from page.feed(chunk)
+        if page.done:
+            return
+    yield from page.close()
@@ -0,0 +1,116 @@
+"""Batch conversion of downloaded audio files to mp3 on a process pool."""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+_LOG = logging.getLogger(__name__)
+
+
+class TranscodeError(Exception):
+    pass
+
+
+class TranscodeStats:
+    def __init__(self):
+        self.files = 0
+        self.converted = 0
+        self.skipped = 0
+        self.failed = 0
+        self.start_time = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    @property
+    def files_per_sec(self):
+        elapsed = self.elapsed
+        return self.files / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self):
+        return f'{self.files} files ({self.converted} converted, {self.skipped} up to date, {self.failed} failed), ' \
+               f'{self.files_per_sec:.1f} files/sec'
+
+
+class ConversionResult:
+    def __init__(self, source, target, error=None, skipped=False):
+        self.source = source
+        self.target = target
+        self.error = error
+        self.skipped = skipped
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = 'skipped' if self.skipped else 'ok' if self.ok else f'error={self.error!r}'
+        return f'ConversionResult({self.source!r}, {status})'
+
+
+def mp3_path(source):
+    """Path of the mp3 converted from source, next to it. Only the extension of the file name is replaced."""
+    return os.path.splitext(source)[0] + '.mp3'
+
+
+def is_up_to_date(source, target):
+    """Whether target exists and is no older than source.
+
+    False when either file is missing, so a missing source fails its own conversion rather than the whole batch.
+    """
+    try:
+        return os.path.getmtime(target) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+def export_mp3(source, target):
+    """Convert source to an mp3 at target, written to a temporary file first so target is never left partial."""
+    from pydub import AudioSegment
+    tmp_target = f'{target}.{os.getpid()}.part'
+    try:
+        AudioSegment.from_file(source).export(tmp_target, format='mp3')
+        os.replace(tmp_target, target)
+    except Exception as e:
+        if os.path.exists(tmp_target):
+            os.remove(tmp_target)
+        # raised again as a plain exception so it pickles back from the worker process
+        raise TranscodeError(f'{type(e).__name__}: {e}') from None
+
+
+def transcode_many(files, max_workers=None, force=False, progress=None, convert=export_mp3):
+    """Convert audio files to mp3 files next to them on a pool of max_workers processes.
+
+    Yields a ConversionResult per file as conversions finish. Files that are already mp3, or whose mp3 is newer than
+    the file, are skipped unless force is set. Failures are reported on the result instead of aborting the batch.
+    progress is called with the TranscodeStats after every file.
+    """
+    stats = TranscodeStats()
+
+    def report(result):
+        stats.files += 1
+        if result.skipped:
+            stats.skipped += 1
+        elif result.ok:
+            stats.converted += 1
+        else:
+            stats.failed += 1
+            _LOG.warning('Failed to convert %s: %s', result.source, result.error)
+        if progress is not None:
+            progress(stats)
+        return result
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for source in files:
+            target = mp3_path(source)
+            if source == target or (not force and is_up_to_date(source, target)):
+                yield report(ConversionResult(source, target, skipped=True))
+            else:
+                futures[executor.submit(convert, source, target)] = source, target
+        for future in as_completed(futures):
+            source, target = futures[future]
+            error = future.exception()
+            yield report(ConversionResult(source, target, error=error))
+    _LOG.info('Transcoding finished: %s', stats)
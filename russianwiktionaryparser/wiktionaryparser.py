@@ -2,19 +2,44 @@ import copy
 import json
 import os
 import re
+import sys
 import urllib
 import logging
-import bs4
-import requests
-from pydub import AudioSegment
+import threading
+import time
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from . entries import WordEntry, WordDefinition, WordExample
 from . parsers import Parser
+from . cache import normalize_url, normalize_word
+from . scheduler import RequestScheduler
+from . metrics import CACHE_LOOKUPS, DEFINITIONS, ENTRIES, HTTP_BYTES, HTTP_REQUESTS, HTTP_SECONDS, PAGES, \
+    SOUP_SECONDS, STAGE_SECONDS, current_metrics, timer, use_metrics
 
 _LOG = logging.getLogger(__name__)
 
+WIKTIONARY_URL = 'https://en.wiktionary.org'
+
+_PAGE_CACHE = None
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+POOL_SIZE = 32
+_SCHEDULER = RequestScheduler(max_concurrency=POOL_SIZE)
+BACKENDS = ('bs4', 'lxml')
+MODES = ('page', 'api')
+
+
+_UNPARSED = object()
+_REVISION_ID = re.compile(r'"wgRevisionId":(\d+)')
+_LAZY_FIELDS = ('definitions', 'inflections', 'audio_links', 'base_links')
+_HEADINGS = ['h2', 'h3', 'h4', 'h5', 'h6']
+
 
 class WiktionaryInflectionTable:
-    def __init__(self, table_soup: bs4.BeautifulSoup):
+    __slots__ = ('_json', '_stripped')
+
+    def __init__(self, table_soup: 'bs4.BeautifulSoup'):
         self._json = {}
         self._stripped = {}
 
@@ -26,7 +51,7 @@ class WiktionaryInflectionTable:
                 classes = entry['class']
                 for cls in classes:
                     if cls.endswith('-form-of'):
-                        entry_key = cls.replace('-form-of', '')
+                        entry_key = sys.intern(cls.replace('-form-of', ''))
                         item = entry.get_text().strip()
                         # self._json[entry_key] = self._json.get(entry_key, []).append(item)
                         # self._stripped[entry_key] = self._stripped.get(entry_key, []).append(item.replace('́', ''))
@@ -53,11 +78,13 @@ class WiktionaryInflectionTable:
     @classmethod
     def build_from_serial(cls, inflections):
         inflections_table = WiktionaryInflectionTable(None)
-        inflections_table._json = inflections
+        inflections_table._json = {sys.intern(key): items for key, items in inflections.items()}
         return inflections_table
 
 
 class WiktionaryExample(WordExample):
+    __slots__ = ()
+
     def __init__(self, examples_tag=None):
         super().__init__()
         self._text = ''
@@ -78,6 +105,8 @@ class WiktionaryExample(WordExample):
 
 
 class WiktionaryDefinition(WordDefinition):
+    __slots__ = ('base_word', 'base_link')
+
     def __init__(self, list_item=None):
         super().__init__()
         self.base_word = ''
@@ -120,47 +149,128 @@ class WiktionaryEntry(WordEntry):
     pos_list = ['Verb', 'Noun', 'Adjective', 'Pronoun', 'Conjunction', 'Proper noun', 'Numeral', 'Preposition',
                 'Adverb', 'Participle', 'Letter', 'Prefix', 'Punctuation mark', 'Interjection', 'Determiner',
                 'Predicative', 'Proverb', 'Particle']
+    __slots__ = ('_section', '_pos_heading', '_metrics', '_definitions', '_inflections', '_audio_links', '_base_links',
+                 '_base_links_set', 'tracing')
+
+    def __init__(self, word, pos_header=None, tracing=None, *args, metrics=None, lazy=False, section=None, **kwargs):
+        """Entry for the part of speech under pos_header, read from its PageSection, found by walking the page when
+        section is not given.
 
-    def __init__(self, word, pos_header=None, tracing=None, *args, **kwargs):
+        With lazy set, definitions, inflections, audio links and base links are parsed on first access instead of
+        here, and the entry keeps its section of the page until then.
+        """
         super().__init__(word, *args, **kwargs)
         self.word = word
-        self._soup = None
+        self._section = None
+        self._pos_heading = None
+        self._metrics = None
         self.part_of_speech = ''
         self.definitions = []
-        self.inflections = None
-        self.audio_links = []
-        self.base_links = []
-        self.base_links_set = set()
+        self._inflections = None
+        self._audio_links = []
+        self._base_links = []
+        self._base_links_set = set()
         self.tracing = tracing if tracing is not None else []
 
         if pos_header is not None:
-            self._soup = pos_header.parent.parent
+            self._section = section if section is not None else pos_section(pos_header)
             self._parse_part_of_speech(pos_header)
-            self._parse_definitions()
-            self._parse_inflection_table()
-            self._parse_audio_links()
+            if lazy:
+                self._metrics = metrics
+                self._definitions = self._inflections = self._audio_links = self._base_links = _UNPARSED
+            else:
+                with timer(metrics, STAGE_SECONDS, stage='definitions'):
+                    self._parse_definitions()
+                with timer(metrics, STAGE_SECONDS, stage='inflection_table'):
+                    self._parse_inflection_table()
+                with timer(metrics, STAGE_SECONDS, stage='audio_links'):
+                    self._parse_audio_links()
+                self._parse_base_links()
+
+    @property
+    def definitions(self):
+        if self._definitions is _UNPARSED:
+            self._definitions = []
+            with timer(self._metrics, STAGE_SECONDS, stage='definitions'):
+                self._parse_definitions()
+            if self._metrics is not None:
+                self._metrics.inc(DEFINITIONS, len(self._definitions))
+        return self._definitions
+
+    @definitions.setter
+    def definitions(self, definitions):
+        self._definitions = definitions
+
+    @property
+    def inflections(self):
+        if self._inflections is _UNPARSED:
+            self._inflections = None
+            with timer(self._metrics, STAGE_SECONDS, stage='inflection_table'):
+                self._parse_inflection_table()
+        return self._inflections
+
+    @inflections.setter
+    def inflections(self, inflections):
+        self._inflections = inflections
+
+    @property
+    def audio_links(self):
+        if self._audio_links is _UNPARSED:
+            self._audio_links = []
+            with timer(self._metrics, STAGE_SECONDS, stage='audio_links'):
+                self._parse_audio_links()
+        return self._audio_links
+
+    @property
+    def base_links(self):
+        if self._base_links is _UNPARSED:
+            self._base_links = []
             self._parse_base_links()
+        return self._base_links
+
+    @property
+    def base_links_set(self):
+        self.base_links  # parses the base links of a lazy entry
+        return self._base_links_set
+
+    @property
+    def is_parsed(self):
+        """False while a lazy entry still has fields left to parse."""
+        return _UNPARSED not in (self._definitions, self._inflections, self._audio_links, self._base_links)
 
     @classmethod
     def build_from_serial(cls, serial):
         entry = WiktionaryEntry(serial['word'])
-        entry.part_of_speech = serial['part_of_speech']
+        entry.part_of_speech = sys.intern(serial['part_of_speech'])
         for definition in serial.get('definitions', []):
             entry.definitions.append(WiktionaryDefinition.build_from_serial(definition))
         if 'inflections' in serial:
             entry.inflections = WiktionaryInflectionTable.build_from_serial(serial['inflections'])
         return entry
 
-    def follow_to_base(self):
-        entries = []
-        if self._purely_base:
-            if len(self.base_links_set) == 1:
-                wiki = WiktionaryParser()
-                entries = wiki.fetch_from_url('https://en.wiktionary.org' + self.base_links_set.pop())
-                for entry in entries:
-                    entry.tracing.extend(self.tracing)
-                    entry.tracing.append(f"Followed to base {self.base_links[0]['word']}")
-        return entries
+    def follow_to_base(self, resolver=None):
+        """Entries of the base words this entry is a form of, through resolver when given."""
+        if resolver is not None:
+            return resolver.resolve([self])[0]
+        from . resolver import BaseResolver
+        with BaseResolver() as resolver:
+            return resolver.resolve([self])[0]
+
+    def detach(self):
+        """Drop the references this entry holds into the parse tree, keeping only the extracted data.
+
+        Fields a lazy entry has not parsed yet are parsed first.
+        """
+        for field in _LAZY_FIELDS:
+            getattr(self, field)
+        self._section = None
+        self._pos_heading = None
+        self._metrics = None
+        return self
+
+    @property
+    def is_detached(self):
+        return self._section is None and self._pos_heading is None
 
     @property
     def _purely_base(self):
@@ -187,13 +297,12 @@ class WiktionaryEntry(WordEntry):
         self._pos_heading = pos_header
         heading_id = pos_header['id']
         stripped_heading_id = remove_trailing_numbers(heading_id).replace('_', ' ')
-        self.part_of_speech = stripped_heading_id
+        self.part_of_speech = sys.intern(stripped_heading_id)
         _LOG.debug('Part of speech found: %s', self.part_of_speech)
 
     def _parse_definitions(self):
-        if self._pos_heading is not None:
-            next_items = self._pos_heading.parent.find_next_siblings()
-            for item in next_items:
+        if self._section is not None:
+            for item in self._section.elements:
                 if item.name == 'ol':
                     def_list = list(item.children)
                     for definition in def_list:
@@ -207,7 +316,9 @@ class WiktionaryEntry(WordEntry):
             self.definitions.append(WiktionaryDefinition(definition))
 
     def _parse_inflection_table(self):
-        inflection_table = self._soup.find('table', {'class': re.compile('inflection-table')})
+        inflection_table = find_first(self._section.elements, is_inflection_table)
+        if inflection_table is None:
+            inflection_table = find_first(self._section.shared_elements(), is_inflection_table)
         if inflection_table is not None:
             self.inflections = WiktionaryInflectionTable(inflection_table)
         else:
@@ -229,7 +340,7 @@ class WiktionaryEntry(WordEntry):
         return ser
 
     def _parse_audio_links(self):
-        audio_meta = self._soup.find_all('td', {'class': 'audiometa'})
+        audio_meta = find_every(self._section.shared_elements() + self._section.elements, is_audio_meta)
         if audio_meta:
             _LOG.debug('%i audio links found', len(audio_meta))
             for meta_data in audio_meta:
@@ -256,69 +367,225 @@ class WiktionaryEntry(WordEntry):
         return False
 
 
+def new_section():
+    """Empty container for a page section, standing in for the page's mw-parser-output div."""
+    from bs4.element import Tag
+    return Tag(name='div', attrs={'class': ['mw-parser-output']})
+
+
+def move_siblings(first, section):
+    """Move first and its following siblings up to the next h2 into section.
+
+    The nodes are detached from their tree rather than copied, so no part of the page is duplicated.
+    """
+    from bs4.element import Tag
+    next_sibling = first
+    while next_sibling is not None:
+        if isinstance(next_sibling, Tag) and next_sibling.name == 'h2':
+            break
+        node = next_sibling
+        next_sibling = node.next_sibling
+        section.append(node.extract())
+    return section
+
+
+class PageSection:
+    """A heading of the Russian section and the top level elements it owns, built by walk_sections.
+
+    A part of speech section owns the elements up to the next heading of its level or above, its subsections
+    included. Elements outside any part of speech section, such as a Pronunciation section, are owned by the
+    enclosing etymology or language section and shared with the part of speech sections under it.
+    """
+    __slots__ = ('headline', 'level', 'is_pos', 'scope', 'elements')
+
+    def __init__(self, headline=None, level=2, is_pos=False, scope=None):
+        self.headline = headline
+        self.level = level
+        self.is_pos = is_pos
+        self.scope = scope
+        self.elements = []
+
+    def shared_elements(self):
+        """Elements shared with this section by the sections enclosing it, outermost first."""
+        scopes = []
+        scope = self.scope
+        while scope is not None:
+            scopes.append(scope)
+            scope = scope.scope
+        return [element for scope in reversed(scopes) for element in scope.elements]
+
+
+class SectionWalker:
+    """Builds the PageSections of a language section from its top level elements, added one at a time.
+
+    heading_of(element) gives (level, headline, headline text) for a heading element and None for any other.
+    """
+
+    def __init__(self, heading_of):
+        self.heading_of = heading_of
+        self.language = PageSection()
+        # (heading level, section owning the elements under the heading, section the heading starts if any)
+        self._stack = [(self.language.level, self.language, self.language)]
+        self._open = []
+        self._closed = set()
+
+    def add(self, element):
+        """Add the next element, returning the part of speech sections it completes, in document order."""
+        heading = self.heading_of(element)
+        if heading is None:
+            self._stack[-1][1].elements.append(element)
+            return []
+        level, headline, text = heading
+        while len(self._stack) > 1 and self._stack[-1][0] >= level:
+            section = self._stack.pop()[2]
+            if section is not None and section.is_pos:
+                self._closed.add(section)
+        owner = self._stack[-1][1]
+        scope = owner.scope if owner.is_pos else owner
+        section = None
+        if headline is not None and remove_trailing_numbers(text) in WiktionaryEntry.pos_list:
+            owner = section = PageSection(headline, level, True, scope)
+            self._open.append(section)
+        elif level == 2 or headline is not None and 'Etymology' in headline.get('id', ''):
+            owner = section = PageSection(headline, level, False, scope)
+        self._stack.append((level, owner, section))
+        return self._completed()
+
+    def close(self):
+        """The part of speech sections still open at the end of the language section."""
+        sections, self._open = self._open, []
+        return sections
+
+    def _completed(self):
+        done = 0
+        while done < len(self._open) and self._open[done] in self._closed:
+            self._closed.discard(self._open[done])
+            done += 1
+        sections, self._open = self._open[:done], self._open[done:]
+        return sections
+
+
+def walk_sections(elements, heading_of):
+    """Part of speech sections among the top level elements of a language section, in a single pass over them."""
+    walker = SectionWalker(heading_of)
+    sections = []
+    for element in elements:
+        sections.extend(walker.add(element))
+    sections.extend(walker.close())
+    return sections
+
+
+def heading_of(element):
+    """(level, headline, headline text) of an h2 to h6 tag, None for any other tag."""
+    if element.name not in _HEADINGS:
+        return None
+    headline = element.find('span', {'class': 'mw-headline'})
+    return int(element.name[1]), headline, headline.get_text() if headline is not None else ''
+
+
 def split_page_by_etymology(etymologies):
+    """A section per etymology headline, holding copies of the elements under it up to the next etymology.
+
+    The parser no longer splits pages by etymology, walk_sections gives each part of speech section the elements of
+    its etymology. This is kept for callers of the earlier API and leaves the page untouched.
+    """
     split_page = []
     for i, etymology in enumerate(etymologies):
-        new_page = bs4.BeautifulSoup("<html><body><div class=\"mw-parser-output\"></div></body></html>",
-                                     features="lxml")
-        etymology_parent = etymology.parent
-        if etymology_parent is not None and etymology_parent.name == 'h3':
-            next_sibling = etymology_parent.next_sibling
-            next_etymology = etymologies[i + 1].parent if i + 1 < len(etymologies) else None
-            while next_sibling != next_etymology:
-                new_page.body.div.append(copy.copy(next_sibling))
-                next_sibling = next_sibling.next_sibling
-        else:
+        heading = etymology.parent
+        if heading is None or heading.name != 'h3':
             logging.debug('Error parsing etymologies')
             return split_page
-
-        split_page.append(new_page)
+        next_etymology = etymologies[i + 1].parent if i + 1 < len(etymologies) else None
+        section = new_section()
+        for sibling in heading.next_siblings:
+            if sibling is next_etymology or sibling.name == 'h2':
+                break
+            section.append(copy.copy(sibling))
+        split_page.append(section)
     return split_page
 
 
+def get_parts_of_speech(soup):
+    """Part of speech headlines of a language section, in document order."""
+    return [section.headline for section in walk_sections(soup.find_all(True, recursive=False), heading_of)]
+
+
+def pos_section(pos_header):
+    """Section of a part of speech headline, walking the section holding its heading."""
+    for section in walk_sections(pos_header.parent.parent.find_all(True, recursive=False), heading_of):
+        if section.headline is pos_header:
+            return section
+    return PageSection(pos_header, is_pos=True)
+
+
+def is_inflection_table(tag):
+    return tag.name == 'table' and any('inflection-table' in cls for cls in tag.get('class', ()))
+
+
+def is_audio_meta(tag):
+    return tag.name == 'td' and 'audiometa' in tag.get('class', ())
+
+
+def find_first(elements, match):
+    """First tag matching match among elements and their descendants."""
+    for element in elements:
+        if match(element):
+            return element
+        found = element.find(match)
+        if found is not None:
+            return found
+    return None
+
+
+def find_every(elements, match):
+    """Every tag matching match among elements and their descendants, in document order."""
+    found = []
+    for element in elements:
+        if match(element):
+            found.append(element)
+        found.extend(element.find_all(match))
+    return found
+
+
 class WiktionaryPageParser:
-    def __init__(self, entered_word, soup: bs4.BeautifulSoup):
+    def __init__(self, entered_word, soup: 'bs4.BeautifulSoup', title=None, metrics=None, detach=False, lazy=False):
         self.entered_word = entered_word
         self.raw_soup = soup
+        self.metrics = metrics if metrics is not None else current_metrics()
         self.page_title = ''
-        self._get_title()
-        self.filtered_soup = self.filter_language()
+        self.revision_id = None
+        if title is None:
+            with timer(self.metrics, STAGE_SECONDS, stage='title'):
+                self._get_title()
+        else:
+            self.page_title = title
+        with timer(self.metrics, STAGE_SECONDS, stage='filter_language'):
+            self.filtered_soup = self.filter_language()
         self.entries = []
 
         if self.filtered_soup is not None:
-            etymologies = self.filtered_soup.find_all('span', {'class': 'mw-headline', 'id': re.compile('Etymology')})
-            if len(etymologies) > 1:
-                split_page = split_page_by_etymology(etymologies)
-            else:
-                split_page = [self.filtered_soup]
-
-            for page in split_page:
-                pos_list = get_parts_of_speech(page)
-                for pos in pos_list:
-                    self.entries.append(WiktionaryEntry(self.page_title, pos))
+            with timer(self.metrics, STAGE_SECONDS, stage='get_parts_of_speech'):
+                sections = walk_sections(self.filtered_soup.find_all(True, recursive=False), heading_of)
+            for section in sections:
+                self.entries.append(WiktionaryEntry(self.page_title, section.headline, metrics=self.metrics, lazy=lazy,
+                                                    section=section))
+        if detach:
+            for entry in self.entries:
+                entry.detach()
+        record_entries(self.metrics, self.entries)
 
     def get_entries(self):
         return self.entries
 
     def filter_language(self):
+        """Detach the Russian section from raw_soup into its own section, without copying it."""
         if self.raw_soup is not None:
-            new_page = bs4.BeautifulSoup("<html><body><div class=\"mw-parser-output\"></div></body></html>",
-                                         features="lxml")
             russian_headline = self.raw_soup.find('span', {'class': 'mw-headline', 'id': 'Russian'})
             if russian_headline is not None and russian_headline.parent.name == 'h2':
-                parent = russian_headline.parent
-                next_sibling = parent.next_sibling
-                while next_sibling is not None:
-                    if isinstance(next_sibling, bs4.element.Tag):
-                        if next_sibling.name == 'h2':
-                            break
-                    new_page.body.div.append(copy.copy(next_sibling))
-                    next_sibling = next_sibling.next_sibling
+                return move_siblings(russian_headline.parent.next_sibling, new_section())
             else:
                 logging.warning('No russian entries found on page!')
                 return None
-
-            return new_page
         return None
 
     def _get_title(self):
@@ -330,79 +597,386 @@ class WiktionaryPageParser:
                 _LOG.info('Page redirected from word %s to %s', self.entered_word, self.page_title)
         else:
             _LOG.warning('Could not find title in page')
+        head = self.raw_soup.head
+        config = head.find('script', string=_REVISION_ID) if head is not None else None
+        if config is not None:
+            self.revision_id = parse_revision_id(config.string)
+
+
+class FetchError(Exception):
+    pass
+
+
+class FetchResult:
+    def __init__(self, word, entries=None, error=None):
+        self.word = word
+        self.entries = entries if entries is not None else []
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return f'FetchResult({self.word!r}, entries={len(self.entries)}, error={self.error!r})'
 
 
 def convert_ogg_to_mp3(ogg_file):
-    mp3_file = ogg_file.replace('.ogg', '.mp3')
+    """Convert an audio file to an mp3 next to it. Returns the mp3 path, None if the conversion failed.
+
+    Use transcode.transcode_many to convert many files in parallel.
+    """
+    from . transcode import mp3_path
+    mp3_file = mp3_path(ogg_file)
     try:
+        from pydub import AudioSegment
         AudioSegment.from_file(ogg_file).export(mp3_file, format="mp3")
-    except:
-        print("Error occurred converting file")
+    except Exception as e:
+        _LOG.warning('Error converting %s to mp3: %s', ogg_file, e)
+        return None
     return mp3_file
 
 
+def audio_as_mp3(audio_file):
+    """mp3 of a downloaded audio file, converting it unless an up to date mp3 is next to it.
+
+    An mp3 is returned as is. None when audio_file is None or the conversion failed.
+    """
+    from . transcode import is_up_to_date, mp3_path
+    if audio_file is None:
+        return None
+    mp3_file = mp3_path(audio_file)
+    if mp3_file == audio_file or is_up_to_date(audio_file, mp3_file):
+        return mp3_file
+    return convert_ogg_to_mp3(audio_file)
+
+
+def record_entries(metrics, entries):
+    if metrics is not None:
+        metrics.inc(PAGES)
+        metrics.inc(ENTRIES, len(entries))
+        # lazy entries count their definitions once they are parsed
+        metrics.inc(DEFINITIONS, sum(len(entry._definitions) for entry in entries
+                                     if entry._definitions is not _UNPARSED))
+
+
+def _instrumented(method):
+    """Make the parser's metrics sink the current one while method runs."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with use_metrics(self.metrics):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class WiktionaryParser(Parser):
-    def __init__(self):
-        pass
+    def __init__(self, backend='bs4', metrics=None, store=None, detach=False, search_index=None, mode='page',
+                 base_url=WIKTIONARY_URL, aliases=None):
+        """mode 'api' makes fetch and fetch_many download only the Russian section through the parse API of
+        base_url, falling back to the full page when the API has no page for the word.
+
+        aliases is an AliasMap recording the title every fetched word led to, so later fetches of the word look up
+        the page title directly in the entry store and page cache, or request the page without a search redirect.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown parse backend "{backend}", expected one of {BACKENDS}')
+        if mode not in MODES:
+            raise ValueError(f'Unknown fetch mode "{mode}", expected one of {MODES}')
+        self.backend = backend
+        self.mode = mode
+        self.base_url = base_url
+        self.metrics = metrics
+        self.store = store
+        self.detach = detach
+        self.search_index = search_index
+        self.aliases = aliases
+        self._resolver = None
+        self._resolver_lock = threading.Lock()
+
+    @property
+    def resolver(self):
+        """BaseResolver fetching through this parser, shared by every follow_to_base fetch."""
+        with self._resolver_lock:
+            if self._resolver is None:
+                from . resolver import BaseResolver
+                self._resolver = BaseResolver(self, base_url=self.base_url)
+            return self._resolver
 
     def can_handle_entry(self, entry: any) -> bool:
         if isinstance(entry, str):
             return True
 
+    @_instrumented
     def fetch_from_url(self, url):
         _LOG.debug('fetching from url')
         entered_word = parse_word_from_url(url)
-        raw_soup = make_soup_from_url(url)
-        if raw_soup is not None:
-            wiki_page = WiktionaryPageParser(entered_word, raw_soup)
-            return wiki_page.get_entries()
+        if self.backend == 'bs4':
+            page = make_soup_from_url(url)
+        else:
+            page = fetch_page(url, normalize_url(url))
+        wiki_page = self._page_parser(entered_word, page)
+        if wiki_page is not None:
+            entries = wiki_page.get_entries()
+            self._store_entries(entries, wiki_page.revision_id)
+            self._record_alias(entered_word, wiki_page.page_title, entries)
+            return entries
         return []
 
-    def fetch(self, entered_word, follow_to_base=False):
+    @_instrumented
+    def fetch(self, entered_word, follow_to_base=False, lazy=False):
+        """Entries of the page for entered_word.
+
+        With lazy set, the bs4 backend parses each entry's fields on first access rather than up front, which is
+        cheaper for callers that only read some of them. Detaching, storing or following entries parses them fully.
+        """
         _LOG.info('Fetching page for word "%s"', entered_word)
-        entries = []
-        raw_soup = make_soup(entered_word)
-        if raw_soup is not None:
-            wiki_page = WiktionaryPageParser(entered_word, raw_soup)
+        word = self._canonical_title(entered_word)
+        entries = self._stored_entries(word)
+        if entries:
+            return self.resolver.follow(entries) if follow_to_base else entries
+        wiki_page = self._section_parser(entered_word, self._fetch_section(word), lazy=lazy)
+        if wiki_page is None:
+            page = self._cached_alias_page(entered_word, word)
+            if page is not None:
+                page = build_soup(page) if self.backend == 'bs4' else page
+            elif self.backend == 'bs4':
+                page = make_soup(word, self.base_url)
+            else:
+                page = fetch_page(word_url(word, self.base_url), normalize_word(word))
+            wiki_page = self._page_parser(entered_word, page, lazy=lazy)
+        if wiki_page is not None:
             entries = wiki_page.get_entries()
+            self._store_entries(entries, wiki_page.revision_id)
+            self._record_alias(entered_word, wiki_page.page_title, entries)
             if follow_to_base:
-                # TODO
-                pass
+                entries = self.resolver.follow(entries)
         else:
             _LOG.error('Error fetching page')
         return entries
 
+    def stream(self, entered_word, chunk_size=16384):
+        """Generator of the entries of the page for entered_word, each yielded as soon as its part of speech
+        section has been downloaded and parsed.
+
+        The page is parsed with lxml while it downloads, whatever the backend, and the download stops at the end of
+        the Russian section. Closing the generator early stops it as well, in which case the entries are not stored.
+        A page in the page cache is streamed from it, but a downloaded page is never added to it, as the rest of the
+        page after the Russian section is not read.
+
+        The download holds its request scheduler slot until the Russian section is complete, which is before its last
+        entry is yielded. Fetching other pages while holding an earlier entry waits for a free slot, and never gets one
+        once the scheduler is down to a single slot, so finish or close the generator first. For the same reason
+        stream always downloads the full page, whatever the mode, and has no follow_to_base: fetch the base forms
+        with resolver.follow once the generator is done.
+        """
+        # the parser's metrics are made current around each step only, not while the caller holds an entry
+        entries = self._stream(entered_word, chunk_size)
+        try:
+            while True:
+                with use_metrics(self.metrics):
+                    entry = next(entries, None)
+                if entry is None:
+                    return
+                yield entry
+        finally:
+            with use_metrics(self.metrics):
+                entries.close()
+
+    def _stream(self, entered_word, chunk_size):
+        _LOG.info('Streaming page for word "%s"', entered_word)
+        word = self._canonical_title(entered_word)
+        entries = self._stored_entries(word)
+        if entries:
+            yield from entries
+            return
+        cache = _PAGE_CACHE
+        if cache is not None:
+            content = self._cached_alias_page(entered_word, word)
+            if content is None:
+                content = cache.get(normalize_word(word))
+                metrics = current_metrics()
+                if metrics is not None:
+                    metrics.inc(CACHE_LOOKUPS, result='miss' if content is None else 'hit')
+            if content is not None:
+                yield from self._stream_entries(entered_word, [content], current_metrics())
+                return
+        resp = open_page_stream(word_url(word, self.base_url))
+        if resp is None:
+            _LOG.error('Error fetching page')
+            return
+        yield from self._stream_entries(entered_word, resp.iter_content(chunk_size), current_metrics(), resp)
+
+    def _stream_entries(self, entered_word, chunks, metrics, resp=None):
+        from . streaming import StreamingPageParser
+        page = StreamingPageParser(entered_word, metrics)
+        try:
+            for chunk in chunks:
+                entries = page.feed(chunk)
+                if page.done:
+                    break
+                yield from entries
+            else:
+                entries = page.close()
+        finally:
+            # closing the response frees its scheduler slot before the caller gets the last entries
+            if resp is not None:
+                resp.close()
+                if metrics is not None:
+                    metrics.observe(HTTP_BYTES, page.bytes_read)
+        yield from entries
+        self._store_entries(page.entries, page.revision_id)
+        self._record_alias(entered_word, page.page_title, page.entries)
+
+    def _page_parser(self, entered_word, page, lazy=False):
+        """Page parser over a soup for the bs4 backend or over the raw page content for the others."""
+        if page is None:
+            return None
+        if self.backend == 'bs4':
+            return WiktionaryPageParser(entered_word, page, detach=self.detach, lazy=lazy)
+        return make_page_parser(entered_word, page, self.backend, detach=self.detach)
+
+    def _fetch_section(self, entered_word):
+        """RussianSection of the page through the parse API in api mode, None otherwise or when the API has none."""
+        if self.mode != 'api':
+            return None
+        from . parseapi import fetch_russian_section
+        return fetch_russian_section(entered_word, self.base_url)
+
+    def _section_parser(self, entered_word, section, lazy=False):
+        """Page parser over a RussianSection, None when there is no section."""
+        if section is None:
+            return None
+        if self.backend == 'bs4':
+            soup = normalize_headings(build_soup(section.html))
+            wiki_page = WiktionaryPageParser(entered_word, soup, title=section.title, detach=self.detach, lazy=lazy)
+        else:
+            wiki_page = make_page_parser(entered_word, section.html, self.backend, title=section.title,
+                                         normalize=True)
+        wiki_page.revision_id = section.revision_id
+        return wiki_page
+
+    def fetch_many(self, words, max_workers=8, in_order=True):
+        """Fetch many words, downloading on a thread pool and parsing in the calling thread.
+
+        Yields a FetchResult per word, in input order or as downloads complete when in_order is False. Errors are
+        reported on the result instead of aborting the batch.
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            with use_metrics(self.metrics):
+                futures = {executor.submit(contextvars.copy_context().run, self._download, word): word
+                           for word in words}
+            for future in (futures if in_order else as_completed(futures)):
+                with use_metrics(self.metrics):
+                    result = self._parse_download(futures[future], future)
+                yield result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _download(self, entered_word):
+        """Return (stored entries, None) when the store has the word, else (None, RussianSection or page content)."""
+        word = self._canonical_title(entered_word)
+        entries = self._stored_entries(word)
+        if entries:
+            return entries, None
+        section = self._fetch_section(word)
+        if section is not None:
+            return None, section
+        content = self._cached_alias_page(entered_word, word)
+        if content is not None:
+            return None, content
+        return None, fetch_page(word_url(word, self.base_url), normalize_word(word))
+
+    def _parse_download(self, word, future):
+        try:
+            entries, content = future.result()
+            if entries is not None:
+                return FetchResult(word, entries)
+            if content is None:
+                raise FetchError(f'Error fetching page for word "{word}"')
+            if isinstance(content, (bytes, str)):
+                wiki_page = make_page_parser(word, content, self.backend, detach=self.detach)
+            else:
+                wiki_page = self._section_parser(word, content)
+            entries = wiki_page.get_entries()
+            self._store_entries(entries, wiki_page.revision_id)
+            self._record_alias(word, wiki_page.page_title, entries)
+            return FetchResult(word, entries)
+        except Exception as e:
+            _LOG.warning('Failed to fetch "%s": %s', word, e)
+            return FetchResult(word, error=e)
+
+    def _canonical_title(self, word):
+        """Title of the page word is known to lead to, word itself when it is not a known alias."""
+        if self.aliases is None:
+            return word
+        title = self.aliases.get(word)
+        if title is None:
+            return word
+        _LOG.debug('"%s" is an alias of "%s"', word, title)
+        return title
+
+    def _cached_alias_page(self, entered_word, word):
+        """Page content cached under entered_word when it is an alias of word, None otherwise.
+
+        A page first fetched through an alias is cached under the alias, while later fetches of the alias go to the
+        canonical title.
+        """
+        cache = _PAGE_CACHE
+        if cache is None or word == entered_word:
+            return None
+        content = cache.get(normalize_word(entered_word))
+        metrics = current_metrics()
+        if content is not None and metrics is not None:
+            metrics.inc(CACHE_LOOKUPS, result='hit')
+        return content
+
+    def _record_alias(self, word, title, entries):
+        if self.aliases is not None and entries:
+            self.aliases.add(word, title)
+
+    def _stored_entries(self, word):
+        if self.store is None:
+            return []
+        entries = self.store.get(word)
+        if entries:
+            _LOG.debug('Found "%s" in entry store', word)
+        return entries
+
+    def _store_entries(self, entries, revision_id=None):
+        if self.store is not None and entries:
+            self.store.replace(entries[0].word, entries, revision_id)
+
+    @_instrumented
+    def refresh(self, words=None, base_url=None):
+        """Re-fetch the stored words whose pages changed since they were stored, see refresh.refresh_store."""
+        from . refresh import refresh_store
+        return refresh_store(self, words, base_url=base_url or self.base_url)
+
+    @_instrumented
     def search(self, word, limit=10):
+        """Opensearch results for word, answered by the search index when it has a match."""
+        if self.search_index is not None:
+            results = self.search_index.search(word, limit)
+            if results[1]:
+                return results
+            _LOG.debug('No match for "%s" in search index', word)
         results = []
-        resp = requests.get(
-            f"https://en.wiktionary.org/w/api.php?action=opensearch&format=json&formatversion=2&search={word}&namespace=0&limit={limit}")
+        resp = _http_get(search_url(word, limit, self.base_url))
         if resp.status_code == 200:
             results = json.loads(resp.content.decode())
         else:
             _LOG.info('Error received from server: %u', resp.status_code)
         return results
 
+    @_instrumented
     def download_audio(self, link, destination='.'):
-        audio_file_page = requests.get(f'https://en.wiktionary.org{link}')
-        if audio_file_page.status_code == 200:
-            soup = bs4.BeautifulSoup(audio_file_page.content, features='lxml')
-            full_media = soup.find('div', {'class': 'fullMedia'})
-            if full_media is not None:
-                file_name = full_media.p.a['title']
-                file_link = full_media.p.a['href']
-                _LOG.debug('Downloading file %s', file_name)
-                audio_file = requests.get(f'https:{file_link}')
-                file_dest = os.path.join(destination, file_name)
-                open(file_dest, 'wb').write(audio_file.content)
-                if '.mp3' not in file_dest:
-                    file_dest = convert_ogg_to_mp3(file_dest)
-                return file_dest
-            else:
-                _LOG.warning('Could not find media file on page')
-                return None
-        else:
-            _LOG.warning('Error fetching file %s', link)
-            return None
+        """Download the audio file behind a File: page link into destination, converted to mp3.
+
+        Files already in destination are not downloaded or converted again.
+        """
+        from . audiocache import AudioCache
+        return audio_as_mp3(AudioCache(destination, base_url=self.base_url).fetch(link))
 
 
 def parse_word_from_url(url):
@@ -412,23 +986,171 @@ def parse_word_from_url(url):
     return entered_word
 
 
-def make_soup(word: str):
+def get_session():
+    """Shared keep-alive session used for every request made by the parser."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _SESSION = session
+    return _SESSION
+
+
+def set_scheduler(scheduler):
+    """Install the RequestScheduler pacing and retrying every request, None sends requests directly."""
+    global _SCHEDULER
+    _SCHEDULER = scheduler
+
+
+def get_scheduler():
+    return _SCHEDULER
+
+
+def _http_get(url, **kwargs):
+    scheduler = _SCHEDULER
+    if scheduler is not None:
+        return scheduler.request(functools.partial(_send_get, url, **kwargs), streamed=kwargs.get('stream', False))
+    return _send_get(url, **kwargs)
+
+
+def _send_get(url, **kwargs):
+    metrics = current_metrics()
+    if metrics is None:
+        return get_session().get(url, **kwargs)
+    start = time.perf_counter()
+    resp = get_session().get(url, **kwargs)
+    metrics.observe(HTTP_SECONDS, time.perf_counter() - start)
+    metrics.inc(HTTP_REQUESTS, status=resp.status_code)
+    if not kwargs.get('stream'):
+        metrics.observe(HTTP_BYTES, len(resp.content))
+    return resp
+
+
+def set_page_cache(cache):
+    """Install the PageCache used by make_soup and make_soup_from_url, None disables caching."""
+    global _PAGE_CACHE
+    _PAGE_CACHE = cache
+
+
+def get_page_cache():
+    return _PAGE_CACHE
+
+
+def fetch_page(url, cache_key=None, cacheable=None):
+    """Return the raw page content for url, consulting the page cache first. None on error.
+
+    cacheable, when given, is called with the content of a response to decide whether it goes in the page cache.
+    """
+    cache = _PAGE_CACHE if cache_key is not None else None
+    if cache is not None:
+        content = cache.get(cache_key)
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.inc(CACHE_LOOKUPS, result='miss' if content is None else 'hit')
+        if content is not None:
+            return content
+    resp = _http_get(url)
+    if resp.status_code != 200:
+        _LOG.info('Error received from server: %u', resp.status_code)
+        return None
+    if cache is not None and (cacheable is None or cacheable(resp.content)):
+        cache.put(cache_key, resp.content)
+    return resp.content
+
+
+def open_page_stream(url):
+    """Response for url with its body left to be read as it arrives, None on error. The caller closes it."""
+    resp = _http_get(url, stream=True)
+    if resp.status_code != 200:
+        _LOG.info('Error received from server: %u', resp.status_code)
+        resp.close()
+        return None
+    return resp
+
+
+def word_url(word, base_url=WIKTIONARY_URL):
+    return f'{base_url}/w/index.php?search={word}+&title=Special%3ASearch&go=Go&wprov=acrw1_-1'
+
+
+def search_url(word, limit, base_url=WIKTIONARY_URL):
+    return f"{base_url}/w/api.php?action=opensearch&format=json&formatversion=2&search={word}&namespace=0&limit={limit}"
+
+
+def make_page_parser(entered_word, content, backend='bs4', title=None, detach=False, normalize=False):
+    """Build the page parser of the given backend over raw page content.
+
+    normalize rewrites bare headings first, for content rendered by the parse API rather than the full page.
+    """
+    if backend == 'lxml':
+        from . lxmlparser import LxmlPageParser
+        return LxmlPageParser(entered_word, content, title=title, normalize=normalize)
+    soup = build_soup(content)
+    if normalize:
+        normalize_headings(soup)
+    return WiktionaryPageParser(entered_word, soup, title=title, detach=detach)
+
+
+def build_soup(content):
+    import bs4
+    with timer(current_metrics(), SOUP_SECONDS, backend='bs4'):
+        return bs4.BeautifulSoup(content, features="lxml")
+
+
+def parse_page(entered_word, content, backend='bs4', detach=False):
+    """Parse raw page content into a list of entries."""
+    return make_page_parser(entered_word, content, backend, detach=detach).get_entries()
+
+
+def find_media_file(content):
+    """Return the (file name, file link) of the media file on a File: page, None if there is none."""
+    import bs4
+    soup = bs4.BeautifulSoup(content, features='lxml')
+    full_media = soup.find('div', {'class': 'fullMedia'})
+    if full_media is not None:
+        return full_media.p.a['title'], full_media.p.a['href']
+    return None
+
+
+def make_soup(word: str, base_url=WIKTIONARY_URL):
     """Fetch wiki entry for given word and make some beautiful soup out if it."""
-    resp = requests.get(
-        f'https://en.wiktionary.org/w/index.php?search={word}+&title=Special%3ASearch&go=Go&wprov=acrw1_-1')
-    if resp.status_code == 200:
-        return bs4.BeautifulSoup(resp.content, features="lxml")
+    content = fetch_page(word_url(word, base_url), normalize_word(word))
+    if content is not None:
+        return build_soup(content)
     return None
 
 
 def make_soup_from_url(url):
     """Fetch wiki entry for given word and make some beautiful soup out if it."""
-    resp = requests.get(url)
-    if resp.status_code == 200:
-        return bs4.BeautifulSoup(resp.content, features="lxml")
+    content = fetch_page(url, normalize_url(url))
+    if content is not None:
+        return build_soup(content)
     return None
 
 
+def normalize_headings(soup):
+    """Rewrite bare headings, as rendered by the parse API and Parsoid, to the mw-headline layout of the full page."""
+    for wrapper in soup.find_all('div', {'class': 'mw-heading'}):
+        wrapper.unwrap()
+    for heading in soup.find_all(_HEADINGS):
+        if heading.find('span', {'class': 'mw-headline'}) is None and heading.get('id') is not None:
+            headline = soup.new_tag('span', attrs={'class': 'mw-headline', 'id': heading['id']})
+            for child in list(heading.contents):
+                headline.append(child.extract())
+            heading.append(headline)
+            del heading['id']
+    return soup
+
+
+def parse_revision_id(text):
+    """Revision ID from the page configuration script of a rendered page, None when it has none."""
+    match = _REVISION_ID.search(text)
+    return (int(match.group(1)) or None) if match else None
+
+
 def remove_trailing_numbers(heading_id):
     header_parts = heading_id.split('_')
     if header_parts[-1].isnumeric():
@@ -439,14 +1161,9 @@ def remove_trailing_numbers(heading_id):
     return stripped_heading_id
 
 
-def get_parts_of_speech(soup):
-    pos_list = []
-    headlines = soup.find_all('span', {'class': 'mw-headline'})
-    for headline in headlines:
-        text = headline.get_text()
-        if remove_trailing_numbers(text) in WiktionaryEntry.pos_list:
-            pos_list.append(headline)
-    return pos_list
+def form_key(word):
+    """Lowercased, accent stripped form used as index key, as in WiktionaryInflectionTable.to_lower_set."""
+    return word.lower().replace('́', '')
 
 
 def get_filename_from_link(link):
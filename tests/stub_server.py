@@ -0,0 +1,202 @@
+"""Local stand-in for en.wiktionary.org serving the pages saved in tests/data."""
+import json
+import os
+import re
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from bs4 import BeautifulSoup
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = os.path.join(dir_path, 'data')
+
+FIXTURE_WORDS = sorted(name[:-len(' - Wiktionary.html')] for name in os.listdir(data_dir)
+                       if name.endswith(' - Wiktionary.html'))
+
+AUDIO_CONTENT = b'ID3 not really an mp3'
+
+
+def fixture_revision(word):
+    content = read_fixture(word)
+    match = re.search(rb'"wgRevisionId":(\d+)', content or b'')
+    return int(match.group(1)) if match and int(match.group(1)) else None
+
+
+def read_fixture(word):
+    path = os.path.join(data_dir, f"{word} - Wiktionary.html")
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def fixture_sections(word):
+    """(title, revision, [(level, heading tag)]) of a fixture page, None if there is no such page."""
+    content = read_fixture(word)
+    if content is None:
+        return None
+    soup = BeautifulSoup(content, features='lxml')
+    output = soup.find('div', {'class': 'mw-parser-output'})
+    if output is None:
+        return None
+    headings = [(int(heading.name[1]), heading) for heading in output.find_all(['h2', 'h3', 'h4', 'h5', 'h6'])
+                if heading.find('span', {'class': 'mw-headline'}) is not None]
+    return soup.find('h1', {'class': 'firstHeading'}).get_text(), fixture_revision(word), headings
+
+
+def section_html(headings, index, modern_headings=False):
+    """Rendered HTML of section index (1 based): its heading and siblings up to the next heading as high."""
+    level, heading = headings[index - 1]
+    parts = [heading]
+    for sibling in heading.find_next_siblings():
+        if sibling.name in ['h2', 'h3', 'h4', 'h5', 'h6'][:level - 1]:
+            break
+        parts.append(sibling)
+    section = BeautifulSoup('<div class="mw-parser-output">' + ''.join(str(part) for part in parts) + '</div>',
+                            features='lxml')
+    if modern_headings:
+        for tag in section.find_all(['h2', 'h3', 'h4', 'h5', 'h6']):
+            headline = tag.find('span', {'class': 'mw-headline'})
+            if headline is None:
+                continue
+            tag['id'] = headline['id']
+            headline.unwrap()
+            wrapper = tag.wrap(section.new_tag('div', attrs={'class': f'mw-heading mw-heading{tag.name[1]}'}))
+            edit_section = tag.find('span', {'class': 'mw-editsection'})
+            if edit_section is not None:
+                wrapper.append(edit_section.extract())
+    return str(section.find('div', {'class': 'mw-parser-output'}))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+        override = server.intercept(self) if server.intercept is not None else None
+        if override is not None:
+            self._send(*override)
+            return
+        url = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        path = urllib.parse.unquote(url.path)
+        if path == '/w/index.php':
+            self._send_page(query['search'][0].strip())
+        elif path == '/w/api.php':
+            self._send_api(query)
+        elif path.startswith('/wiki/File:'):
+            name = path[len('/wiki/File:'):]
+            body = f'<html><body><div class="fullMedia"><p><a href="/media/{urllib.parse.quote(name)}" ' \
+                   f'title="{name}">{name}</a></p></div></body></html>'
+            self._send(200, body.encode())
+        elif path.startswith('/wiki/'):
+            self._send_page(path[len('/wiki/'):])
+        elif path.startswith('/media/'):
+            self._send(200, AUDIO_CONTENT, 'audio/mpeg')
+        else:
+            self._send(404, b'')
+
+    def _send_page(self, word):
+        content = read_fixture(self.server.aliases.get(word, word))
+        if content is None:
+            content = read_fixture(f'Search results for _{word}_')
+        if content is None:
+            self._send(404, b'')
+        else:
+            self._send(200, content)
+
+    def _send_api(self, query):
+        if query.get('action') == ['opensearch']:
+            word = query['search'][0]
+            limit = int(query.get('limit', ['10'])[0])
+            titles = [title for title in FIXTURE_WORDS if title.startswith(word)][:limit]
+            body = [word, titles, [''] * len(titles),
+                    [f'https://en.wiktionary.org/wiki/{title}' for title in titles]]
+            self._send(200, json.dumps(body).encode(), 'application/json')
+        elif query.get('action') == ['query'] and query.get('prop') == ['revisions']:
+            pages = []
+            for title in query['titles'][0].split('|'):
+                revision = self.server.revisions.get(title, fixture_revision(title))
+                if revision is None:
+                    pages.append({'title': title, 'missing': True})
+                else:
+                    pages.append({'title': title, 'revisions': [{'revid': revision}]})
+            body = {'batchcomplete': True, 'query': {'pages': pages}}
+            self._send(200, json.dumps(body).encode(), 'application/json')
+        elif query.get('action') == ['parse']:
+            self._send_parse(query)
+        else:
+            self._send(400, b'')
+
+    def _send_parse(self, query):
+        requested = query['page'][0]
+        title = self.server.aliases.get(requested, requested) if query.get('redirects') == ['1'] else requested
+        page = fixture_sections(title)
+        if page is None:
+            body = {'error': {'code': 'missingtitle', 'info': "The page you specified doesn't exist."}}
+        else:
+            page_title, revision, headings = page
+            body = {'parse': {'title': page_title, 'pageid': 1, 'revid': revision}}
+            if title != requested:
+                body['parse']['redirects'] = [{'from': requested, 'to': title}]
+            props = query.get('prop', [''])[0].split('|')
+            if 'sections' in props:
+                body['parse']['sections'] = [
+                    {'toclevel': level - 1, 'level': str(level), 'line': heading.find('span', {'class': 'mw-headline'})
+                     .get_text(), 'number': str(i), 'index': str(i),
+                     'anchor': heading.find('span', {'class': 'mw-headline'})['id']}
+                    for i, (level, heading) in enumerate(headings, 1)]
+            if 'text' in props:
+                body['parse']['text'] = section_html(headings, int(query['section'][0]), self.server.modern_headings)
+        self._send(200, json.dumps(body).encode(), 'application/json')
+
+    def _send(self, status, body, content_type='text/html; charset=UTF-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubWiktionary:
+    """Context manager running the stub server on a free local port.
+
+    ``intercept`` may be set to a callable taking the request handler and returning ``(status, body)`` or
+    ``(status, body, content_type, headers)`` to override the response, or None to serve normally. ``revisions``
+    overrides the revision IDs the API reports for titles, None marking a title as missing. ``aliases`` maps titles
+    to the pages they redirect to, for page requests and for the parse API, which renders headings in the current
+    MediaWiki markup when ``modern_headings`` is set.
+    """
+
+    def __init__(self, intercept=None, revisions=None, aliases=None, modern_headings=False):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self._server.daemon_threads = True
+        self._server.lock = threading.Lock()
+        self._server.requests = []
+        self._server.intercept = intercept
+        self._server.revisions = revisions if revisions is not None else {}
+        self._server.aliases = aliases if aliases is not None else {}
+        self._server.modern_headings = modern_headings
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
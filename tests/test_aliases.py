@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import patch
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.aliases import AliasMap
+from russianwiktionaryparser.cache import DiskPageCache
+from russianwiktionaryparser.store import EntryStore
+from .stub_server import StubWiktionary, read_fixture
+
+REDIRECTS = {'Кот': 'кот', 'котъ': 'кот', 'Люди': 'люди'}
+
+
+def fetch_with_redirects(wiki, word):
+    """Fetch word with the search page redirecting as in REDIRECTS, returning the entries and the words searched."""
+    searched = []
+
+    def make_soup(word, base_url):
+        searched.append(word)
+        return wiktionaryparser.build_soup(read_fixture(REDIRECTS.get(word, word)))
+
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup') as mock_fetch:
+        mock_fetch.side_effect = make_soup
+        entries = wiki.fetch(word)
+    return entries, searched
+
+
+def test_alias_map(tmp_path):
+    path = str(tmp_path / 'aliases.db')
+    with AliasMap(path, max_aliases=2) as aliases:
+        aliases.add('Кот', 'кот')
+        aliases.add('кот', 'кот')
+        aliases.add(' котъ ', 'кот')
+        assert len(aliases) == 2
+        assert aliases.get('Кот') == 'кот'
+        aliases.add('Люди', 'люди')
+        assert 'котъ' not in aliases
+        assert aliases.get('котъ') is None
+        assert aliases.stats()['hit_ratio'] == 0.5
+    with AliasMap(path, max_aliases=2) as aliases:
+        assert len(aliases) == 2
+        assert aliases.get('Кот') == 'кот'
+        assert aliases.get('Люди') == 'люди'
+        aliases.remove('Люди')
+    with AliasMap(path) as aliases:
+        assert 'Люди' not in aliases and 'Кот' in aliases
+
+
+def test_lookups_write_recency_in_batches(tmp_path):
+    path = str(tmp_path / 'aliases.db')
+    with AliasMap(path, max_aliases=2, flush_every=2) as aliases:
+        aliases.add('Кот', 'кот')
+        aliases.add('Люди', 'люди')
+        changes = aliases._conn.total_changes
+        assert aliases.get('Кот') == 'кот'
+        assert aliases.get('Кот') == 'кот'
+        assert aliases._conn.total_changes == changes, "Lookups should not write until a batch is full"
+        assert aliases.get('Люди') == 'люди'
+        assert aliases._conn.total_changes > changes
+        aliases.get('Кот')
+    with AliasMap(path, max_aliases=2) as aliases:
+        aliases.add('котъ', 'кот')
+        assert 'Кот' in aliases and 'Люди' not in aliases, "Recency should be written back on close"
+
+
+def test_alias_skips_search_with_store():
+    wiki = wiktionaryparser.WiktionaryParser(store=EntryStore(), aliases=AliasMap())
+    entries, searched = fetch_with_redirects(wiki, 'Кот')
+    assert searched == ['Кот']
+    assert entries[0].word == 'кот'
+    assert wiki.aliases.get('Кот') == 'кот'
+    entries, searched = fetch_with_redirects(wiki, 'Кот')
+    assert searched == []
+    assert entries[0].word == 'кот'
+
+
+def test_alias_fetches_title_directly():
+    wiki = wiktionaryparser.WiktionaryParser(aliases=AliasMap())
+    fetch_with_redirects(wiki, 'Люди')
+    entries, searched = fetch_with_redirects(wiki, 'Люди')
+    assert searched == ['люди']
+    assert entries[0].word == 'люди'
+
+
+@pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+def test_alias_uses_page_cached_under_alias(tmp_path, backend):
+    wiktionaryparser.set_page_cache(DiskPageCache(str(tmp_path)))
+    try:
+        with StubWiktionary(aliases=REDIRECTS) as stub:
+            wiki = wiktionaryparser.WiktionaryParser(backend=backend, base_url=stub.base_url, aliases=AliasMap())
+            assert wiki.fetch('Люди')[0].word == 'люди'
+            assert wiki.fetch('Люди')[0].word == 'люди'
+            assert [result.entries[0].word for result in wiki.fetch_many(['Люди'])] == ['люди']
+            assert list(wiki.stream('Люди'))[0].word == 'люди'
+            assert len(stub.requests) == 1, "The page cached under the alias should be used"
+    finally:
+        wiktionaryparser.set_page_cache(None)
+
+
+def test_unknown_words_are_not_aliased():
+    wiki = wiktionaryparser.WiktionaryParser(aliases=AliasMap())
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup') as mock_fetch:
+        mock_fetch.return_value = wiktionaryparser.build_soup(read_fixture('Search results for _йцук_'))
+        assert wiki.fetch('йцук') == []
+    assert len(wiki.aliases) == 0
+
+
+def test_aliases_in_api_mode_and_fetch_many():
+    aliases = AliasMap()
+    with StubWiktionary(aliases=REDIRECTS) as stub:
+        wiki = wiktionaryparser.WiktionaryParser(mode='api', base_url=stub.base_url, aliases=aliases)
+        results = list(wiki.fetch_many(['Кот', 'Люди', 'пить']))
+        assert [result.entries[0].word for result in results] == ['кот', 'люди', 'пить']
+        assert len(aliases) == 2
+        del stub.requests[:]
+        wiki.fetch('Кот')
+        assert len(stub.requests) == 2
+        assert all('page=%D0%BA%D0%BE%D1%82' in path for path in stub.requests)
@@ -0,0 +1,95 @@
+import io
+import json
+import os
+import pytest
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.__main__ import main
+from russianwiktionaryparser.archive import ArchiveError, PageArchive, reparse_archive, word_from_key
+from russianwiktionaryparser.cache import normalize_url, normalize_word
+from .stub_server import StubWiktionary, data_dir, read_fixture
+
+WORDS = ['кот', 'пить', 'по', 'йцук']
+
+
+def fill_archive(path, words=WORDS):
+    with PageArchive(path) as archive:
+        for word in words:
+            archive.put(normalize_word(word), read_fixture(word))
+
+
+def test_put_get_and_reopen(tmp_path):
+    path = str(tmp_path / 'pages.rwpa')
+    fill_archive(path)
+    with PageArchive(path) as archive:
+        assert len(archive) == 4
+        assert archive.keys() == [normalize_word(word) for word in WORDS]
+        assert archive.get(normalize_word('пить')) == read_fixture('пить')
+        assert archive.get(normalize_word('человек')) is None
+        archive.put(normalize_word('кот'), b'<html>new</html>')
+        assert archive.get(normalize_word('кот')) == b'<html>new</html>'
+        assert len(archive) == 4
+    with PageArchive(path) as archive:
+        assert archive.get(normalize_word('кот')) == b'<html>new</html>'
+        assert dict(archive.items())[normalize_word('по')] == read_fixture('по')
+    assert os.path.getsize(path) < sum(len(read_fixture(word)) for word in WORDS) / 3
+
+
+def test_recovers_index(tmp_path):
+    path = str(tmp_path / 'pages.rwpa')
+    fill_archive(path)
+    size = os.path.getsize(path + '.idx')
+    os.truncate(path + '.idx', size - 3)
+    with open(path, 'ab') as f:
+        f.write(b'partial record')
+    with PageArchive(path) as archive:
+        assert archive.keys()[-1] == normalize_word('йцук')
+        assert archive.get(normalize_word('йцук')) == read_fixture('йцук')
+    assert os.path.getsize(path + '.idx') == size
+
+
+def test_not_an_archive(tmp_path):
+    path = tmp_path / 'pages.html'
+    path.write_bytes(read_fixture('кот'))
+    with pytest.raises(ArchiveError):
+        PageArchive(str(path))
+
+
+def test_archives_fetched_pages(tmp_path):
+    archive = PageArchive(str(tmp_path / 'pages.rwpa'))
+    wiktionaryparser.set_page_cache(archive)
+    try:
+        with StubWiktionary() as stub:
+            url = f'{stub.base_url}/wiki/кот'
+            wiktionaryparser.WiktionaryParser().fetch_from_url(url)
+    finally:
+        wiktionaryparser.set_page_cache(None)
+        archive.close()
+    assert PageArchive(str(tmp_path / 'pages.rwpa')).keys() == [normalize_url(url)]
+    assert word_from_key(normalize_url(url)) == 'кот'
+
+
+@pytest.mark.parametrize('backend', wiktionaryparser.BACKENDS)
+def test_reparse(tmp_path, backend):
+    path = str(tmp_path / 'pages.rwpa')
+    fill_archive(path)
+    with PageArchive(path) as archive:
+        # a parse API response, as archived before they were kept out
+        archive.put(normalize_url('https://en.wiktionary.org/w/api.php?action=parse&page=кот'), b'{"parse": {}}')
+    output = io.StringIO()
+    reports = []
+    stats = reparse_archive(path, output, backend, max_workers=2, progress=reports.append, progress_every=2)
+    expected = [entry.serialize() for word in WORDS
+                for entry in wiktionaryparser.parse_page(word, read_fixture(word), backend)]
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == expected
+    assert (stats.pages, stats.russian_pages, stats.entries, stats.errors) == (4, 3, len(expected), 0)
+    assert len(reports) == 3
+
+
+def test_cli(tmp_path, capsys):
+    path = str(tmp_path / 'pages.rwpa')
+    files = [os.path.join(data_dir, f'{word} - Wiktionary.html') for word in ['кот', 'пить']]
+    assert main(['add', path, *files]) == 0
+    assert main(['reparse', path, '-o', str(tmp_path / 'entries.jsonl'), '-j', '1']) == 0
+    with open(tmp_path / 'entries.jsonl', encoding='utf-8') as f:
+        assert [json.loads(line)['word'] for line in f] == ['кот', 'пить']
+    assert '2 pages (2 Russian), 2 entries, 0 errors' in capsys.readouterr().err
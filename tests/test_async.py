@@ -0,0 +1,93 @@
+import asyncio
+import os
+from unittest.mock import patch
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from russianwiktionaryparser.asyncparser import AsyncWiktionaryParser  # noqa: E402
+from .stub_server import StubWiktionary, AUDIO_CONTENT  # noqa: E402
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_fetch():
+    async def fetch():
+        async with AsyncWiktionaryParser(base_url=stub.base_url) as wiki:
+            return await wiki.fetch('кот')
+
+    with StubWiktionary() as stub:
+        entries = run(fetch())
+    assert len(entries) == 1, "Unexpected number of entries found"
+    assert entries[0].part_of_speech == "Noun", "Incorrect part of speech found"
+    assert entries[0].definitions[0].text == "tomcat"
+
+
+def test_fetch_concurrently():
+    words = ['кот', 'сказать', 'худой', 'человек', 'по', 'йцук']
+
+    async def fetch_all():
+        async with AsyncWiktionaryParser(base_url=stub.base_url, max_concurrency=2) as wiki:
+            return await asyncio.gather(*(wiki.fetch(word) for word in words))
+
+    with StubWiktionary() as stub:
+        results = run(fetch_all())
+    assert [len(entries) for entries in results[:3]] == [1, 1, 2]
+    assert results[3][0].definitions[0].text == "person, human being, man"
+    assert results[5] == [], "Search results page should not produce entries"
+
+
+def test_fetch_from_url():
+    async def fetch():
+        async with AsyncWiktionaryParser(base_url=stub.base_url) as wiki:
+            return await wiki.fetch_from_url(f'{stub.base_url}/wiki/%D0%BF%D0%B8%D1%82%D1%8C#Russian')
+
+    with StubWiktionary() as stub:
+        entries = run(fetch())
+    assert entries[0].word == 'пить'
+    assert entries[0].definitions[0].text == "to drink"
+
+
+def test_search():
+    async def search():
+        async with AsyncWiktionaryParser(base_url=stub.base_url) as wiki:
+            return await wiki.search('пи')
+
+    with StubWiktionary() as stub:
+        results = run(search())
+    assert results[0] == 'пи'
+    assert results[1] == ['пила', 'пить']
+
+
+def test_download_audio(tmp_path):
+    async def download():
+        async with AsyncWiktionaryParser(base_url=stub.base_url) as wiki:
+            return await wiki.download_audio('/wiki/File:Ru-%D0%BA%D0%BE%D1%82.mp3', str(tmp_path))
+
+    with StubWiktionary() as stub:
+        file_dest = run(download())
+    assert file_dest == str(tmp_path / 'Ru-кот.mp3')
+    with open(file_dest, 'rb') as f:
+        assert f.read() == AUDIO_CONTENT
+
+
+def test_download_audio_shares_sync_naming(tmp_path):
+    directory = tmp_path / 'clips.mp3'
+
+    async def download(link):
+        async with AsyncWiktionaryParser(base_url=stub.base_url) as wiki:
+            return await wiki.download_audio(link, str(directory))
+
+    mp3_file = str(directory / 'Ru-кот.mp3')
+    with StubWiktionary() as stub:
+        with patch('pydub.AudioSegment.from_file') as mock_from_file:
+            assert run(download('/wiki/File:Ru-%D0%BA%D0%BE%D1%82.ogg')) == mp3_file
+        mock_from_file.return_value.export.assert_called_once_with(mp3_file, format='mp3')
+        requests = len(stub.requests)
+        with open(mp3_file, 'wb'):
+            pass
+        assert run(download('/wiki/File:Ru-%D0%BA%D0%BE%D1%82.ogg')) == mp3_file
+        assert len(stub.requests) == requests, "Downloaded and converted files should be skipped"
+    assert sorted(os.listdir(directory)) == ['Ru-кот.mp3', 'Ru-кот.ogg']
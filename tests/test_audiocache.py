@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.audiocache import AudioCache
+from .stub_server import StubWiktionary, AUDIO_CONTENT
+
+LINK = '/wiki/File:Ru-%D0%BA%D0%BE%D1%82.mp3'
+
+
+def media_requests(stub):
+    return [path for path in stub.requests if path.startswith('/media/')]
+
+
+def test_download_and_reuse(tmp_path):
+    with StubWiktionary() as stub:
+        cache = AudioCache(str(tmp_path), base_url=stub.base_url, chunk_size=4)
+        assert cache.get(LINK) is None
+        path = cache.fetch(LINK)
+        assert path == str(tmp_path / 'Ru-кот.mp3')
+        with open(path, 'rb') as f:
+            assert f.read() == AUDIO_CONTENT
+        assert cache.fetch(LINK) == path
+        assert AudioCache(str(tmp_path), base_url=stub.base_url).get(LINK) == path
+        assert len(stub.requests) == 2
+    assert os.listdir(tmp_path) == ['Ru-кот.mp3']
+
+
+def test_concurrent_downloads_coalesce(tmp_path):
+    def slow_media(handler):
+        if handler.path.startswith('/media/'):
+            time.sleep(0.3)
+
+    results = []
+    with StubWiktionary(intercept=slow_media) as stub:
+        threads = [threading.Thread(target=lambda: results.append(
+            AudioCache(str(tmp_path), base_url=stub.base_url).fetch(LINK))) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(media_requests(stub)) == 1
+    assert results == [str(tmp_path / 'Ru-кот.mp3')] * 6
+
+
+def test_failed_download(tmp_path):
+    def missing_media(handler):
+        if handler.path.startswith('/media/'):
+            return 404, b''
+
+    with StubWiktionary(intercept=missing_media) as stub:
+        cache = AudioCache(str(tmp_path), base_url=stub.base_url)
+        assert cache.fetch(LINK) is None
+        assert cache.fetch(LINK) is None
+        assert len(media_requests(stub)) == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_audio_uses_cached_file(tmp_path):
+    (tmp_path / 'Ru-кот.mp3').write_bytes(AUDIO_CONTENT)
+    with patch('russianwiktionaryparser.wiktionaryparser._http_get') as mock_get:
+        path = wiktionaryparser.WiktionaryParser().download_audio(LINK, str(tmp_path))
+    assert path == str(tmp_path / 'Ru-кот.mp3')
+    mock_get.assert_not_called()
@@ -0,0 +1,55 @@
+import os
+import urllib
+from unittest.mock import patch, MagicMock
+from russianwiktionaryparser import wiktionaryparser
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def serve_fixture(url, **kwargs):
+    word = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)['search'][0].strip()
+    resp = MagicMock()
+    full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
+    if word == 'timeout':
+        raise TimeoutError('read timed out')
+    if os.path.exists(full_file_path):
+        resp.status_code = 200
+        with open(full_file_path, 'rb') as f:
+            resp.content = f.read()
+    else:
+        resp.status_code = 404
+        resp.content = b''
+    return resp
+
+
+def run_fetch_many(words, **kwargs):
+    wiki = wiktionaryparser.WiktionaryParser()
+    with patch('russianwiktionaryparser.wiktionaryparser._http_get') as mock_get:
+        mock_get.side_effect = serve_fixture
+        results = list(wiki.fetch_many(words, **kwargs))
+    return results
+
+
+def test_fetch_many_in_order():
+    words = ['кот', 'сказать', 'худой', 'человек', 'по']
+    results = run_fetch_many(words, max_workers=3)
+    assert [result.word for result in results] == words
+    assert all(result.ok for result in results)
+    assert results[0].entries[0].definitions[0].text == "tomcat"
+    assert len(results[2].entries) == 2, "Unexpected number of entries found"
+
+
+def test_fetch_many_as_completed():
+    words = ['кот', 'сказать', 'худой', 'человек']
+    results = run_fetch_many(words, in_order=False)
+    assert sorted(result.word for result in results) == sorted(words)
+
+
+def test_fetch_many_reports_errors():
+    results = run_fetch_many(['кот', 'missing', 'timeout', 'сказать'])
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert isinstance(results[1].error, wiktionaryparser.FetchError)
+    assert isinstance(results[2].error, TimeoutError)
+    assert results[1].entries == []
+    assert results[3].entries[0].part_of_speech == "Verb"
@@ -0,0 +1,49 @@
+import pytest
+from benchmarks import entry_memory, import_time, parse_benchmark, serialization, streaming
+
+
+def test_parse_benchmark_runs():
+    results = parse_benchmark.run_benchmark(['кот', 'здорово'], repeat=1)
+    assert results['кот']['entries'] == 1
+    assert results['здорово']['entries'] == 5
+    assert 'get_parts_of_speech' in results['здорово']['stages_ms']
+    for result in results.values():
+        assert {'soup', 'title', 'filter_language', 'definitions', 'total'} <= set(result['stages_ms'])
+        assert result['peak_memory_bytes'] > 0
+
+
+def test_detached_entries_release_parse_trees():
+    pages = {word: parse_benchmark.read_page(word) for word in ['кот', 'здорово', 'человек']}
+    attached, count = entry_memory.retained_memory(pages, detach=False)
+    detached, detached_count = entry_memory.retained_memory(pages, detach=True)
+    assert count == detached_count == 7
+    assert detached * 10 < attached
+
+
+def test_serialization_benchmark_runs():
+    entries = serialization.load_entries()
+    results = serialization.measure(entries, repeat=1)
+    assert set(results) == {'json', 'binary'}
+    assert all(rate > 0 for result in results.values() for rate in result)
+
+
+def test_import_does_not_load_heavy_dependencies():
+    median, loaded = import_time.measure(repeat=1)
+    assert median > 0
+    assert loaded == []
+
+
+def test_streaming_benchmark_runs():
+    results = streaming.run_benchmark(['кот'], repeat=1)
+    assert results['кот']['stream'][1] < results['кот']['fetch'][1]
+
+
+def test_lazy_package_names():
+    import russianwiktionaryparser
+    from russianwiktionaryparser.aliases import AliasMap
+    from russianwiktionaryparser.store import EntryStore
+    assert russianwiktionaryparser.EntryStore is EntryStore
+    assert russianwiktionaryparser.AliasMap is AliasMap
+    assert 'PageArchive' in dir(russianwiktionaryparser)
+    with pytest.raises(AttributeError):
+        russianwiktionaryparser.NoSuchName
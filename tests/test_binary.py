@@ -0,0 +1,64 @@
+import io
+import struct
+import pytest
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.binary import EntryReader, EntryWriter, FORMAT_VERSION, MAGIC, SerializationError, \
+    decode_entry, encode_entry, read_entries, write_entries
+from .stub_server import FIXTURE_WORDS, read_fixture
+
+
+def all_fields(entry):
+    definitions = [(d.text, d.base_word, d.base_link, [(e.text, e.translation) for e in d.examples])
+                   for d in entry.definitions]
+    inflections = None if entry.inflections is None else (entry.inflections.to_json(), entry.inflections.serialize())
+    return (entry.word, entry.part_of_speech, entry.audio_file, definitions, inflections, entry.audio_links,
+            entry.base_links, entry.base_links_set, entry.tracing)
+
+
+@pytest.fixture(scope='module')
+def entries():
+    entries = []
+    for word in FIXTURE_WORDS:
+        entries.extend(wiktionaryparser.parse_page(word, read_fixture(word), detach=True))
+    return entries
+
+
+def test_round_trip_every_field(entries):
+    entries[0].audio_file = 'Ru-кот.mp3'
+    entries[1].tracing = ['Followed to base кот']
+    stream = io.BytesIO()
+    assert EntryWriter(stream).write_all(entries) == len(entries)
+    stream.seek(0)
+    decoded = list(EntryReader(stream))
+    assert [all_fields(entry) for entry in decoded] == [all_fields(entry) for entry in entries]
+    assert any(entry.audio_links for entry in decoded)
+    assert any(entry.base_links for entry in decoded)
+    assert any(example.translation for entry in decoded for d in entry.definitions for example in d.examples)
+
+
+def test_single_record(entries):
+    entry = next(entry for entry in entries if entry.word == 'человек')
+    assert all_fields(decode_entry(encode_entry(entry))) == all_fields(entry)
+
+
+def test_files(tmp_path, entries):
+    path = str(tmp_path / 'entries.bin')
+    assert write_entries(path, entries) == len(entries)
+    assert [entry.word for entry in read_entries(path)] == [entry.word for entry in entries]
+
+
+def test_rejects_bad_streams(entries):
+    with pytest.raises(SerializationError, match='Not an entry stream'):
+        EntryReader(io.BytesIO(b'{"word": "cat"}'))
+    with pytest.raises(SerializationError, match='version'):
+        EntryReader(io.BytesIO(struct.pack('<4sH', MAGIC, FORMAT_VERSION + 1)))
+    stream = io.BytesIO()
+    EntryWriter(stream).write(entries[0])
+    with pytest.raises(SerializationError, match='Truncated'):
+        list(EntryReader(io.BytesIO(stream.getvalue()[:-1])))
+
+
+def test_rejects_nul():
+    entry = wiktionaryparser.WiktionaryEntry('кот\0')
+    with pytest.raises(SerializationError):
+        encode_entry(entry)
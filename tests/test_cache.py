@@ -0,0 +1,107 @@
+import os
+from unittest.mock import patch, MagicMock
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.cache import DiskPageCache, normalize_url, normalize_word
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def read_page(word):
+    with open(os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html"), 'rb') as f:
+        return f.read()
+
+
+def fake_response(content, status_code=200):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.content = content
+    return resp
+
+
+def test_round_trip_compressed(tmp_path):
+    cache = DiskPageCache(str(tmp_path))
+    page = read_page('кот')
+    cache.put(normalize_word('кот'), page)
+
+    assert cache.get(normalize_word('кот')) == page
+    assert cache.size < len(page) / 3, "Page should be stored compressed"
+    assert DiskPageCache(str(tmp_path)).get(normalize_word(' кот ')) == page, "Cache should persist on disk"
+
+
+def test_ttl(tmp_path):
+    cache = DiskPageCache(str(tmp_path), ttl=60)
+    cache.put('word:кот', b'page')
+    assert cache.get('word:кот') == b'page'
+    with patch('russianwiktionaryparser.cache.time.time') as mock_time:
+        mock_time.return_value = 1e12
+        assert cache.get('word:кот') is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction(tmp_path):
+    cache = DiskPageCache(str(tmp_path), max_bytes=3000)
+    pages = {i: os.urandom(1000) for i in range(3)}  # random data does not compress
+    cache.put('a', pages[0])
+    cache.put('b', pages[1])
+    assert cache.get('a') == pages[0]
+    cache.put('c', pages[2])
+
+    assert cache.get('b') is None, "Least recently used entry should have been evicted"
+    assert cache.get('a') == pages[0]
+    assert cache.get('c') == pages[2]
+    assert cache.size <= 3000
+
+
+def test_corrupt_entries_are_misses(tmp_path):
+    cache = DiskPageCache(str(tmp_path))
+    cache.put('a', b'page a')
+    cache.put('b', b'page b')
+    (tmp_path / cache._file_name('a')).write_bytes(b'\0' * 4)
+    path = tmp_path / cache._file_name('b')
+    path.write_bytes(path.read_bytes()[:-3])
+    (tmp_path / 'left.1.tmp').write_bytes(b'partial')
+
+    cache = DiskPageCache(str(tmp_path))
+    assert not (tmp_path / 'left.1.tmp').exists()
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert len(cache) == 0
+    assert cache.stats()['misses'] == 2
+
+
+def test_url_keys_ignore_fragment():
+    assert normalize_url('https://en.wiktionary.org/wiki/%D0%BA%D0%BE%D1%82#Russian') == \
+        normalize_url('https://en.wiktionary.org/wiki/кот')
+
+
+def test_warm_lookup_skips_network(tmp_path):
+    cache = DiskPageCache(str(tmp_path))
+    page = read_page('кот')
+    wiktionaryparser.set_page_cache(cache)
+    try:
+        with patch('russianwiktionaryparser.wiktionaryparser._http_get') as mock_get:
+            mock_get.return_value = fake_response(page)
+            cold = wiktionaryparser.WiktionaryParser().fetch('кот')
+            warm = wiktionaryparser.WiktionaryParser().fetch('кот')
+        assert mock_get.call_count == 1
+    finally:
+        wiktionaryparser.set_page_cache(None)
+
+    assert cold == warm
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['bytes_saved'] == len(page)
+
+
+def test_errors_not_cached(tmp_path):
+    wiktionaryparser.set_page_cache(DiskPageCache(str(tmp_path)))
+    try:
+        with patch('russianwiktionaryparser.wiktionaryparser._http_get') as mock_get:
+            mock_get.return_value = fake_response(b'', status_code=503)
+            assert wiktionaryparser.make_soup('кот') is None
+            assert wiktionaryparser.make_soup('кот') is None
+        assert mock_get.call_count == 2
+    finally:
+        wiktionaryparser.set_page_cache(None)
@@ -0,0 +1,56 @@
+import copy
+import os
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.store import EntryStore
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def build_soup_from_file(word, base_url=None):
+    full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
+    return BeautifulSoup(open(full_file_path, 'r', encoding='utf-8'), features="lxml")
+
+
+def test_detached_parser():
+    wiki = wiktionaryparser.WiktionaryParser(detach=True)
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup') as mock_fetch:
+        mock_fetch.side_effect = build_soup_from_file
+        entries = wiki.fetch('здорово')
+    assert len(entries) == 5
+    assert all(entry.is_detached for entry in entries)
+    assert entries[4].definitions[0].base_word == 'здоро́вый'
+    assert entries[4].base_links_set
+
+
+def test_detach_keeps_data():
+    attached = wiktionaryparser.WiktionaryPageParser('кот', build_soup_from_file('кот')).get_entries()[0]
+    detached = wiktionaryparser.WiktionaryPageParser('кот', build_soup_from_file('кот'), detach=True).get_entries()[0]
+    assert not attached.is_detached
+    assert detached.is_detached
+    assert detached.serialize() == attached.serialize()
+    assert detached.audio_links == attached.audio_links
+    assert attached.detach() is attached and attached.is_detached
+
+
+def test_compact_entries():
+    entry = wiktionaryparser.WiktionaryPageParser('кот', build_soup_from_file('кот'), detach=True).get_entries()[0]
+    for obj in [entry, entry.definitions[0], entry.definitions[0].examples[0], entry.inflections]:
+        assert not hasattr(obj, '__dict__'), f"{type(obj).__name__} should use __slots__"
+    assert copy.copy(entry) == entry
+
+
+def test_interned_keys():
+    cat = wiktionaryparser.WiktionaryPageParser('кот', build_soup_from_file('кот')).get_entries()[0]
+    man = wiktionaryparser.WiktionaryPageParser('человек', build_soup_from_file('человек')).get_entries()[0]
+    assert cat.part_of_speech is man.part_of_speech
+    man_keys = {key: key for key in man.inflections.to_json()}
+    assert all(man_keys[key] is key for key in cat.inflections.to_json() if key in man_keys)
+
+    store = EntryStore()
+    store.add([cat])
+    stored = store.get('кот')[0]
+    assert stored.part_of_speech is cat.part_of_speech
+    assert stored.is_detached
@@ -0,0 +1,75 @@
+import gzip
+import io
+import json
+import os
+import tarfile
+from unittest.mock import patch
+from russianwiktionaryparser import dumps
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+PARSOID_PAGE = """<html><body>
+<section data-mw-section-id="0"><p>intro</p></section>
+<section data-mw-section-id="1"><h2 id="Russian">Russian</h2>
+<section data-mw-section-id="2"><h3 id="Noun">Noun</h3>
+<p><b class="Cyrl headword" lang="ru">дом</b></p>
+<ol><li>house</li><li>home</li></ol>
+</section></section>
+<section data-mw-section-id="3"><h2 id="Ukrainian">Ukrainian</h2>
+<section data-mw-section-id="4"><h3 id="Noun_2">Noun</h3><ol><li>not russian</li></ol></section></section>
+</body></html>"""
+
+ENGLISH_PAGE = '<html><body><h2><span class="mw-headline" id="English">English</span></h2></body></html>'
+
+
+def dump_lines():
+    with open(os.path.join(dir_path, data_dir, 'кот - Wiktionary.html'), encoding='utf-8') as f:
+        cat_page = f.read()
+    pages = [('кот', cat_page), ('cat', ENGLISH_PAGE), ('дом', PARSOID_PAGE)]
+    return ''.join(json.dumps({'name': name, 'article_body': {'html': html}}) + '\n' for name, html in pages)
+
+
+def write_dump(tmp_path, name):
+    path = str(tmp_path / name)
+    data = dump_lines().encode('utf-8')
+    if name.endswith('.tar.gz'):
+        with tarfile.open(path, 'w:gz') as archive:
+            info = tarfile.TarInfo('enwiktionary_namespace_0_0.ndjson')
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    elif name.endswith('.gz'):
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+    else:
+        with open(path, 'wb') as f:
+            f.write(data)
+    return path
+
+
+def test_iter_dump_entries(tmp_path):
+    reports = []
+    entries = list(dumps.iter_dump_entries(write_dump(tmp_path, 'dump.ndjson'), progress=reports.append))
+    assert [entry.word for entry in entries] == ['кот', 'дом']
+    assert entries[0].definitions[0].text == "tomcat"
+    assert entries[1].part_of_speech == "Noun"
+    assert [definition.text for definition in entries[1].definitions] == ['house', 'home']
+
+    stats = reports[-1]
+    assert stats.pages == 3
+    assert stats.russian_pages == 2
+    assert stats.entries == 2
+    assert stats.pages_per_sec > 0
+
+
+def test_compressed_dumps_serialized(tmp_path):
+    for name in ['dump.ndjson.gz', 'dump.tar.gz']:
+        entries = list(dumps.iter_dump_entries(write_dump(tmp_path, name), serialize=True))
+        assert [entry['word'] for entry in entries] == ['кот', 'дом']
+        assert entries[0]['definitions'][0]['text'] == "tomcat"
+
+
+def test_non_russian_pages_not_parsed(tmp_path):
+    with patch('russianwiktionaryparser.dumps.WiktionaryPageParser') as mock_parser:
+        list(dumps.iter_dump_entries(write_dump(tmp_path, 'dump.ndjson')))
+    assert mock_parser.call_count == 2
@@ -0,0 +1,65 @@
+import os
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.formindex import FormIndex
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def build_soup_from_file(word):
+    full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
+    return BeautifulSoup(open(full_file_path, 'r', encoding='utf-8'), features="lxml")
+
+
+def parse_fixtures(*words):
+    entries = []
+    for word in words:
+        entries.extend(wiktionaryparser.WiktionaryPageParser(word, build_soup_from_file(word)).get_entries())
+    return entries
+
+
+def test_lookup():
+    index = FormIndex.build(parse_fixtures('человек', 'кот', 'худой', 'сказать'))
+    assert ('человек', 'Noun', 'gen|p') in index.lookup('людей')
+    assert ('человек', 'Noun', 'acc|p') in index.lookup('людей')
+    assert index.lemmas_of('людей') == [('человек', 'Noun')]
+    assert index.lemmas_of('котов') == [('кот', 'Noun')]
+    assert index.lemmas_of('Кото́в') == [('кот', 'Noun')]
+    assert 'людей' in index
+    assert 'кото' not in index
+    assert 'йцук' not in index
+    assert index.lookup('котовый') == []
+    assert index.lookup('') == []
+
+
+def test_matches_inflection_tables():
+    entries = parse_fixtures('человек', 'кот', 'худой', 'сказать', 'пить', 'издержка')
+    index = FormIndex.build(entries)
+    forms = set()
+    for entry in entries:
+        if entry.inflections is not None:
+            for form in entry.inflections.to_lower_set():
+                forms.add(form)
+                assert (entry.word, entry.part_of_speech) in index.lemmas_of(form)
+    assert len(index) == len({wiktionaryparser.form_key(form) for form in forms if form})
+
+
+def test_save_and_load(tmp_path):
+    index = FormIndex.build(parse_fixtures('человек', 'худой'))
+    path = str(tmp_path / 'forms.idx')
+    index.save(path)
+    loaded = FormIndex.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.nbytes == index.nbytes
+    assert loaded.lookup('людей') == index.lookup('людей')
+    assert loaded.lemmas_of('худых') == index.lemmas_of('худых')
+
+
+def test_empty_index(tmp_path):
+    index = FormIndex.build([])
+    assert len(index) == 0
+    assert index.lookup('кот') == []
+    path = str(tmp_path / 'empty.idx')
+    index.save(path)
+    assert len(FormIndex.load(path)) == 0
@@ -0,0 +1,57 @@
+import os
+import pytest
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import metrics, wiktionaryparser
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+suffix = ' - Wiktionary.html'
+fixture_words = sorted(name[:-len(suffix)] for name in os.listdir(os.path.join(dir_path, data_dir))
+                       if name.endswith(suffix))
+
+
+def build_soup_from_file(word, base_url=None):
+    full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
+    return BeautifulSoup(open(full_file_path, 'r', encoding='utf-8'), features="lxml")
+
+
+def snapshot(entry):
+    return (entry.part_of_speech, entry.serialize(), entry.audio_links, entry.base_links, entry.base_links_set,
+            [definition.base_link for definition in entry.definitions])
+
+
+@pytest.mark.parametrize('word', fixture_words)
+@pytest.mark.parametrize('fields', [['definitions'], ['inflections', 'audio_links', 'definitions'],
+                                    ['base_links_set', 'audio_links']])
+def test_lazy_matches_eager(word, fields):
+    eager = wiktionaryparser.WiktionaryPageParser(word, build_soup_from_file(word)).get_entries()
+    lazy = wiktionaryparser.WiktionaryPageParser(word, build_soup_from_file(word), lazy=True).get_entries()
+    assert len(lazy) == len(eager)
+    for entry in reversed(lazy):
+        for field in fields:
+            getattr(entry, field)
+    assert [snapshot(entry) for entry in lazy] == [snapshot(entry) for entry in eager]
+    assert all(entry.is_parsed for entry in lazy)
+
+
+def test_fetch_lazy():
+    registry = metrics.MetricsRegistry()
+    wiki = wiktionaryparser.WiktionaryParser(metrics=registry)
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup') as mock_fetch:
+        mock_fetch.side_effect = build_soup_from_file
+        entries = wiki.fetch('худой', lazy=True)
+
+    assert [entry.part_of_speech for entry in entries] == ['Adjective', 'Adjective']
+    assert not any(entry.is_parsed for entry in entries)
+    assert registry.summary(metrics.STAGE_SECONDS, stage='definitions') == (0, 0.0)
+    assert registry.counter(metrics.ENTRIES) == 2
+
+    assert entries[0].inflections.to_json()['nom|m|s'] == ['худо́й']
+    assert registry.summary(metrics.STAGE_SECONDS, stage='inflection_table')[0] == 1
+    assert registry.summary(metrics.STAGE_SECONDS, stage='definitions')[0] == 0
+    assert entries[1].definitions[0].text == 'bad'
+    assert registry.counter(metrics.DEFINITIONS) == len(entries[1].definitions)
+
+    entries[0].detach()
+    assert entries[0].is_parsed and entries[0].is_detached
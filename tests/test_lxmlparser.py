@@ -0,0 +1,62 @@
+import os
+import pytest
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.lxmlparser import LxmlPageParser
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+FIXTURES = sorted(name for name in os.listdir(os.path.join(dir_path, data_dir)) if name.endswith('.html'))
+
+
+def read_fixture(file_name):
+    with open(os.path.join(dir_path, data_dir, file_name), 'rb') as f:
+        return f.read()
+
+
+def describe(entry):
+    """Everything the parsers extract for an entry, in comparable form."""
+    return {
+        'word': entry.word,
+        'part_of_speech': entry.part_of_speech,
+        'definitions': [(definition.text, definition.base_word, definition.base_link,
+                         [(example.text, example.translation) for example in definition.examples])
+                        for definition in entry.definitions],
+        'inflections': None if entry.inflections is None else (entry.inflections.to_json(),
+                                                                entry.inflections.serialize()),
+        'audio_links': entry.audio_links,
+        'base_links': entry.base_links,
+        'base_links_set': entry.base_links_set,
+    }
+
+
+@pytest.mark.parametrize('file_name', FIXTURES)
+def test_backends_equivalent(file_name):
+    content = read_fixture(file_name)
+    word = file_name[:-len(' - Wiktionary.html')]
+    bs4_page = wiktionaryparser.WiktionaryPageParser(word, BeautifulSoup(content, features="lxml"))
+    lxml_page = LxmlPageParser(word, content)
+
+    assert lxml_page.page_title == bs4_page.page_title
+    assert [describe(entry) for entry in lxml_page.get_entries()] == \
+        [describe(entry) for entry in bs4_page.get_entries()]
+
+
+def test_parser_backend_selection():
+    def serve_fixture(url, cache_key=None):
+        return read_fixture('кот - Wiktionary.html')
+
+    wiki = wiktionaryparser.WiktionaryParser(backend='lxml')
+    with patch('russianwiktionaryparser.wiktionaryparser.fetch_page') as mock_fetch:
+        mock_fetch.side_effect = serve_fixture
+        entries = wiki.fetch('кот')
+    assert len(entries) == 1, "Unexpected number of entries found"
+    assert entries[0].definitions[0].text == "tomcat"
+    assert entries[0].definitions[0].examples[0].translation == 'Puss in Boots'
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        wiktionaryparser.WiktionaryParser(backend='html5lib')
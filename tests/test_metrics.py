@@ -0,0 +1,99 @@
+import os
+from unittest.mock import patch, MagicMock
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import metrics, wiktionaryparser
+from russianwiktionaryparser.cache import DiskPageCache
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def read_page(word):
+    with open(os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html"), 'rb') as f:
+        return f.read()
+
+
+def serve_page(url, **kwargs):
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.content = read_page('кот' if 'кот' in url else 'сказать')
+    return resp
+
+
+def test_fetch_records_metrics():
+    registry = metrics.MetricsRegistry()
+    with patch('russianwiktionaryparser.wiktionaryparser._http_get') as mock_get:
+        mock_get.side_effect = serve_page
+        wiktionaryparser.WiktionaryParser(metrics=registry).fetch('кот')
+
+    assert registry.counter(metrics.PAGES) == 1
+    assert registry.counter(metrics.ENTRIES) == 1
+    assert registry.counter(metrics.DEFINITIONS) == 1
+    assert registry.summary(metrics.SOUP_SECONDS, backend='bs4')[0] == 1
+    for stage in ['title', 'filter_language', 'get_parts_of_speech', 'definitions', 'inflection_table', 'audio_links']:
+        count, seconds = registry.summary(metrics.STAGE_SECONDS, stage=stage)
+        assert count == 1, f"Stage {stage} not recorded"
+        assert seconds >= 0
+
+
+def test_http_and_cache_metrics(tmp_path):
+    registry = metrics.MetricsRegistry()
+    wiktionaryparser.set_page_cache(DiskPageCache(str(tmp_path)))
+    try:
+        with patch('russianwiktionaryparser.wiktionaryparser.get_session') as mock_session:
+            mock_session.return_value.get.side_effect = serve_page
+            wiki = wiktionaryparser.WiktionaryParser(metrics=registry)
+            wiki.fetch('кот')
+            wiki.fetch('кот')
+    finally:
+        wiktionaryparser.set_page_cache(None)
+
+    assert registry.counter(metrics.HTTP_REQUESTS, status=200) == 1
+    assert registry.summary(metrics.HTTP_BYTES) == (1, len(read_page('кот')))
+    assert registry.summary(metrics.HTTP_SECONDS)[0] == 1
+    assert registry.counter(metrics.CACHE_LOOKUPS, result='miss') == 1
+    assert registry.counter(metrics.CACHE_LOOKUPS, result='hit') == 1
+
+
+def test_fetch_many_records_from_worker_threads():
+    registry = metrics.MetricsRegistry()
+    with patch('russianwiktionaryparser.wiktionaryparser.get_session') as mock_session:
+        mock_session.return_value.get.side_effect = serve_page
+        results = list(wiktionaryparser.WiktionaryParser(metrics=registry).fetch_many(['кот', 'сказать']))
+    assert all(result.ok for result in results)
+    assert registry.counter(metrics.HTTP_REQUESTS, status=200) == 2
+    assert registry.counter(metrics.ENTRIES) == 2
+
+
+def test_no_sink_by_default():
+    page = wiktionaryparser.WiktionaryPageParser('кот', BeautifulSoup(read_page('кот'), features="lxml"))
+    assert page.metrics is None
+    assert metrics.timer(None, metrics.STAGE_SECONDS, stage='title') is metrics.timer(None, metrics.SOUP_SECONDS)
+
+
+def test_callback_sink():
+    events = []
+    sink = metrics.CallbackMetrics(lambda *event: events.append(event))
+    wiktionaryparser.WiktionaryPageParser('кот', BeautifulSoup(read_page('кот'), features="lxml"), metrics=sink)
+    assert ('counter', metrics.ENTRIES, 1, {}) in events
+    assert any(event[0] == 'summary' and event[3] == {'stage': 'definitions'} for event in events)
+
+
+def test_prometheus_export():
+    registry = metrics.MetricsRegistry()
+    registry.inc(metrics.HTTP_REQUESTS, status=200)
+    registry.inc(metrics.HTTP_REQUESTS, status=200)
+    registry.inc(metrics.HTTP_REQUESTS, status=429)
+    registry.observe(metrics.STAGE_SECONDS, 0.5, stage='title')
+    registry.observe(metrics.STAGE_SECONDS, 0.25, stage='title')
+
+    assert registry.to_prometheus() == (
+        '# HELP wiktionary_http_requests_total HTTP requests made, by status code\n'
+        '# TYPE wiktionary_http_requests_total counter\n'
+        'wiktionary_http_requests_total{status="200"} 2\n'
+        'wiktionary_http_requests_total{status="429"} 1\n'
+        '# HELP wiktionary_parse_stage_seconds Time spent in each page parsing stage in seconds\n'
+        '# TYPE wiktionary_parse_stage_seconds summary\n'
+        'wiktionary_parse_stage_seconds_count{stage="title"} 2\n'
+        'wiktionary_parse_stage_seconds_sum{stage="title"} 0.75\n'
+    )
@@ -0,0 +1,131 @@
+import os
+import urllib.parse
+from unittest.mock import patch
+import pytest
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.archive import PageArchive
+from russianwiktionaryparser.cache import DiskPageCache, normalize_word
+from russianwiktionaryparser.metrics import HTTP_BYTES, MetricsRegistry
+from russianwiktionaryparser.parseapi import EMPTY_SECTION, fetch_russian_section, find_language_section
+from russianwiktionaryparser.store import EntryStore
+from .stub_server import StubWiktionary, data_dir, fixture_revision, read_fixture
+
+WORDS = ['по', 'здорово', 'кот', 'пить', 'человек']
+
+
+def page_entries(word, backend):
+    return [entry.serialize() for entry in wiktionaryparser.parse_page(word, read_fixture(word), backend)]
+
+
+def api_paths(stub):
+    return [urllib.parse.unquote(path) for path in stub.requests]
+
+
+@pytest.mark.parametrize('backend', wiktionaryparser.BACKENDS)
+@pytest.mark.parametrize('modern_headings', [False, True])
+def test_api_mode_matches_full_page(backend, modern_headings):
+    with StubWiktionary(modern_headings=modern_headings) as stub:
+        wiki = wiktionaryparser.WiktionaryParser(backend=backend, mode='api', base_url=stub.base_url)
+        for word in WORDS:
+            assert [entry.serialize() for entry in wiki.fetch(word)] == page_entries(word, backend)
+        assert all(path.startswith('/w/api.php?action=parse') for path in stub.requests)
+        assert len(stub.requests) == 2 * len(WORDS)
+
+
+def test_section_is_smaller_than_page():
+    registry = MetricsRegistry()
+    with StubWiktionary() as stub:
+        wiki = wiktionaryparser.WiktionaryParser(mode='api', base_url=stub.base_url, metrics=registry)
+        wiki.fetch('по')
+    page_size = os.path.getsize(os.path.join(data_dir, 'по - Wiktionary.html'))
+    assert registry.total(HTTP_BYTES) < page_size / 10
+
+
+def test_title_and_revision():
+    store = EntryStore()
+    with StubWiktionary(aliases={'Кот': 'кот'}) as stub:
+        wiki = wiktionaryparser.WiktionaryParser(mode='api', base_url=stub.base_url, store=store)
+        entries = wiki.fetch('Кот')
+        assert 'section=' not in api_paths(stub)[0]
+        assert 'page=кот' in api_paths(stub)[1]
+    assert entries[0].word == 'кот'
+    assert store.revision('кот') == fixture_revision('кот')
+
+
+def test_fetch_many_in_api_mode():
+    with StubWiktionary() as stub:
+        wiki = wiktionaryparser.WiktionaryParser(backend='lxml', mode='api', base_url=stub.base_url)
+        results = list(wiki.fetch_many(['кот', 'пить']))
+    assert all(result.ok for result in results)
+    assert [entry.serialize() for entry in results[1].entries] == page_entries('пить', 'lxml')
+
+
+def test_missing_title_falls_back_to_page():
+    with StubWiktionary() as stub:
+        assert fetch_russian_section('йцук', stub.base_url) is None
+        wiki = wiktionaryparser.WiktionaryParser(mode='api', base_url=stub.base_url)
+        with patch('russianwiktionaryparser.wiktionaryparser.make_soup') as mock_fetch:
+            mock_fetch.side_effect = lambda word, base_url: wiktionaryparser.build_soup(read_fixture('кот'))
+            entries = wiki.fetch('йцук')
+    mock_fetch.assert_called_once_with('йцук', stub.base_url)
+    assert entries[0].word == 'кот'
+
+
+def test_only_successful_responses_cached(tmp_path):
+    cache = DiskPageCache(str(tmp_path))
+    wiktionaryparser.set_page_cache(cache)
+    try:
+        with StubWiktionary() as stub:
+            assert fetch_russian_section('йцук', stub.base_url) is None
+            assert len(cache) == 0, "API errors should not be cached"
+            assert fetch_russian_section('йцук', stub.base_url) is None
+            assert len(stub.requests) == 2
+            assert fetch_russian_section('кот', stub.base_url) is not None
+            assert len(cache) == 2
+            assert fetch_russian_section('кот', stub.base_url) is not None
+            assert len(stub.requests) == 4
+    finally:
+        wiktionaryparser.set_page_cache(None)
+
+
+def test_responses_not_archived(tmp_path):
+    archive = PageArchive(str(tmp_path / 'pages.rwpa'))
+    wiktionaryparser.set_page_cache(archive)
+    try:
+        with StubWiktionary() as stub:
+            wiki = wiktionaryparser.WiktionaryParser(mode='api', base_url=stub.base_url)
+            assert wiki.fetch('кот')[0].word == 'кот'
+            assert wiki.fetch('йцук') == []
+    finally:
+        wiktionaryparser.set_page_cache(None)
+        archive.close()
+    assert PageArchive(str(tmp_path / 'pages.rwpa')).keys() == [normalize_word('йцук')]
+
+
+@pytest.mark.parametrize('backend', wiktionaryparser.BACKENDS)
+def test_page_requests_use_base_url(backend):
+    with StubWiktionary() as stub:
+        wiki = wiktionaryparser.WiktionaryParser(backend=backend, base_url=stub.base_url)
+        assert [entry.word for entry in wiki.fetch('кот')] == ['кот']
+        assert all(result.ok for result in wiki.fetch_many(['пить', 'по']))
+        assert wiki.search('пи')[1] == ['пила', 'пить']
+        assert wiki.resolver.base_url == stub.base_url
+        api = wiktionaryparser.WiktionaryParser(backend=backend, mode='api', base_url=stub.base_url)
+        assert api.fetch('йцук') == []
+    paths = api_paths(stub)
+    assert paths[-1].startswith('/w/index.php?search=йцук')
+    assert sum(path.startswith('/w/index.php') for path in paths) == 4
+
+
+def test_page_without_russian_section():
+    sections = [{'level': '2', 'line': 'Bulgarian', 'anchor': 'Bulgarian', 'index': '1'},
+                {'level': '3', 'line': 'Russian', 'anchor': 'Russian', 'index': '2'}]
+    assert find_language_section(sections) is None
+    assert find_language_section(sections, 'Bulgarian') == '1'
+    for backend in wiktionaryparser.BACKENDS:
+        assert wiktionaryparser.parse_page('по', EMPTY_SECTION, backend) == []
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        wiktionaryparser.WiktionaryParser(mode='rest')
@@ -11,7 +11,7 @@ data_dir = 'data'
 logging.basicConfig(level=logging.DEBUG)
 
 
-def build_soup_from_file(word):
+def build_soup_from_file(word, base_url=None):
     full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
     return BeautifulSoup(open(full_file_path, 'r', encoding='utf-8'), features="lxml")
 
@@ -379,3 +379,52 @@ def test_follow_to_base_people():
 
     assert base_entries0[0].word == 'люди'
     assert base_entries1[0].word == 'человек'
+
+
+def test_sections_not_copied():
+    soup = build_soup_from_file('здорово')
+    headlines = soup.find_all('span', {'class': 'mw-headline'})
+    wiki_page = wiktionaryparser.WiktionaryPageParser('здорово', soup)
+    assert wiki_page.filtered_soup is not None
+    assert len(wiki_page.entries) == 5, "Unexpected number of entries found"
+    for entry in wiki_page.entries:
+        assert any(entry._pos_heading is headline for headline in headlines), "Headings should not be copies"
+    next_tag = soup.find('span', {'class': 'mw-headline', 'id': 'Russian'}).parent.find_next_sibling()
+    assert next_tag is None or next_tag.name == 'h2', "Russian section should have been moved out of the page"
+
+
+def test_sections_scoped_to_part_of_speech():
+    people = run_fetch('люди')
+    assert people[0].inflections.to_json()['ins'] == ['людьми́']
+    assert people[1].inflections is None, "Inflection table of another part of speech used"
+
+    thin = run_fetch('худой')
+    assert thin[0].inflections.to_json()['short|p'] != thin[1].inflections.to_json()['short|p']
+
+    saw = run_fetch('пила')
+    assert saw[0].audio_links == saw[1].audio_links, "Pronunciation section should be shared by both etymologies"
+    assert len(saw[0].audio_links) == 1
+    assert saw[1].inflections is None
+
+    healthy = run_fetch('здорово')
+    assert [len(entry.audio_links) for entry in healthy] == [1, 1, 1, 0, 0]
+
+
+def test_entry_from_headline():
+    soup = build_soup_from_file('худой')
+    headline = soup.find('span', {'class': 'mw-headline', 'id': 'Adjective_2'})
+    entry = wiktionaryparser.WiktionaryEntry('худой', headline)
+    assert entry.serialize() == run_fetch('худой')[1].serialize()
+    assert entry.audio_links == run_fetch('худой')[1].audio_links
+
+
+def test_page_split_helpers():
+    soup = build_soup_from_file('пила')
+    section = wiktionaryparser.WiktionaryPageParser('пила', soup).filtered_soup
+    headlines = wiktionaryparser.get_parts_of_speech(section)
+    assert [headline['id'] for headline in headlines] == ['Noun_3', 'Verb']
+    etymologies = section.find_all('span', {'class': 'mw-headline', 'id': lambda id: id.startswith('Etymology')})
+    split_page = wiktionaryparser.split_page_by_etymology(etymologies)
+    assert [[headline['id'] for headline in wiktionaryparser.get_parts_of_speech(page)] for page in split_page] == \
+        [['Noun_3'], ['Verb']]
+    assert len(wiktionaryparser.get_parts_of_speech(section)) == 2, "The page should be left untouched"
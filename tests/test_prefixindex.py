@@ -0,0 +1,66 @@
+import json
+import os
+from unittest.mock import MagicMock, patch
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.prefixindex import PrefixIndex
+from russianwiktionaryparser.store import EntryStore
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def parse_fixture(word):
+    full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
+    soup = BeautifulSoup(open(full_file_path, 'r', encoding='utf-8'), features="lxml")
+    return wiktionaryparser.WiktionaryPageParser(word, soup).get_entries()
+
+
+def test_search_titles():
+    index = PrefixIndex(['пить', 'пила', 'по', 'подчиняться', 'Россия', 'кот'])
+    assert index.search('пи') == ['пи', ['пила', 'пить'], ['', ''],
+                                  ['https://en.wiktionary.org/wiki/%D0%BF%D0%B8%D0%BB%D0%B0',
+                                   'https://en.wiktionary.org/wiki/%D0%BF%D0%B8%D1%82%D1%8C']]
+    assert index.complete('по') == ['по', 'подчиняться']
+    assert index.complete('по', limit=1) == ['по']
+    assert index.complete('РОС') == ['Россия']
+    assert index.complete('пи́') == ['пила', 'пить']
+    assert index.complete('пу') == []
+    assert 'кот' in index and 'ко' not in index
+
+
+def test_from_entries_and_store():
+    entries = parse_fixture('кот') + parse_fixture('человек')
+    index = PrefixIndex.from_entries(entries)
+    assert index.complete('кото') == ['котов', 'котом']
+    assert 'людьми' in index
+
+    store = EntryStore(batch_size=1)
+    store.add(entries)
+    assert PrefixIndex.from_store(store).titles == index.titles
+
+
+def test_capitalised_forms_keep_their_spelling():
+    entries = parse_fixture('Россия')
+    store = EntryStore()
+    store.add(entries)
+    assert PrefixIndex.from_store(store).complete('росси') == PrefixIndex.from_entries(entries).complete('росси')
+    assert 'Россией' in PrefixIndex.from_store(store).complete('росси')
+
+
+def test_parser_search_uses_index():
+    index = PrefixIndex(['пить', 'пила'])
+    wiki = wiktionaryparser.WiktionaryParser(search_index=index)
+    with patch('russianwiktionaryparser.wiktionaryparser._http_get') as mock_get:
+        assert wiki.search('пи')[1] == ['пила', 'пить']
+        mock_get.assert_not_called()
+
+        mock_get.return_value = MagicMock(status_code=200, content=json.dumps(['кот', ['кот'], [''], ['']]).encode())
+        assert wiki.search('кот')[1] == ['кот']
+        mock_get.assert_called_once()
+
+
+def test_large_index():
+    index = PrefixIndex(f'слово{i}' for i in range(100000))
+    assert index.complete('слово5000', 3) == ['слово5000', 'слово50000', 'слово50001']
+    assert 'слово99999' in index
@@ -0,0 +1,79 @@
+import urllib.parse
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.refresh import fetch_revisions, refresh_store
+from russianwiktionaryparser.store import EntryStore
+from .stub_server import StubWiktionary
+
+WORDS = ['кот', 'человек', 'худой', 'пить']
+
+
+def fill_store(stub, store):
+    wiki = wiktionaryparser.WiktionaryParser(store=store)
+    for word in WORDS:
+        wiki.fetch_from_url(f'{stub.base_url}/wiki/{word}')
+    return wiki
+
+
+def page_downloads(stub):
+    return [urllib.parse.unquote(path) for path in stub.requests if path.startswith('/wiki/')]
+
+
+def test_fetch_records_revision():
+    store = EntryStore()
+    wiki = wiktionaryparser.WiktionaryParser(store=store)
+    with StubWiktionary() as stub:
+        wiki.fetch_from_url(f'{stub.base_url}/wiki/кот')
+    assert store.revision('кот') == 59010868
+    store.remove('кот')
+    assert store.revision('кот') is None
+
+
+def test_refresh_only_downloads_changed_pages():
+    store = EntryStore()
+    with StubWiktionary() as stub:
+        wiki = fill_store(stub, store)
+    with StubWiktionary(revisions={'кот': 59010869, 'пить': None}) as stub:
+        report = wiki.refresh(base_url=stub.base_url)
+        assert page_downloads(stub) == ['/wiki/кот']
+        assert report.revision_requests == 1
+
+    assert report.unchanged == ['худой', 'человек']
+    assert report.changed == ['кот']
+    assert report.removed == ['пить']
+    assert report.failed == []
+    assert report.downloads == 1
+    assert str(report).startswith('4 pages: 2 unchanged, 1 changed, 1 removed, 0 failed; 1 downloads')
+    assert store.revision('кот') == 59010869
+    assert store.words() == ['кот', 'худой', 'человек']
+    assert store.get('кот')[0].definitions[0].text == 'tomcat'
+
+    with StubWiktionary(revisions={'кот': 59010869}) as stub:
+        report = wiki.refresh(base_url=stub.base_url)
+        assert page_downloads(stub) == []
+    assert len(report.unchanged) == 3
+
+
+def test_refresh_in_batches():
+    store = EntryStore()
+    with StubWiktionary() as stub:
+        wiki = fill_store(stub, store)
+        store.set_revision('худой', 1)
+        report = refresh_store(wiki, base_url=stub.base_url, batch_size=3)
+    assert report.revision_requests == 2
+    assert report.changed == ['худой']
+    assert store.revision('худой') == 55548560
+
+
+def test_failed_revision_check():
+    store = EntryStore()
+    with StubWiktionary() as stub:
+        wiki = fill_store(stub, store)
+    with StubWiktionary(intercept=lambda handler: (500, b'') if 'api.php' in handler.path else None) as stub:
+        report = wiki.refresh(base_url=stub.base_url)
+    assert len(report.failed) == 4
+    assert len(store) == 5
+
+
+def test_fetch_revisions_resolves_aliases():
+    with StubWiktionary() as stub:
+        assert fetch_revisions(['кот', 'йцук'], stub.base_url) == {'кот': 59010868, 'йцук': None}
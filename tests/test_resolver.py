@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+import urllib
+from collections import Counter
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.resolver import BaseResolver
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def build_soup_from_file(word, base_url=None):
+    full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
+    return BeautifulSoup(open(full_file_path, 'r', encoding='utf-8'), features="lxml")
+
+
+class CountingFetch:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, url):
+        word = wiktionaryparser.parse_word_from_url(url)
+        with self._lock:
+            self.calls[word] += 1
+        time.sleep(self.delay)
+        return build_soup_from_file(word)
+
+
+def parse_fixture(word):
+    return wiktionaryparser.WiktionaryPageParser(word, build_soup_from_file(word)).get_entries()
+
+
+def form_of(*bases):
+    entry = wiktionaryparser.WiktionaryEntry('test')
+    for base in bases:
+        definition = wiktionaryparser.WiktionaryDefinition()
+        definition.base_word = base
+        definition.base_link = f'/wiki/{urllib.parse.quote(base)}#Russian'
+        entry.definitions.append(definition)
+    entry._parse_base_links()
+    return entry
+
+
+def test_fetch_follow_to_base():
+    fetch = CountingFetch()
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup') as mock_soup, \
+            patch('russianwiktionaryparser.wiktionaryparser.make_soup_from_url') as mock_soup_from_url:
+        mock_soup.side_effect = build_soup_from_file
+        mock_soup_from_url.side_effect = fetch
+        entries = wiktionaryparser.WiktionaryParser().fetch('людей', follow_to_base=True)
+
+    assert [entry.word for entry in entries] == ['люди', 'люди', 'человек']
+    assert entries[2].tracing == ['Followed to base челове́к']
+    assert fetch.calls == {'люди': 1, 'человек': 1}
+
+
+def test_links_deduplicated_and_memoized():
+    fetch = CountingFetch()
+    entries = parse_fixture('людей') + parse_fixture('людей') + [form_of('пить')]
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup_from_url') as mock_soup_from_url:
+        mock_soup_from_url.side_effect = fetch
+        with BaseResolver() as resolver:
+            resolved = resolver.resolve(entries)
+            assert [[entry.word for entry in bases] for bases in resolved] == \
+                [['люди', 'люди'], ['человек'], ['люди', 'люди'], ['человек'], ['пить']]
+            assert [entry.word for entry in resolver.follow(entries)] == ['люди', 'люди', 'человек', 'пить']
+    assert fetch.calls == {'люди': 1, 'человек': 1, 'пить': 1}
+    assert resolved[0][0] is not resolved[2][0], "Callers should get their own copies"
+
+
+def test_concurrent_callers_share_fetch():
+    fetch = CountingFetch(delay=0.2)
+    entries = parse_fixture('пила')
+    results = []
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup_from_url') as mock_soup_from_url:
+        mock_soup_from_url.side_effect = fetch
+        with BaseResolver() as resolver:
+            threads = [threading.Thread(target=lambda: results.append(resolver.resolve(entries))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    assert fetch.calls == {'пить': 1}
+    assert len(results) == 4
+    assert all(result[1][0].definitions[0].text == 'to drink' for result in results)
+
+
+def test_multiple_base_links():
+    fetch = CountingFetch()
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup_from_url') as mock_soup_from_url:
+        mock_soup_from_url.side_effect = fetch
+        entries = form_of('человек', 'пить', 'человек').follow_to_base()
+    assert [entry.word for entry in entries] == ['человек', 'пить']
+    assert fetch.calls == {'человек': 1, 'пить': 1}
+
+
+def test_failed_base_keeps_entry():
+    def fail(url):
+        raise ConnectionError('offline')
+
+    entry = form_of('пить')
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup_from_url') as mock_soup_from_url:
+        mock_soup_from_url.side_effect = fail
+        with BaseResolver() as resolver:
+            assert resolver.resolve([entry]) == [[]]
+            assert resolver.follow([entry]) == [entry]
+            mock_soup_from_url.side_effect = CountingFetch()
+            assert [base.word for base in resolver.resolve([entry])[0]] == ['пить']
@@ -0,0 +1,165 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+import pytest
+import requests
+from russianwiktionaryparser import metrics, wiktionaryparser
+from russianwiktionaryparser.scheduler import RequestScheduler, TokenBucket, parse_retry_after
+from .stub_server import StubWiktionary
+
+WORDS = ['кот', 'сказать', 'худой', 'человек', 'по', 'пить', 'пила', 'люди']
+
+
+class Throttle:
+    """Stub intercept refusing the first attempts at every page."""
+
+    def __init__(self, refusals, status=429, retry_after='0'):
+        self.refusals = refusals
+        self.status = status
+        self.retry_after = retry_after
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, handler):
+        with self.lock:
+            count = self.seen[handler.path] = self.seen.get(handler.path, 0) + 1
+        if count <= self.refusals:
+            headers = {'Retry-After': self.retry_after} if self.retry_after is not None else {}
+            return self.status, b'slow down', 'text/plain', headers
+        return None
+
+
+@pytest.fixture
+def scheduler():
+    previous = wiktionaryparser.get_scheduler()
+    scheduler = RequestScheduler(backoff=0.01, max_retries=3, initial_concurrency=4, increase_after=2)
+    wiktionaryparser.set_scheduler(scheduler)
+    yield scheduler
+    wiktionaryparser.set_scheduler(previous)
+
+
+def fetch_all(stub, words, workers=4, registry=None):
+    wiki = wiktionaryparser.WiktionaryParser(metrics=registry)
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(lambda word: wiki.fetch_from_url(f'{stub.base_url}/wiki/{word}'), words))
+
+
+def test_retry_after_honoured(scheduler):
+    registry = metrics.MetricsRegistry()
+    throttle = Throttle(refusals=2)
+    with StubWiktionary(intercept=throttle) as stub:
+        results = fetch_all(stub, WORDS, registry=registry)
+    assert all(entries for entries in results), "No word should be lost"
+    assert results[0][0].word == 'кот'
+    assert all(count == 3 for count in throttle.seen.values())
+    assert registry.counter(metrics.HTTP_RETRIES, reason='429') == 2 * len(WORDS)
+    assert scheduler.concurrency < 4
+
+
+def test_backoff_without_retry_after(scheduler):
+    throttle = Throttle(refusals=1, status=503, retry_after=None)
+    with StubWiktionary(intercept=throttle) as stub:
+        results = fetch_all(stub, WORDS[:3])
+    assert all(entries for entries in results)
+    assert len(stub.requests) == 6
+
+
+def test_gives_up_after_max_retries(scheduler):
+    throttle = Throttle(refusals=100)
+    with StubWiktionary(intercept=throttle) as stub:
+        assert wiktionaryparser.fetch_page(f'{stub.base_url}/wiki/кот') is None
+        assert len(stub.requests) == scheduler.max_retries + 1
+
+
+def test_concurrency_ramps_up_and_down():
+    scheduler = RequestScheduler(initial_concurrency=2, max_concurrency=4, increase_after=3, backoff=0.01)
+    ok = MagicMock(status_code=200)
+    for _ in range(9):
+        scheduler.request(lambda: ok)
+    assert scheduler.concurrency == 4
+    throttled = MagicMock(status_code=429, headers={})
+    replies = iter([throttled, ok])
+    assert scheduler.request(lambda: next(replies)) is ok
+    assert scheduler.concurrency == 2
+
+
+def test_concurrency_bounded():
+    scheduler = RequestScheduler(initial_concurrency=3, increase_after=1000)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def send():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+        return MagicMock(status_code=200)
+
+    with ThreadPoolExecutor(10) as executor:
+        list(executor.map(lambda _: scheduler.request(send), range(20)))
+    assert max(peak) == 3
+
+
+def test_streamed_response_holds_slot_until_closed():
+    scheduler = RequestScheduler(initial_concurrency=1, increase_after=1000)
+    first = scheduler.request(lambda: MagicMock(status_code=200), streamed=True)
+    second = []
+    thread = threading.Thread(target=lambda: second.append(scheduler.request(lambda: MagicMock(status_code=200))))
+    thread.start()
+    thread.join(0.1)
+    assert second == [], "Slot should be held while the streamed body is read"
+    first.close()
+    first.close()
+    thread.join(1)
+    assert len(second) == 1
+    assert scheduler._active == 0
+
+
+def test_connection_errors_retried():
+    scheduler = RequestScheduler(backoff=0.01, max_retries=2)
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise requests.ConnectionError('refused')
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.request(send)
+    assert len(calls) == 3
+
+
+def test_mixed_retry_reasons_export():
+    scheduler = RequestScheduler(backoff=0.01, max_retries=2)
+    registry = metrics.MetricsRegistry()
+    responses = [requests.ConnectionError('refused'), MagicMock(status_code=503, headers={}), MagicMock(status_code=200)]
+
+    def send():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    with metrics.use_metrics(registry):
+        assert scheduler.request(send).status_code == 200
+    exported = registry.to_prometheus()
+    assert f'{metrics.HTTP_RETRIES}{{reason="503"}} 1' in exported
+    assert f'{metrics.HTTP_RETRIES}{{reason="error"}} 1' in exported
+
+
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=100, burst=5)
+    start = time.monotonic()
+    for _ in range(25):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.18
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert 0 <= parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') < 1
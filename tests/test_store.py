@@ -0,0 +1,110 @@
+import json
+import os
+import time
+from unittest.mock import patch
+import pytest
+from bs4 import BeautifulSoup
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.binary import SerializationError
+from russianwiktionaryparser.store import EntryStore
+from .stub_server import StubWiktionary
+from .test_binary import all_fields
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+data_dir = 'data'
+
+
+def build_soup_from_file(word, base_url=None):
+    full_file_path = os.path.join(dir_path, data_dir, f"{word} - Wiktionary.html")
+    return BeautifulSoup(open(full_file_path, 'r', encoding='utf-8'), features="lxml")
+
+
+def parse_fixture(word):
+    return wiktionaryparser.WiktionaryPageParser(word, build_soup_from_file(word)).get_entries()
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'entries.sqlite')
+    with EntryStore(path) as store:
+        assert store.add(parse_fixture('кот') + parse_fixture('худой')) == 3
+
+    with EntryStore(path) as store:
+        assert len(store) == 3
+        assert store.words() == ['кот', 'худой']
+        entries = store.get('худой')
+        assert [entry.part_of_speech for entry in entries] == ['Adjective', 'Adjective']
+        assert entries[1].definitions[0].text == "bad"
+        cat = store.get('кот')[0]
+        assert cat == parse_fixture('кот')[0]
+        assert cat.definitions[0].examples[0].text == 'кот в сапога́х'
+        assert cat.inflections.to_json()['gen|p'] == ['кото́в']
+        assert cat.inflections.serialize()['gen|p'] == ['котов']
+        assert cat.audio_links == parse_fixture('кот')[0].audio_links
+
+
+def test_lookup_by_form():
+    store = EntryStore()
+    store.add(parse_fixture('человек') + parse_fixture('кот'))
+    assert [entry.word for entry in store.lookup('людей')] == ['человек']
+    assert [entry.word for entry in store.lookup('Людьми́')] == ['человек']
+    assert [entry.word for entry in store.lookup('КОТ')] == ['кот']
+    assert store.lookup('собака') == []
+
+
+def test_replace():
+    store = EntryStore()
+    store.add(parse_fixture('кот'))
+    store.replace('кот', parse_fixture('кот'))
+    assert len(store) == 1
+    assert [entry.word for entry in store.lookup('коту')] == ['кот']
+
+
+def test_replace_is_atomic():
+    store = EntryStore(batch_size=1)
+    store.replace('кот', parse_fixture('кот'), revision=1)
+    broken = parse_fixture('кот')[0]
+    broken.part_of_speech = 'Noun\0'
+    with pytest.raises(SerializationError):
+        store.replace('кот', parse_fixture('кот') + [broken], revision=2)
+    assert len(store) == 1
+    assert store.revision('кот') == 1
+
+
+def test_bulk_insert_is_batched():
+    entry = parse_fixture('кот')[0]
+    store = EntryStore(batch_size=500)
+    start = time.perf_counter()
+    assert store.add(entry for _ in range(5000)) == 5000
+    assert time.perf_counter() - start < 10
+    assert len(store.lookup('кота')) == 5000
+
+
+def test_parser_consults_store():
+    store = EntryStore()
+    wiki = wiktionaryparser.WiktionaryParser(store=store)
+    with patch('russianwiktionaryparser.wiktionaryparser.make_soup') as mock_fetch:
+        mock_fetch.side_effect = build_soup_from_file
+        fetched = wiki.fetch('сказать')
+        stored = wiki.fetch('сказать')
+    assert mock_fetch.call_count == 1
+    assert stored == fetched
+    assert 'сказать' in store
+
+
+def test_store_hit_matches_fresh_parse():
+    with StubWiktionary() as stub:
+        wiki = wiktionaryparser.WiktionaryParser(store=EntryStore())
+        fresh = wiki.fetch_from_url(f'{stub.base_url}/wiki/людей')
+        stored = wiki.fetch('людей')
+    assert len(stub.requests) == 1
+    assert [all_fields(entry) for entry in stored] == [all_fields(entry) for entry in fresh]
+    assert stored[0].base_links
+
+
+def test_reads_json_rows():
+    entry = parse_fixture('кот')[0]
+    store = EntryStore()
+    with store._conn:
+        store._conn.execute("INSERT INTO entries (id, word, word_key, part_of_speech, data) VALUES (1, 'кот', 'кот', "
+                            "'Noun', ?)", (json.dumps(entry.serialize(), ensure_ascii=False),))
+    assert store.get('кот') == [entry]
@@ -0,0 +1,123 @@
+import threading
+import pytest
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.cache import DiskPageCache, normalize_word
+from russianwiktionaryparser.scheduler import RequestScheduler
+from russianwiktionaryparser.metrics import ENTRIES, HTTP_BYTES, PAGES, MetricsRegistry, current_metrics, use_metrics
+from russianwiktionaryparser.store import EntryStore
+from russianwiktionaryparser.streaming import StreamingPageParser, stream_entries
+from .stub_server import FIXTURE_WORDS, StubWiktionary, fixture_revision, read_fixture
+
+
+def describe(entries):
+    return [(entry.serialize(), entry.audio_links) for entry in entries]
+
+
+def chunks(content, size=4096):
+    for i in range(0, len(content), size):
+        yield content[i:i + size]
+
+
+@pytest.mark.parametrize('word', FIXTURE_WORDS)
+def test_stream_matches_full_parse(word):
+    content = read_fixture(word)
+    assert describe(stream_entries(word, chunks(content))) == \
+        describe(wiktionaryparser.parse_page(word, content, 'lxml'))
+
+
+def test_stops_at_end_of_russian_section():
+    content = read_fixture('пить')
+    page = StreamingPageParser('пить')
+    entries = []
+    for chunk in chunks(content):
+        entries.extend(page.feed(chunk))
+        if page.done:
+            break
+    assert page.done
+    assert len(entries) == 1
+    assert page.bytes_read < content.index(b'<h2', content.index(b'id="Russian"')) + 2 * 4096
+    assert page.bytes_read < len(content) * 0.95
+    assert (page.page_title, page.revision_id) == ('пить', fixture_revision('пить'))
+    assert page.close() == []
+
+
+def test_entries_yielded_as_sections_complete():
+    content = read_fixture('здорово')
+    page = StreamingPageParser('здорово')
+    for chunk in chunks(content, 1024):
+        if page.feed(chunk):
+            break
+    assert not page.done, "First entry should be available before the Russian section ends"
+    assert [entry.part_of_speech for entry in page.entries] == ['Adverb']
+
+
+def test_parser_stream():
+    registry = MetricsRegistry()
+    with StubWiktionary() as stub, EntryStore(':memory:') as store:
+        wiki = wiktionaryparser.WiktionaryParser(base_url=stub.base_url, store=store, metrics=registry)
+        entries = list(wiki.stream('человек'))
+        expected = wiktionaryparser.parse_page('человек', read_fixture('человек'), 'lxml')
+        assert describe(entries) == describe(expected)
+        assert len(stub.requests) == 1
+        assert registry.summary(HTTP_BYTES)[1] < len(read_fixture('человек'))
+        assert store.revision('человек') == fixture_revision('человек')
+
+        assert list(wiki.stream('человек')) == entries
+        assert len(stub.requests) == 1, "Stored entries should not be fetched again"
+        assert list(wiki.stream('йцук')) == []
+
+
+def test_stream_records_to_parser_metrics():
+    registry, other = MetricsRegistry(), MetricsRegistry()
+    with StubWiktionary() as stub, use_metrics(other):
+        entries = wiktionaryparser.WiktionaryParser(base_url=stub.base_url, metrics=registry).stream('пить')
+        next(entries)
+        assert current_metrics() is other, "The parser's metrics should not stay current between entries"
+        assert list(entries) == []
+    assert (registry.counter(PAGES), registry.counter(ENTRIES)) == (1, 1)
+    assert registry.summary(HTTP_BYTES)[0] == 1
+    assert other.counter(PAGES) == 0
+
+
+def test_stream_frees_slot_before_last_entry():
+    previous = wiktionaryparser.get_scheduler()
+    scheduler = RequestScheduler(initial_concurrency=1, increase_after=1000)
+    wiktionaryparser.set_scheduler(scheduler)
+    try:
+        with StubWiktionary() as stub:
+            wiki = wiktionaryparser.WiktionaryParser(backend='lxml', base_url=stub.base_url)
+            held = []
+            fetched = []
+
+            def stream_and_fetch():
+                for _ in wiki.stream('здорово'):
+                    held.append(scheduler._active)
+                    if not scheduler._active and not fetched:
+                        fetched.extend(wiki.fetch('кот'))
+
+            thread = threading.Thread(target=stream_and_fetch, daemon=True)
+            thread.start()
+            thread.join(5)
+            assert not thread.is_alive(), "Fetching with the last entry should not wait for the stream's slot"
+            assert len(held) == 5 and held[0] == 1 and held[-1] == 0
+            assert [entry.word for entry in fetched] == ['кот']
+    finally:
+        wiktionaryparser.set_scheduler(previous)
+
+
+def test_stream_from_page_cache(tmp_path):
+    cache = DiskPageCache(str(tmp_path))
+    cache.put(normalize_word('кот'), read_fixture('кот'))
+    wiktionaryparser.set_page_cache(cache)
+    try:
+        with StubWiktionary() as stub:
+            entries = list(wiktionaryparser.WiktionaryParser(base_url=stub.base_url).stream('кот'))
+            assert stub.requests == []
+    finally:
+        wiktionaryparser.set_page_cache(None)
+    assert entries[0].definitions[0].text == 'tomcat'
+
+
+def test_stream_server_error():
+    with StubWiktionary(intercept=lambda handler: (404, b'')) as stub:
+        assert list(wiktionaryparser.WiktionaryParser(base_url=stub.base_url).stream('кот')) == []
@@ -0,0 +1,76 @@
+import os
+import time
+from unittest.mock import patch
+from russianwiktionaryparser import wiktionaryparser
+from russianwiktionaryparser.transcode import TranscodeError, mp3_path, transcode_many
+
+
+def copy_convert(source, target):
+    if b'bad' in open(source, 'rb').read():
+        raise TranscodeError('not audio')
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        dst.write(src.read())
+
+
+def write(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+    return str(path)
+
+
+def test_transcode_many(tmp_path):
+    files = [write(tmp_path / f'{i}.ogg', b'audio') for i in range(6)]
+    files.append(write(tmp_path / 'bad.ogg', b'bad'))
+    files.append(write(tmp_path / 'done.mp3', b'audio'))
+    reports = []
+    results = list(transcode_many(files, max_workers=2, convert=copy_convert,
+                                  progress=lambda stats: reports.append(str(stats))))
+
+    by_source = {os.path.basename(result.source): result for result in results}
+    assert len(by_source) == 8
+    assert all(by_source[f'{i}.ogg'].ok and not by_source[f'{i}.ogg'].skipped for i in range(6))
+    assert open(tmp_path / '0.mp3', 'rb').read() == b'audio'
+    assert not by_source['bad.ogg'].ok
+    assert 'not audio' in str(by_source['bad.ogg'].error)
+    assert not os.path.exists(tmp_path / 'bad.mp3')
+    assert by_source['done.mp3'].skipped
+    assert len(reports) == 8
+    assert reports[-1].startswith('8 files (6 converted, 1 up to date, 1 failed)')
+
+
+def test_up_to_date_outputs_skipped(tmp_path):
+    source = write(tmp_path / 'a.ogg', b'audio')
+    assert [result.skipped for result in transcode_many([source], convert=copy_convert)] == [False]
+    assert [result.skipped for result in transcode_many([source], convert=copy_convert)] == [True]
+    assert [result.skipped for result in transcode_many([source], convert=copy_convert, force=True)] == [False]
+    later = time.time() + 10
+    os.utime(source, (later, later))
+    assert [result.skipped for result in transcode_many([source], convert=copy_convert)] == [False]
+
+
+def test_missing_source_fails_alone(tmp_path):
+    missing = str(tmp_path / 'missing.ogg')
+    write(mp3_path(missing), b'audio')
+    source = write(tmp_path / 'a.ogg', b'audio')
+    results = {os.path.basename(result.source): result
+               for result in transcode_many([missing, source], max_workers=1, convert=copy_convert)}
+    assert not results['missing.ogg'].ok and not results['missing.ogg'].skipped
+    assert results['a.ogg'].ok
+
+
+def test_conversion_errors_reported(tmp_path):
+    source = write(tmp_path / 'noise.ogg', b'not an ogg file')
+    result, = transcode_many([source], max_workers=1)
+    assert not result.ok and isinstance(result.error, TranscodeError)
+    assert os.listdir(tmp_path) == ['noise.ogg']
+    assert wiktionaryparser.convert_ogg_to_mp3(source) is None
+
+
+def test_target_shared_with_single_conversion(tmp_path):
+    directory = tmp_path / 'clips.ogg'
+    directory.mkdir()
+    source = write(directory / 'Ru-кот.ogg', b'audio')
+    assert mp3_path(source) == str(directory / 'Ru-кот.mp3')
+    with patch('pydub.AudioSegment.from_file') as mock_from_file:
+        assert wiktionaryparser.convert_ogg_to_mp3(source) == mp3_path(source)
+    mock_from_file.return_value.export.assert_called_once_with(mp3_path(source), format='mp3')